@@ -1,6 +1,9 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
-from .models import CustomUser, Publisher, Article, Newsletter
+from .models import (
+    CustomUser, Publisher, Article, Newsletter, DistributionJob, FeedEntry,
+    SocialPost
+)
 
 # Customize the UserAdmin class to manage our custom user model
 
@@ -26,3 +29,36 @@ admin.site.register(CustomUser, CustomUserAdmin)
 admin.site.register(Publisher)
 admin.site.register(Article)
 admin.site.register(Newsletter)
+
+
+
+class DistributionJobAdmin(admin.ModelAdmin):
+    list_display = (
+        'id', 'content_type', 'object_id', 'status',
+        'sent_recipients', 'failed_recipients', 'total_recipients',
+        'attempts', 'created_at'
+    )
+    list_filter = ('status', 'content_type')
+
+
+admin.site.register(DistributionJob, DistributionJobAdmin)
+
+
+class SocialPostAdmin(admin.ModelAdmin):
+    list_display = (
+        'id', 'content_type', 'object_id', 'status', 'attempts',
+        'next_attempt_at', 'sent_at'
+    )
+    list_filter = ('status', 'content_type')
+
+
+admin.site.register(SocialPost, SocialPostAdmin)
+
+
+class FeedEntryAdmin(admin.ModelAdmin):
+    list_display = ('reader', 'content_type', 'content_id', 'created_at')
+    list_filter = ('content_type',)
+    raw_id_fields = ('reader',)
+
+
+admin.site.register(FeedEntry, FeedEntryAdmin)
@@ -0,0 +1,187 @@
+from collections import defaultdict
+from itertools import islice
+
+from django.db import transaction
+from django.db.models import Min
+
+from .models import CustomUser, DistributionRecipient
+
+
+JournalistSubscription = CustomUser.subscriptions_journalists.through
+PublisherSubscription = CustomUser.subscriptions_publishers.through
+
+
+def _as_list(content):
+    return content if isinstance(content, (list, tuple)) else [content]
+
+
+def _sender_ids(contents):
+    author_ids = {content.author_id for content in contents}
+    publisher_ids = {
+        content.publisher_id for content in contents if content.publisher_id
+    }
+    return author_ids, publisher_ids
+
+
+def subscriber_ids(content):
+    """Return a subquery of the IDs of users subscribed to the content.
+
+    Followers of the author and subscribers of the publisher are combined
+    with a SQL ``UNION``, so duplicates are removed by the database.
+
+    :param content: An Article or Newsletter instance, or a list of them
+        to find the subscribers of any of them
+    :returns: Queryset of subscriber IDs, usable as an ``__in`` subquery
+    :rtype: QuerySet
+    """
+    author_ids, publisher_ids = _sender_ids(_as_list(content))
+    followers = JournalistSubscription.objects.filter(
+        to_customuser_id__in=author_ids
+    ).values('from_customuser_id')
+    if not publisher_ids:
+        return followers
+
+    publisher_subscribers = PublisherSubscription.objects.filter(
+        publisher_id__in=publisher_ids
+    ).values('customuser_id')
+    return followers.union(publisher_subscribers)
+
+
+def followed_senders(addresses, contents):
+    """Return which of the contents' senders each address is subscribed to.
+
+    Accounts sharing an address receive a single email, so their
+    subscriptions are combined.
+
+    :param addresses: Email addresses of the recipients
+    :param contents: Article and Newsletter instances
+    :returns: Tuple of dicts mapping each address to the set of journalist
+        IDs and the set of publisher IDs it follows
+    :rtype: tuple
+    """
+    author_ids, publisher_ids = _sender_ids(contents)
+    journalists = defaultdict(set)
+    rows = JournalistSubscription.objects.filter(
+        from_customuser__email__in=addresses,
+        to_customuser_id__in=author_ids
+    ).values_list('from_customuser__email', 'to_customuser_id')
+    for address, journalist_id in rows:
+        journalists[address].add(journalist_id)
+
+    publishers = defaultdict(set)
+    rows = PublisherSubscription.objects.filter(
+        customuser__email__in=addresses,
+        publisher_id__in=publisher_ids
+    ).values_list('customuser__email', 'publisher_id')
+    for address, publisher_id in rows:
+        publishers[address].add(publisher_id)
+    return journalists, publishers
+
+
+def recipient_queryset(content):
+    """Return one row per distinct, non-empty subscriber email address.
+
+    Each row holds the address and ``recipient_id``, the lowest ID of the
+    users sharing that address, which gives the rows a stable order to page
+    through.
+
+    :param content: An Article or Newsletter instance, or a list of them
+    :returns: Queryset of ``email``/``recipient_id`` rows
+    :rtype: QuerySet
+    """
+    return (
+        CustomUser.objects.filter(pk__in=subscriber_ids(content))
+        .exclude(email__isnull=True)
+        .exclude(email='')
+        .values('email')
+        .annotate(recipient_id=Min('pk'))
+        .order_by('recipient_id')
+    )
+
+
+def resolve_recipients(content, after_id=0, chunk_size=2000,
+                       count_only=False):
+    """Resolve the email recipients for an approved article or newsletter.
+
+    The union, deduplication and filtering all happen in a single query.
+    Rows are streamed from the database cursor rather than loaded into a
+    list, so memory stays flat however large the audience is.
+
+    Usage::
+
+        total = resolve_recipients(article, count_only=True)
+        for recipient_id, email in resolve_recipients(article):
+            ...
+
+    :param content: An Article or Newsletter instance, or a list of them
+    :param after_id: Only return recipients with a greater ``recipient_id``
+    :param chunk_size: Rows fetched from the database cursor at a time
+    :param count_only: Return the number of recipients instead of the rows
+    :returns: Recipient count, or iterator of ``(recipient_id, email)``
+    """
+    if count_only:
+        return recipient_queryset(content).count()
+    return _recipient_rows(content, after_id).iterator(chunk_size=chunk_size)
+
+
+def store_recipients(job, content, batch_size=2000):
+    """Resolve a distribution job's recipients once and store them.
+
+    The deduplicating query runs a single time, streamed from the cursor,
+    and its rows are inserted in batches. Any rows stored by an earlier
+    attempt are replaced, and the whole audience is stored or none of it.
+
+    :param job: The distribution job
+    :param content: An Article or Newsletter instance, or a list of them
+    :param batch_size: Rows inserted per query
+    :returns: Number of recipients stored
+    :rtype: int
+    """
+    rows = resolve_recipients(content, chunk_size=batch_size)
+    total = 0
+    with transaction.atomic():
+        DistributionRecipient.objects.filter(job=job).delete()
+        while True:
+            batch = [
+                DistributionRecipient(
+                    job=job, recipient_id=recipient_id, email=email
+                )
+                for recipient_id, email in islice(rows, batch_size)
+            ]
+            if not batch:
+                return total
+            DistributionRecipient.objects.bulk_create(batch)
+            total += len(batch)
+
+
+def iter_recipient_chunks(job, after_id=0, chunk_size=500):
+    """Yield a job's stored recipients in lists of at most ``chunk_size``.
+
+    Every chunk is fetched with its own keyset query over the job's rows
+    stored by :func:`store_recipients`, so each costs the same however
+    large the audience is, and long-running deliveries don't keep a query
+    open on the database between chunks.
+
+    :param job: The distribution job
+    :param after_id: Only yield recipients with a greater ``recipient_id``
+    :param chunk_size: Maximum number of recipients per chunk
+    :returns: Generator of lists of ``(recipient_id, email)`` tuples
+    """
+    recipients = DistributionRecipient.objects.filter(job=job).order_by(
+        'recipient_id'
+    ).values_list('recipient_id', 'email')
+    while True:
+        chunk = list(
+            recipients.filter(recipient_id__gt=after_id)[:chunk_size]
+        )
+        if not chunk:
+            return
+        yield chunk
+        after_id = chunk[-1][0]
+
+
+def _recipient_rows(content, after_id):
+    queryset = recipient_queryset(content)
+    if after_id:
+        queryset = queryset.filter(recipient_id__gt=after_id)
+    return queryset.values_list('recipient_id', 'email')
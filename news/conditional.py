@@ -0,0 +1,182 @@
+import hashlib
+import time
+
+from django.core.cache import cache
+from django.middleware.csrf import get_token
+
+from . import page_cache
+from .models import Article
+
+
+SUBSCRIPTION_VERSION_KEY = 'news:subscriptions:version:{}'
+FEED_VERSION_KEY = 'news:feed:version:{}'
+
+
+def _get_version(key):
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+def _bump_versions(key_format, reader_ids):
+    version = time.time_ns()
+    cache.set_many(
+        {key_format.format(pk): version for pk in reader_ids}, None
+    )
+
+
+def get_subscription_version(reader_id):
+    """Return the version of a reader's set of subscriptions.
+
+    Like the home page cache version, this is replaced whenever the
+    reader's subscriptions change, so any ETag built from it changes too.
+
+    :param reader_id: ID of the reader
+    :returns: The current version token
+    :rtype: int
+    """
+    return _get_version(SUBSCRIPTION_VERSION_KEY.format(reader_id))
+
+
+def bump_subscription_versions(reader_ids):
+    """Start a new subscription version for each of the given readers.
+
+    :param reader_ids: IDs of the readers whose subscriptions changed
+    """
+    _bump_versions(SUBSCRIPTION_VERSION_KEY, reader_ids)
+
+
+def get_feed_version(reader_id):
+    """Return the version of a reader's precomputed feed.
+
+    The version is replaced whenever entries are added to or removed from
+    the reader's feed (see :mod:`news.feeds`).
+
+    :param reader_id: ID of the reader
+    :returns: The current version token
+    :rtype: int
+    """
+    return _get_version(FEED_VERSION_KEY.format(reader_id))
+
+
+def bump_feed_versions(reader_ids):
+    """Start a new feed version for each of the given readers.
+
+    :param reader_ids: IDs of the readers whose feeds changed
+    """
+    _bump_versions(FEED_VERSION_KEY, reader_ids)
+
+
+def make_etag(*parts):
+    """Return an ETag identifying a response built from the given parts.
+
+    :param parts: Values that change whenever the response changes
+    :returns: The unquoted ETag
+    :rtype: str
+    """
+    return hashlib.md5(
+        ':'.join(str(part) for part in parts).encode(),
+        usedforsecurity=False
+    ).hexdigest()
+
+
+def _viewer(request):
+    # Pages show the signed in user and links for their role
+    if request.user.is_authenticated:
+        return f'{request.user.pk}-{request.user.role}'
+    return 'anonymous'
+
+
+def home_etag(request):
+    """Return the ETag of the home page.
+
+    Built from cache versions only, so a revalidated home page costs no
+    database queries. A signed in user's page holds forms carrying their
+    CSRF token, so the ETag covers the token's secret too: signing in
+    again rotates it, and a page kept from before would fail its POSTs.
+
+    :param request: HTTP request object
+    :returns: The ETag
+    :rtype: str
+    """
+    parts = ['home', page_cache.get_version(), _viewer(request)]
+    if request.user.is_authenticated:
+        # Publishers and journalists are flagged as subscribed or not
+        parts.append(get_subscription_version(request.user.pk))
+        # Makes sure the secret exists before the page is rendered with it
+        get_token(request)
+        parts.append(request.META['CSRF_COOKIE'])
+    return make_etag(*parts)
+
+
+def _article_updated_at(request, article_id):
+    # The ETag and Last-Modified both need it, so it's looked up once per
+    # request
+    versions = request.__dict__.setdefault('_news_article_versions', {})
+    if article_id not in versions:
+        row = (
+            Article.objects.filter(pk=article_id)
+            .values('pk', 'updated_at')
+            .first()
+        )
+        versions[article_id] = row and row['updated_at']
+    return versions[article_id]
+
+
+def article_last_modified(request, article_id):
+    """Return when an article was last saved.
+
+    Shares one query per request with :func:`article_etag`.
+
+    :param request: HTTP request object
+    :param article_id: ID of the article
+    :returns: The article's ``updated_at``, or None if it doesn't exist
+    :rtype: datetime or None
+    """
+    return _article_updated_at(request, article_id)
+
+
+def article_etag(request, article_id):
+    """Return the ETag of an article's detail page.
+
+    :param request: HTTP request object
+    :param article_id: ID of the article
+    :returns: The ETag, or None if the article doesn't exist
+    :rtype: str or None
+    """
+    updated_at = _article_updated_at(request, article_id)
+    if updated_at is None:
+        return None
+    return make_etag(
+        'article', article_id, updated_at.isoformat(), _viewer(request)
+    )
+
+
+def feed_etag(model):
+    """Return an ETag function for a subscribed content API.
+
+    The ETag covers the reader's feed version, which changes whenever
+    entries are added to or removed from their feed, the home page cache
+    version, which changes whenever approved content is edited, and the
+    query string, which holds the cursor and page size. All of them are
+    read from the cache, so a revalidated feed page costs no database
+    queries. The APIs send no ``Last-Modified``, as working it out would
+    mean reading the reader's whole feed.
+
+    :param model: Either Article or Newsletter
+    :returns: Function taking the request and returning its ETag
+    :rtype: callable
+    """
+    def etag(request, *args, **kwargs):
+        user = request.user
+        if not user.is_authenticated or user.role.lower() != 'reader':
+            return None
+        return make_etag(
+            model._meta.model_name,
+            get_feed_version(user.pk),
+            page_cache.get_version(),
+            request.get_full_path()
+        )
+    return etag
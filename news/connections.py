@@ -0,0 +1,61 @@
+from django.db import close_old_connections
+
+from . import counters
+
+
+STATS_EVENTS = ('opened', 'requests', 'cycles')
+
+
+def make_key(event):
+    """Return the cache key of a database connection counter.
+
+    :param event: The counted event
+    :rtype: str
+    """
+    return f'news:db:stats:{event}'
+
+
+def record(event):
+    """Increment a database connection counter.
+
+    Does nothing unless counters are kept, see :func:`counters.is_enabled`.
+
+    :param event: One of 'opened' (a new connection was made), 'requests'
+        (a request finished) or 'cycles' (a worker loop finished)
+    """
+    counters.increment(make_key(event))
+
+
+def get_stats():
+    """Return the database connection counters.
+
+    Requests and worker cycles that didn't open a connection reused a
+    persistent one, so the reuse rate is the share of them that didn't.
+
+    :returns: Mapping of event to count, plus the ``reused`` count
+    :rtype: dict
+    """
+    counts = counters.get_counts([make_key(e) for e in STATS_EVENTS])
+    stats = {event: counts[make_key(event)] for event in STATS_EVENTS}
+    stats['reused'] = max(
+        0, stats['requests'] + stats['cycles'] - stats['opened']
+    )
+    return stats
+
+
+def reset_stats():
+    """Reset all database connection counters to zero."""
+    counters.reset([make_key(event) for event in STATS_EVENTS])
+
+
+def end_cycle():
+    """Finish one loop of a background worker.
+
+    Does for workers what Django does at the end of every request: a
+    connection that has outlived ``CONN_MAX_AGE``, or that was left broken
+    by an error, is closed so the next query reconnects. Without this a
+    long running worker would hold one connection forever, and a database
+    restart would leave it failing on a dead connection.
+    """
+    close_old_connections()
+    record('cycles')
@@ -0,0 +1,61 @@
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+
+DISABLED_WARNING = (
+    'Counters are off: the cache is local to each process. Set REDIS_URL '
+    'or CACHE_DIR to share it, or NEWS_STATS_COUNTERS=true to count anyway.'
+)
+
+
+def is_enabled():
+    """Return True if the ``db_stats`` and ``cache_stats`` counters are kept.
+
+    The counters live in the cache and are updated by every request, so
+    they only add up when every process shares the cache. With the local
+    memory cache each process would count on its own, and the management
+    commands, running in a process of their own, would always report
+    zero, so the per-request writes are skipped unless
+    ``NEWS_STATS_COUNTERS`` turns them on.
+
+    :rtype: bool
+    """
+    enabled = getattr(settings, 'NEWS_STATS_COUNTERS', None)
+    if enabled is None:
+        enabled = not isinstance(caches['default'], (LocMemCache, DummyCache))
+    return enabled
+
+
+def increment(key):
+    """Add one to a counter, if counters are kept.
+
+    :param key: The counter's cache key
+    """
+    if not is_enabled():
+        return
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, None):
+            cache.incr(key)
+
+
+def get_counts(keys):
+    """Return the value of each counter.
+
+    :param keys: The counters' cache keys
+    :returns: Mapping of key to count, 0 for counters never incremented
+    :rtype: dict
+    """
+    counts = cache.get_many(keys)
+    return {key: counts.get(key, 0) for key in keys}
+
+
+def reset(keys):
+    """Reset counters to zero.
+
+    :param keys: The counters' cache keys
+    """
+    cache.delete_many(keys)
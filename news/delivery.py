@@ -0,0 +1,209 @@
+import time
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.utils.html import strip_tags
+
+
+def get_setting(name, default):
+    """Return a delivery setting, falling back to a default.
+
+    :param name: Name of the Django setting
+    :param default: Value used when the setting is not defined
+    :returns: The configured value or the default
+    """
+    return getattr(settings, name, default)
+
+
+class DeliveryResult:
+    """Outcome of delivering a batch of email messages.
+
+    :field sent: Number of messages accepted by the backend
+    :field failed: Recipient addresses that failed after all retries
+    :field elapsed: Wall clock time spent delivering, in seconds
+    """
+
+    def __init__(self):
+        self.sent = 0
+        self.failed = []
+        self.elapsed = 0.0
+
+    @property
+    def messages_per_second(self):
+        """Delivery throughput of the messages that were sent."""
+        if not self.elapsed:
+            return float(self.sent)
+        return self.sent / self.elapsed
+
+    def __str__(self):
+        return (
+            f"{self.sent} sent, {len(self.failed)} failed in "
+            f"{self.elapsed:.2f}s ({self.messages_per_second:.0f} msg/s)"
+        )
+
+
+class ConnectionPool:
+    """A small round-robin pool of open email backend connections.
+
+    Connections are opened lazily and kept open until the pool is closed,
+    so an SMTP handshake (and TLS negotiation and login) is paid once per
+    connection rather than once per message.
+
+    Usage::
+
+        with ConnectionPool(size=2) as pool:
+            deliver(messages, pool=pool)
+    """
+
+    def __init__(self, size=None, backend=None, **backend_kwargs):
+        self.size = size or get_setting('NEWS_EMAIL_CONNECTIONS', 1)
+        self.backend = backend
+        self.backend_kwargs = backend_kwargs
+        self.connections = []
+        self.opened = 0
+        self._next = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def acquire(self):
+        """Return the next connection in the pool, opening it if needed.
+
+        :returns: An open email backend connection
+        """
+        if len(self.connections) < self.size:
+            connection = get_connection(self.backend, **self.backend_kwargs)
+            self.connections.append(connection)
+        else:
+            connection = self.connections[self._next % self.size]
+            self._next += 1
+        if connection.open():
+            self.opened += 1
+        return connection
+
+    def reset(self, connection):
+        """Close a connection after an error so it reconnects on next use.
+
+        :param connection: The connection to reset
+        """
+        try:
+            connection.close()
+        except Exception:
+            pass
+        if connection.open():
+            self.opened += 1
+
+    def close(self):
+        """Close every connection in the pool."""
+        for connection in self.connections:
+            try:
+                connection.close()
+            except Exception:
+                pass
+        self.connections = []
+
+
+def build_message(subject, html_message, from_email, recipient,
+                  text_message=None):
+    """Build an individual email with plain text and HTML alternatives.
+
+    Each subscriber gets their own message, so recipients never see each
+    other's addresses.
+
+    :param subject: Email subject line
+    :param html_message: Rendered HTML body
+    :param from_email: Sender address
+    :param recipient: The single recipient address
+    :param text_message: Plain text body, derived from the HTML if omitted
+    :returns: The email message
+    :rtype: EmailMultiAlternatives
+    """
+    if text_message is None:
+        text_message = strip_tags(html_message)
+    message = EmailMultiAlternatives(
+        subject,
+        text_message,
+        from_email,
+        [recipient]
+    )
+    message.attach_alternative(html_message, 'text/html')
+    return message
+
+
+def send_with_retry(pool, connection, message, max_retries, retry_delay):
+    """Send a single message, reconnecting and retrying on failure.
+
+    :param pool: The pool the connection belongs to
+    :param connection: An open connection from the pool
+    :param message: The email message to send
+    :param max_retries: Number of retries after the first attempt
+    :param retry_delay: Initial delay between retries, doubled each time
+    :returns: True if the message was sent
+    :rtype: bool
+    """
+    for attempt in range(max_retries + 1):
+        try:
+            if connection.send_messages([message]):
+                return True
+        except Exception as e:
+            print(f"Error sending email to {message.to}: {e}")
+        if attempt < max_retries:
+            time.sleep(retry_delay * (2 ** attempt))
+            pool.reset(connection)
+    return False
+
+
+def deliver(messages, pool=None, batch_size=None, max_retries=None,
+            retry_delay=None):
+    """Deliver messages over pooled connections in fixed size batches.
+
+    Each batch is sent on one connection from the pool. Messages are handed
+    to the backend one at a time over that open connection, so a failure can
+    be retried for the affected recipient without resending the rest of the
+    batch.
+
+    :param messages: Iterable of email messages
+    :param pool: Connection pool to use; a temporary one is created if omitted
+    :param batch_size: Messages sent per connection before rotating
+    :param max_retries: Retries for each failed message
+    :param retry_delay: Initial delay between retries, in seconds
+    :returns: The delivery outcome
+    :rtype: DeliveryResult
+    """
+    batch_size = batch_size or get_setting('NEWS_EMAIL_BATCH_SIZE', 100)
+    if max_retries is None:
+        max_retries = get_setting('NEWS_EMAIL_MAX_RETRIES', 2)
+    if retry_delay is None:
+        retry_delay = get_setting('NEWS_EMAIL_RETRY_DELAY', 0.5)
+
+    if pool is None:
+        with ConnectionPool() as temporary_pool:
+            return deliver(
+                messages, temporary_pool, batch_size, max_retries, retry_delay
+            )
+
+    result = DeliveryResult()
+    started = time.perf_counter()
+    batch = []
+    for message in messages:
+        batch.append(message)
+        if len(batch) >= batch_size:
+            _deliver_batch(pool, batch, max_retries, retry_delay, result)
+            batch = []
+    if batch:
+        _deliver_batch(pool, batch, max_retries, retry_delay, result)
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+def _deliver_batch(pool, batch, max_retries, retry_delay, result):
+    connection = pool.acquire()
+    for message in batch:
+        if send_with_retry(pool, connection, message, max_retries,
+                           retry_delay):
+            result.sent += 1
+        else:
+            result.failed.extend(message.to)
@@ -0,0 +1,361 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from . import page_cache, search
+from .audience import (
+    followed_senders, iter_recipient_chunks, store_recipients
+)
+from .delivery import ConnectionPool, deliver
+from .emails import ContentEmail, DigestEmail
+from .feeds import fan_out_many
+from .models import Article, CustomUser, Newsletter, DistributionJob
+from .social import enqueue_post
+
+
+WAKE_UP_KEY = 'news:distribution:wake-up'
+
+CONTENT_MODELS = {
+    'article': Article,
+    'newsletter': Newsletter,
+}
+
+
+def get_setting(name, default):
+    """Return a distribution setting, falling back to a default.
+
+    :param name: Name of the Django setting
+    :param default: Value used when the setting is not defined
+    :returns: The configured value or the default
+    """
+    return getattr(settings, name, default)
+
+
+def enqueue_distribution(content):
+    """Record a distribution job for a newly approved article or newsletter.
+
+    The job row is written in the caller's transaction, so it is only picked
+    up by the worker once the approval has been committed, and disappears
+    with it if the approval is rolled back. The workers are woken once the
+    transaction commits.
+
+    :param content: The approved Article or Newsletter instance
+    :returns: The created distribution job
+    :rtype: DistributionJob
+    """
+    content_type = 'article' if isinstance(content, Article) else 'newsletter'
+    job = DistributionJob.objects.create(
+        content_type=content_type,
+        object_id=content.pk
+    )
+    transaction.on_commit(wake_workers)
+    return job
+
+
+def enqueue_digest(items):
+    """Record one distribution job for several items approved together.
+
+    Subscribers get a single email listing the items from the journalists
+    and publishers they follow, instead of an email per item.
+
+    :param items: List of ``(content_type, content)`` tuples
+    :returns: The created distribution job
+    :rtype: DistributionJob
+    """
+    job = DistributionJob.objects.create(
+        content_type='digest',
+        object_id=0,
+        items=[[content_type, content.pk] for content_type, content in items]
+    )
+    transaction.on_commit(wake_workers)
+    return job
+
+
+def approve_many(article_ids=(), newsletter_ids=()):
+    """Approve many articles and newsletters in one transaction.
+
+    Each model is approved with a single ``UPDATE``, which sends no
+    ``post_save`` signals, so the search index, distribution and home page
+    cache are updated here once for the whole batch. Rows locked by another
+    approval are skipped rather than waited for, as are items that are
+    already approved.
+
+    :param article_ids: IDs of the articles to approve
+    :param newsletter_ids: IDs of the newsletters to approve
+    :returns: List of ``(content_type, content)`` tuples newly approved
+    :rtype: list
+    """
+    items = []
+    with transaction.atomic():
+        for content_type, ids in (
+            ('article', article_ids), ('newsletter', newsletter_ids)
+        ):
+            model = CONTENT_MODELS[content_type]
+            pending = model.objects.filter(pk__in=ids, approved=False)
+            pks = list(
+                pending.select_for_update(skip_locked=True)
+                .values_list('pk', flat=True)
+            )
+            if not pks:
+                continue
+            pending.filter(pk__in=pks).update(
+                approved=True, updated_at=timezone.now()
+            )
+            items.extend(
+                (content_type, content) for content in
+                model.objects.select_related('author', 'publisher')
+                .filter(pk__in=pks).order_by('pk')
+            )
+        if items:
+            search.index_many([content for _, content in items])
+            if len(items) == 1:
+                enqueue_distribution(items[0][1])
+            else:
+                enqueue_digest(items)
+            transaction.on_commit(page_cache.invalidate)
+    return items
+
+
+def wake_workers():
+    """Tell waiting distribution workers that a job has been committed.
+
+    Workers sharing the cache with the web server (e.g. through Redis) pick
+    the job up straight away instead of at their next poll.
+    """
+    cache.set(WAKE_UP_KEY, time.time_ns(), None)
+
+
+def wait_for_jobs(timeout, interval=0.2):
+    """Wait until a worker is woken by :func:`wake_workers` or time runs out.
+
+    Only the cache is checked while waiting, which costs far less than
+    polling the job table.
+
+    :param timeout: Maximum number of seconds to wait
+    :param interval: Seconds between checks of the cache
+    :returns: True if the workers were woken
+    :rtype: bool
+    """
+    seen = cache.get(WAKE_UP_KEY)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        time.sleep(min(interval, max(0, deadline - time.monotonic())))
+        if cache.get(WAKE_UP_KEY) != seen:
+            return True
+    return False
+
+
+def get_job_items(job):
+    """Load the articles and newsletters a distribution job refers to.
+
+    :param job: The distribution job
+    :returns: List of ``(content_type, content)`` tuples, leaving out
+        content that no longer exists
+    :rtype: list
+    """
+    if job.content_type == 'digest':
+        pairs = [tuple(pair) for pair in job.items]
+    else:
+        pairs = [(job.content_type, job.object_id)]
+
+    items = []
+    for content_type, model in CONTENT_MODELS.items():
+        ids = [pk for kind, pk in pairs if kind == content_type]
+        if ids:
+            items.extend(
+                (content_type, content) for content in
+                model.objects.select_related('author', 'publisher')
+                .filter(pk__in=ids)
+            )
+    order = {pair: index for index, pair in enumerate(pairs)}
+    return sorted(items, key=lambda item: order[item[0], item[1].pk])
+
+
+def _chunk_messages(email, chunk, usernames, contents):
+    from_email = settings.DEFAULT_FROM_EMAIL
+    if isinstance(email, ContentEmail):
+        for recipient_id, address in chunk:
+            yield email.message(
+                from_email, address, recipient_id,
+                usernames.get(recipient_id)
+            )
+        return
+
+    # A digest only lists the items from the recipient's own subscriptions
+    journalists, publishers = followed_senders(
+        [address for _, address in chunk], contents
+    )
+    for recipient_id, address in chunk:
+        message = email.message(
+            from_email, address, recipient_id, usernames.get(recipient_id),
+            journalists[address], publishers[address]
+        )
+        if message is not None:
+            yield message
+
+
+def requeue_stale_jobs():
+    """Return jobs abandoned by a crashed worker to the pending state.
+
+    A running job's heartbeat is renewed after every chunk, so only jobs
+    whose worker has made no progress for ``NEWS_DISTRIBUTION_STALE_AFTER``
+    seconds are requeued, however long the job itself takes.
+
+    :returns: Number of jobs requeued
+    :rtype: int
+    """
+    stale_after = get_setting('NEWS_DISTRIBUTION_STALE_AFTER', 1800)
+    cutoff = timezone.now() - timedelta(seconds=stale_after)
+    return DistributionJob.objects.filter(
+        status='running',
+        heartbeat_at__lt=cutoff
+    ).update(status='pending')
+
+
+def claim_next_job():
+    """Atomically claim the oldest pending job for this worker.
+
+    A job is claimed with a conditional UPDATE, so concurrent workers never
+    process the same job twice. Jobs waiting to be retried are skipped
+    until their ``next_attempt_at``.
+
+    :returns: The claimed job, or None if no job is due
+    """
+    now = timezone.now()
+    pending = DistributionJob.objects.filter(
+        status='pending', next_attempt_at__lte=now
+    )
+    for pk in pending.values_list('pk', flat=True)[:10]:
+        claimed = DistributionJob.objects.filter(
+            pk=pk,
+            status='pending'
+        ).update(
+            status='running',
+            attempts=F('attempts') + 1,
+            started_at=now,
+            heartbeat_at=now
+        )
+        if claimed:
+            return DistributionJob.objects.get(pk=pk)
+    return None
+
+
+def process_job(job, chunk_size=None, progress=None):
+    """Send a claimed job's notifications chunk by chunk.
+
+    The content is first added to subscribed readers' feeds and the
+    deduplicated audience is stored with the job. Every recipient then
+    gets an individual message (for a digest, listing the items from their
+    own subscriptions), delivered over a pool of connections that stays
+    open for the whole job. Progress is saved after
+    every chunk, along with a heartbeat showing the worker is still alive.
+    If a chunk cannot be delivered at all (for example the mail server is
+    unreachable) the job is retried with exponential backoff, starting
+    after ``NEWS_DISTRIBUTION_RETRY_DELAY`` seconds, until
+    ``NEWS_DISTRIBUTION_MAX_ATTEMPTS`` is reached; the next attempt resumes
+    after the last recipient that was processed.
+
+    :param job: A job claimed with :func:`claim_next_job`
+    :param chunk_size: Number of recipients per chunk
+    :param progress: Optional callable invoked with the job after each chunk
+    :returns: The updated job
+    :rtype: DistributionJob
+    """
+    chunk_size = chunk_size or get_setting('NEWS_DISTRIBUTION_CHUNK_SIZE', 500)
+    items = get_job_items(job)
+    contents = [content for _, content in items]
+    if not items:
+        job.status = 'failed'
+        job.last_error = 'Content no longer exists.'
+        job.finished_at = timezone.now()
+        job.save(update_fields=['status', 'last_error', 'finished_at'])
+        return job
+
+    try:
+        if not job.last_recipient_id:
+            fan_out_many(contents)
+        # The audience is resolved once and kept until the job finishes
+        if not job.recipients.exists():
+            job.total_recipients = store_recipients(job, contents)
+            job.heartbeat_at = timezone.now()
+            job.save(update_fields=['total_recipients', 'heartbeat_at'])
+
+        # Rendered once; each message only fills in the recipient's details
+        if job.content_type == 'digest':
+            email = DigestEmail(items)
+        else:
+            email = ContentEmail(job.content_type, contents[0])
+        chunks = iter_recipient_chunks(
+            job, job.last_recipient_id, chunk_size
+        )
+        with ConnectionPool() as pool:
+            for chunk in chunks:
+                usernames = dict(
+                    CustomUser.objects.filter(
+                        pk__in=[recipient_id for recipient_id, _ in chunk]
+                    ).values_list('pk', 'username')
+                )
+                result = deliver(
+                    _chunk_messages(email, chunk, usernames, contents),
+                    pool=pool
+                )
+                job.last_recipient_id = chunk[-1][0]
+                job.sent_recipients += result.sent
+                job.failed_recipients += len(result.failed)
+                job.heartbeat_at = timezone.now()
+                job.save(update_fields=[
+                    'last_recipient_id', 'sent_recipients',
+                    'failed_recipients', 'heartbeat_at'
+                ])
+                if progress:
+                    progress(job)
+
+        for content_type, content in items:
+            enqueue_post(content_type, content)
+
+        job.status = 'done'
+        job.last_error = ''
+    except Exception as e:
+        max_attempts = get_setting('NEWS_DISTRIBUTION_MAX_ATTEMPTS', 5)
+        job.status = 'pending' if job.attempts < max_attempts else 'failed'
+        job.last_error = str(e)
+        if job.status == 'pending':
+            delay = min(
+                get_setting('NEWS_DISTRIBUTION_RETRY_DELAY', 60)
+                * 2 ** (job.attempts - 1),
+                get_setting('NEWS_DISTRIBUTION_MAX_RETRY_DELAY', 3600)
+            )
+            job.next_attempt_at = timezone.now() + timedelta(seconds=delay)
+
+    if job.status != 'pending':
+        job.finished_at = timezone.now()
+        job.recipients.all().delete()
+    job.save(update_fields=[
+        'status', 'last_error', 'next_attempt_at', 'finished_at'
+    ])
+    return job
+
+
+def run_pending_jobs(limit=None, chunk_size=None, progress=None):
+    """Process queued distribution jobs until none is due.
+
+    :param limit: Maximum number of jobs to process
+    :param chunk_size: Number of recipients per chunk
+    :param progress: Optional callable invoked with the job after each chunk
+    :returns: Number of jobs processed
+    :rtype: int
+    """
+    requeue_stale_jobs()
+    processed = 0
+    while limit is None or processed < limit:
+        job = claim_next_job()
+        if job is None:
+            break
+        process_job(job, chunk_size=chunk_size, progress=progress)
+        processed += 1
+    return processed
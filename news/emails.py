@@ -0,0 +1,327 @@
+import functools
+
+from django.conf import settings
+from django.core import signing
+from django.template.loader import get_template
+from django.urls import reverse
+from django.utils.html import escape
+
+from .delivery import build_message
+
+
+# Parts of a notification email that differ between recipients
+RECIPIENT_FIELDS = ('greeting', 'unsubscribe_url')
+UNSUBSCRIBE_SALT = 'news.unsubscribe'
+# Stands in for the token when reversing the unsubscribe URL
+UNSUBSCRIBE_PLACEHOLDER = '__token__'
+
+
+def get_site_url():
+    """Return the absolute URL of the site, used for links in emails."""
+    return getattr(settings, 'NEWS_SITE_URL', 'http://127.0.0.1:8000')
+
+
+@functools.lru_cache(maxsize=None)
+def get_email_templates(content_type):
+    """Return the compiled HTML and plain text notification templates.
+
+    Templates are loaded and compiled once per process.
+
+    :param content_type: Either 'article' or 'newsletter'
+    :returns: Tuple of the HTML and plain text templates
+    :rtype: tuple
+    """
+    return (
+        get_template(f'news/{content_type}_email.html'),
+        get_template(f'news/{content_type}_email.txt')
+    )
+
+
+def get_unsubscribe_signer():
+    """Return the signer of unsubscribe tokens."""
+    return signing.Signer(salt=UNSUBSCRIBE_SALT)
+
+
+def _join_ids(ids):
+    return ','.join(str(pk) for pk in sorted(ids)) or '0'
+
+
+def _split_ids(value):
+    return [int(pk) for pk in value.split(',') if pk != '0']
+
+
+def sign_unsubscribe(recipient_id, journalist_ids, publisher_ids,
+                     signer=None):
+    """Return a signed token unsubscribing a recipient from their senders.
+
+    :param recipient_id: ID of the user the email is sent to
+    :param journalist_ids: IDs of the journalists to unsubscribe from
+    :param publisher_ids: IDs of the publishers to unsubscribe from
+    :param signer: Signer to reuse across tokens, created if omitted
+    :returns: The token, safe to use in a URL
+    :rtype: str
+    """
+    signer = signer or get_unsubscribe_signer()
+    return signer.sign(
+        f'{recipient_id}.{_join_ids(journalist_ids)}.'
+        f'{_join_ids(publisher_ids)}'
+    )
+
+
+def make_unsubscribe_token(recipient_id, content, signer=None):
+    """Return a signed token unsubscribing a recipient from some content.
+
+    :param recipient_id: ID of the user the email is sent to
+    :param content: The Article or Newsletter the email announces
+    :param signer: Signer to reuse across tokens, created if omitted
+    :returns: The token, safe to use in a URL
+    :rtype: str
+    """
+    return sign_unsubscribe(
+        recipient_id,
+        [content.author_id],
+        [content.publisher_id] if content.publisher_id else [],
+        signer
+    )
+
+
+def read_unsubscribe_token(token):
+    """Return the recipient, journalist and publisher IDs of a token.
+
+    :param token: A token from :func:`sign_unsubscribe` or
+        :func:`make_unsubscribe_token`
+    :returns: Tuple of the recipient ID and lists of the journalist and
+        publisher IDs
+    :rtype: tuple
+    :raises django.core.signing.BadSignature: If the token was tampered with
+    """
+    value = get_unsubscribe_signer().unsign(token)
+    recipient_id, journalist_ids, publisher_ids = value.split('.')
+    return (
+        int(recipient_id), _split_ids(journalist_ids),
+        _split_ids(publisher_ids)
+    )
+
+
+def _marker(name):
+    return f'\x00{name}\x00'
+
+
+def _to_format_string(rendered):
+    # Escape literal braces so only the recipient fields are substituted
+    rendered = rendered.replace('{', '{{').replace('}', '}}')
+    for name in RECIPIENT_FIELDS:
+        rendered = rendered.replace(_marker(name), '{' + name + '}')
+    return rendered
+
+
+def _render_once(templates, context):
+    # Render with markers in place of the recipient fields
+    context = {**context, **{name: _marker(name) for name in RECIPIENT_FIELDS}}
+    return tuple(
+        _to_format_string(template.render(context)) for template in templates
+    )
+
+
+def _personalise(text, html, greeting, unsubscribe_url):
+    return (
+        text.format(greeting=greeting, unsubscribe_url=unsubscribe_url),
+        html.format(
+            greeting=escape(greeting), unsubscribe_url=escape(unsubscribe_url)
+        )
+    )
+
+
+def _greeting(name):
+    return f'Hi {name},' if name else 'Hi,'
+
+
+def _content_url(content_type, content):
+    # Newsletters have no page of their own yet
+    if content_type == 'article':
+        return get_site_url() + reverse('article_detail', args=[content.pk])
+    return get_site_url()
+
+
+def _unsubscribe_url():
+    # Reversed once per email; each recipient's token replaces the
+    # placeholder
+    return get_site_url() + reverse(
+        'unsubscribe', args=[UNSUBSCRIBE_PLACEHOLDER]
+    )
+
+
+class ContentEmail:
+    """The notification email announcing one article or newsletter.
+
+    Both templates are rendered once, with markers where the greeting and
+    unsubscribe link go. A recipient's message then only substitutes their
+    values into the rendered text, which costs far less than rendering the
+    templates again.
+
+    Usage::
+
+        email = ContentEmail('article', article)
+        for recipient_id, address, username in recipients:
+            email.message(from_email, address, recipient_id, username)
+    """
+
+    def __init__(self, content_type, content):
+        self.content = content
+        self.subject = (
+            f'New {content_type.capitalize()} from {content.author.username}!'
+        )
+        self.html, self.text = _render_once(
+            get_email_templates(content_type),
+            {content_type: content, 'url': _content_url(content_type, content)}
+        )
+        self.unsubscribe_url = _unsubscribe_url()
+        self.signer = get_unsubscribe_signer()
+
+    def render(self, recipient_id=None, name=None):
+        """Return the plain text and HTML bodies for one recipient.
+
+        :param recipient_id: ID of the recipient, for the unsubscribe link
+        :param name: Name to greet the recipient by
+        :returns: Tuple of the plain text and HTML bodies
+        :rtype: tuple
+        """
+        if recipient_id is None:
+            unsubscribe_url = get_site_url()
+        else:
+            unsubscribe_url = self.unsubscribe_url.replace(
+                UNSUBSCRIBE_PLACEHOLDER,
+                make_unsubscribe_token(recipient_id, self.content, self.signer)
+            )
+        return _personalise(
+            self.text, self.html, _greeting(name), unsubscribe_url
+        )
+
+    def message(self, from_email, recipient, recipient_id=None, name=None):
+        """Build the message sent to one recipient.
+
+        :param from_email: Sender address
+        :param recipient: The recipient's email address
+        :param recipient_id: ID of the recipient, for the unsubscribe link
+        :param name: Name to greet the recipient by
+        :returns: The email message
+        :rtype: EmailMultiAlternatives
+        """
+        text, html = self.render(recipient_id, name)
+        return build_message(
+            self.subject, html, from_email, recipient, text_message=text
+        )
+
+
+class DigestEmail:
+    """One email summarising several newly approved items.
+
+    Sent after a bulk approval instead of an email per item. Each recipient
+    only hears about the items from journalists and publishers they follow,
+    so the templates are rendered once per distinct set of items rather
+    than once per recipient.
+
+    Usage::
+
+        email = DigestEmail([('article', article), ('newsletter', letter)])
+        email.message(
+            from_email, address, recipient_id, username,
+            journalist_ids, publisher_ids
+        )
+
+    :param items: List of ``(content_type, content)`` tuples
+    """
+
+    def __init__(self, items):
+        self.items = items
+        self.rendered = {}
+        self.unsubscribe_url = _unsubscribe_url()
+        self.signer = get_unsubscribe_signer()
+
+    def select(self, journalist_ids, publisher_ids):
+        """Return the indexes of the items sent by the given senders.
+
+        :param journalist_ids: IDs of the journalists the recipient follows
+        :param publisher_ids: IDs of the publishers the recipient follows
+        :returns: Indexes into :attr:`items`
+        :rtype: tuple
+        """
+        return tuple(
+            index for index, (_, content) in enumerate(self.items)
+            if content.author_id in journalist_ids
+            or content.publisher_id in publisher_ids
+        )
+
+    def _render_selection(self, selection):
+        if selection not in self.rendered:
+            items = [
+                {
+                    'content_type': content_type,
+                    'content': content,
+                    'url': _content_url(content_type, content),
+                }
+                for content_type, content in (
+                    self.items[index] for index in selection
+                )
+            ]
+            self.rendered[selection] = _render_once(
+                get_email_templates('digest'), {'items': items}
+            )
+        return self.rendered[selection]
+
+    def render(self, recipient_id, name, journalist_ids, publisher_ids):
+        """Return the subject and bodies for one recipient.
+
+        :param recipient_id: ID of the recipient, for the unsubscribe link
+        :param name: Name to greet the recipient by
+        :param journalist_ids: IDs of the journalists the recipient follows
+        :param publisher_ids: IDs of the publishers the recipient follows
+        :returns: Tuple of the subject and the plain text and HTML bodies,
+            or None if none of the items are from the recipient's senders
+        :rtype: tuple or None
+        """
+        selection = self.select(journalist_ids, publisher_ids)
+        if not selection:
+            return None
+        html, text = self._render_selection(selection)
+        selected = [self.items[index][1] for index in selection]
+        token = sign_unsubscribe(
+            recipient_id,
+            {c.author_id for c in selected} & set(journalist_ids),
+            {c.publisher_id for c in selected} & set(publisher_ids),
+            self.signer
+        )
+        text, html = _personalise(
+            text, html, _greeting(name),
+            self.unsubscribe_url.replace(UNSUBSCRIBE_PLACEHOLDER, token)
+        )
+        count = len(selection)
+        subject = (
+            f'{count} new stories from your subscriptions' if count > 1
+            else f'New {self.items[selection[0]][0].capitalize()} from '
+                 f'{selected[0].author.username}!'
+        )
+        return subject, text, html
+
+    def message(self, from_email, recipient, recipient_id, name,
+                journalist_ids, publisher_ids):
+        """Build the message sent to one recipient.
+
+        :param from_email: Sender address
+        :param recipient: The recipient's email address
+        :param recipient_id: ID of the recipient, for the unsubscribe link
+        :param name: Name to greet the recipient by
+        :param journalist_ids: IDs of the journalists the recipient follows
+        :param publisher_ids: IDs of the publishers the recipient follows
+        :returns: The email message, or None if no item concerns them
+        :rtype: EmailMultiAlternatives or None
+        """
+        rendered = self.render(
+            recipient_id, name, journalist_ids, publisher_ids
+        )
+        if rendered is None:
+            return None
+        subject, text, html = rendered
+        return build_message(
+            subject, html, from_email, recipient, text_message=text
+        )
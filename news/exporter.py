@@ -0,0 +1,97 @@
+import json
+import zlib
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import Article, Newsletter
+
+
+EXPORT_MODELS = {
+    'article': Article,
+    'newsletter': Newsletter,
+}
+
+EXPORT_FIELDS = (
+    'id', 'title', 'content', 'approved', 'created_at', 'author', 'publisher'
+)
+
+
+def get_chunk_size():
+    """Return the number of rows fetched per export query."""
+    return getattr(settings, 'NEWS_EXPORT_CHUNK_SIZE', 2000)
+
+
+def export_rows(content_type, chunk_size=None):
+    """Yield every approved article or newsletter as a plain dict.
+
+    Rows are read with ``.values_list()`` in keyset pages of ``chunk_size``, so
+    no model instances are built and only one page is held in memory. Each
+    page is its own short query, so a slow consumer, such as an HTTP client
+    reading a streamed export, doesn't hold a cursor open on the database.
+
+    The fields match those read by ``import_news``.
+
+    :param content_type: Either 'article' or 'newsletter'
+    :param chunk_size: Rows fetched per query
+    :returns: Generator of row dicts
+    """
+    chunk_size = chunk_size or get_chunk_size()
+    rows = (
+        EXPORT_MODELS[content_type].objects.filter(approved=True)
+        .order_by('pk')
+        .values_list(
+            'id', 'title', 'content', 'approved', 'created_at',
+            'author__username', 'publisher__name'
+        )
+    )
+    last_id = 0
+    while True:
+        page = list(rows.filter(pk__gt=last_id)[:chunk_size])
+        for row in page:
+            yield dict(zip(EXPORT_FIELDS, row), type=content_type)
+        if len(page) < chunk_size:
+            return
+        last_id = page[-1][0]
+
+
+def iter_ndjson(content_types=None, chunk_size=None, buffer_size=65536):
+    """Yield approved content as NDJSON, a block of lines at a time.
+
+    :param content_types: Content types to export; both by default
+    :param chunk_size: Rows fetched per query
+    :param buffer_size: Approximate number of bytes per yielded block
+    :returns: Generator of UTF-8 encoded blocks of JSON lines
+    """
+    buffer = []
+    buffered = 0
+    for content_type in content_types or EXPORT_MODELS:
+        for row in export_rows(content_type, chunk_size):
+            line = json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False)
+            line = line.encode('utf-8') + b'\n'
+            buffer.append(line)
+            buffered += len(line)
+            if buffered >= buffer_size:
+                yield b''.join(buffer)
+                buffer = []
+                buffered = 0
+    if buffer:
+        yield b''.join(buffer)
+
+
+def gzip_stream(chunks, level=6):
+    """Compress a stream of bytes incrementally into gzip format.
+
+    Compressed data is yielded as soon as the compressor produces it, so
+    the whole output is never held in memory.
+
+    :param chunks: Iterable of bytes
+    :param level: Compression level from 1 (fastest) to 9 (smallest)
+    :returns: Generator of gzip compressed bytes
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
@@ -0,0 +1,255 @@
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+
+from . import conditional
+from .audience import (
+    JournalistSubscription, PublisherSubscription, subscriber_ids
+)
+from .models import Article, CustomUser, FeedEntry, Newsletter
+
+
+FEED_MODELS = (Article, Newsletter)
+
+
+def get_batch_size():
+    """Return the number of feed rows written per ``bulk_create`` call."""
+    return getattr(settings, 'NEWS_FEED_BATCH_SIZE', 1000)
+
+
+def _bump_on_commit(reader_ids):
+    """Start new feed versions for readers once the transaction commits.
+
+    A version bumped before the commit could be cached with the old feed.
+
+    :param reader_ids: IDs of the readers whose feeds changed
+    """
+    reader_ids = list(reader_ids)
+    if not reader_ids:
+        return
+    batch_size = get_batch_size()
+
+    def bump():
+        for start in range(0, len(reader_ids), batch_size):
+            conditional.bump_feed_versions(
+                reader_ids[start:start + batch_size]
+            )
+    transaction.on_commit(bump)
+
+
+def _bulk_insert(entries):
+    """Insert feed entries in batches, skipping rows that already exist.
+
+    The feed version of every reader given an entry is bumped.
+
+    :param entries: Iterable of unsaved FeedEntry instances
+    :returns: Number of entries submitted, including existing rows
+    :rtype: int
+    """
+    batch_size = get_batch_size()
+    batch = []
+    count = 0
+    reader_ids = set()
+    for entry in entries:
+        batch.append(entry)
+        reader_ids.add(entry.reader_id)
+        if len(batch) >= batch_size:
+            FeedEntry.objects.bulk_create(batch, ignore_conflicts=True)
+            count += len(batch)
+            batch = []
+    if batch:
+        FeedEntry.objects.bulk_create(batch, ignore_conflicts=True)
+        count += len(batch)
+    _bump_on_commit(reader_ids)
+    return count
+
+
+def fan_out(content):
+    """Add approved content to the feed of every subscribed reader.
+
+    :param content: An approved Article or Newsletter instance
+    :returns: Number of feed entries written
+    :rtype: int
+    """
+    content_type = content._meta.model_name
+    readers = CustomUser.objects.filter(
+        pk__in=subscriber_ids(content)
+    ).values_list('pk', flat=True)
+    return _bulk_insert(
+        FeedEntry(
+            reader_id=reader_id,
+            content_type=content_type,
+            content_id=content.pk,
+            created_at=content.created_at
+        )
+        for reader_id in readers.iterator(chunk_size=get_batch_size())
+    )
+
+
+def fan_out_many(contents):
+    """Add a batch of approved content to the feeds of subscribed readers.
+
+    The subscriptions of every author and publisher in the batch are loaded
+    with two queries, instead of two per item as with :func:`fan_out`.
+
+    :param contents: Saved Article or Newsletter instances; unapproved ones
+        are skipped
+    :returns: Number of feed entries written
+    :rtype: int
+    """
+    contents = [content for content in contents if content.approved]
+    if not contents:
+        return 0
+
+    followers = defaultdict(set)
+    rows = JournalistSubscription.objects.filter(
+        to_customuser_id__in={content.author_id for content in contents}
+    ).values_list('from_customuser_id', 'to_customuser_id')
+    for reader_id, journalist_id in rows:
+        followers[journalist_id].add(reader_id)
+
+    subscribers = defaultdict(set)
+    rows = PublisherSubscription.objects.filter(
+        publisher_id__in={content.publisher_id for content in contents}
+    ).values_list('customuser_id', 'publisher_id')
+    for reader_id, publisher_id in rows:
+        subscribers[publisher_id].add(reader_id)
+
+    return _bulk_insert(
+        FeedEntry(
+            reader_id=reader_id,
+            content_type=content._meta.model_name,
+            content_id=content.pk,
+            created_at=content.created_at
+        )
+        for content in contents
+        for reader_id in (
+            followers[content.author_id] | subscribers[content.publisher_id]
+        )
+    )
+
+
+def remove_content(content):
+    """Remove an article or newsletter from every reader's feed.
+
+    :param content: An Article or Newsletter instance
+    :returns: Number of feed entries deleted
+    :rtype: int
+    """
+    entries = FeedEntry.objects.filter(
+        content_type=content._meta.model_name,
+        content_id=content.pk
+    )
+    _bump_on_commit(entries.values_list('reader_id', flat=True))
+    deleted, _ = entries.delete()
+    return deleted
+
+
+def backfill_feed(reader_id, publisher_ids=(), journalist_ids=()):
+    """Add existing approved content from new subscriptions to a feed.
+
+    :param reader_id: ID of the reader who subscribed
+    :param publisher_ids: IDs of newly subscribed publishers
+    :param journalist_ids: IDs of newly followed journalists
+    :returns: Number of feed entries written
+    :rtype: int
+    """
+    subscribed = Q(publisher_id__in=list(publisher_ids))
+    subscribed |= Q(author_id__in=list(journalist_ids))
+    return _insert_matching_content(reader_id, subscribed)
+
+
+def rebuild_feed(reader_id):
+    """Recompute a reader's feed from their current subscriptions.
+
+    :param reader_id: ID of the reader
+    :returns: Number of feed entries written
+    :rtype: int
+    """
+    subscribed = Q(
+        publisher_id__in=PublisherSubscription.objects.filter(
+            customuser_id=reader_id
+        ).values('publisher_id')
+    ) | Q(
+        author_id__in=JournalistSubscription.objects.filter(
+            from_customuser_id=reader_id
+        ).values('to_customuser_id')
+    )
+    with transaction.atomic():
+        FeedEntry.objects.filter(reader_id=reader_id).delete()
+        # The feed may now be empty, so it is bumped whatever is inserted
+        _bump_on_commit([reader_id])
+        return _insert_matching_content(reader_id, subscribed)
+
+
+def _insert_matching_content(reader_id, subscribed):
+    written = 0
+    for model in FEED_MODELS:
+        rows = (
+            model.objects.filter(subscribed, approved=True)
+            .values_list('pk', 'created_at')
+        )
+        written += _bulk_insert(
+            FeedEntry(
+                reader_id=reader_id,
+                content_type=model._meta.model_name,
+                content_id=pk,
+                created_at=created_at
+            )
+            for pk, created_at in rows.iterator(chunk_size=get_batch_size())
+        )
+    return written
+
+
+def feed_queryset(reader, model):
+    """Return the approved content of one type from a reader's feed.
+
+    The feed lookup is a range scan on the ``(reader, content_type,
+    created_at)`` index, newest first.
+
+    :param reader: The reader whose feed is read
+    :param model: Either Article or Newsletter
+    :returns: Queryset of the reader's feed content
+    :rtype: QuerySet
+    """
+    content_ids = FeedEntry.objects.filter(
+        reader=reader,
+        content_type=model._meta.model_name
+    ).values('content_id')
+    return (
+        model.objects.filter(pk__in=content_ids)
+        .select_related('author', 'publisher')
+        .order_by('-created_at', '-id')
+    )
+
+
+def feed_entries(reader, model):
+    """Return a reader's feed entries for one type of content.
+
+    :param reader: The reader whose feed is read
+    :param model: Either Article or Newsletter
+    :returns: Queryset of feed entries, newest first
+    :rtype: QuerySet
+    """
+    return FeedEntry.objects.filter(
+        reader=reader,
+        content_type=model._meta.model_name
+    ).order_by('-created_at', '-content_id')
+
+
+def feed_page_content(entries, model):
+    """Return the content referenced by a page of feed entries.
+
+    Feed entries carry the ``created_at`` of their content, so ordering the
+    content the same way keeps the order of the entries.
+
+    :param entries: Feed entries, e.g. one page of :func:`feed_entries`
+    :param model: Either Article or Newsletter
+    :returns: Queryset of the content, newest first
+    :rtype: QuerySet
+    """
+    return model.objects.filter(
+        pk__in=[entry.content_id for entry in entries]
+    ).order_by('-created_at', '-id')
@@ -0,0 +1,20 @@
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    """PBKDF2 password hasher with a configurable work factor.
+
+    ``NEWS_PBKDF2_ITERATIONS`` sets the number of iterations, Django's own
+    default when unset. Each login costs one hash, so the iteration count
+    trades the time a login takes against the cost of cracking a leaked
+    hash. Passwords hashed with a different count are rehashed with the
+    current one the next time their user logs in.
+    """
+
+    @property
+    def iterations(self):
+        return getattr(
+            settings, 'NEWS_PBKDF2_ITERATIONS',
+            hashers.PBKDF2PasswordHasher.iterations
+        )
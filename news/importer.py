@@ -0,0 +1,440 @@
+import csv
+import gzip
+import json
+import time
+from collections import defaultdict, deque
+from itertools import islice
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from . import conditional, page_cache
+from .audience import JournalistSubscription, PublisherSubscription
+from .feeds import backfill_feed, fan_out_many
+from .models import (
+    Article, CustomUser, Newsletter, Publisher, make_summary
+)
+from .roles import assign_role_groups
+from .search import index_many
+
+
+KINDS = ('publishers', 'users', 'subscriptions', 'articles', 'newsletters')
+FORMATS = ('csv', 'jsonl')
+
+PublisherEditor = Publisher.editors.through
+PublisherJournalist = Publisher.journalists.through
+ROLES = {role for role, _ in CustomUser.ROLE_CHOICES}
+
+
+def get_batch_size():
+    """Return the number of records inserted per ``bulk_create`` call."""
+    return getattr(settings, 'NEWS_IMPORT_BATCH_SIZE', 2000)
+
+
+def read_records(path, format=None):
+    """Stream records from a CSV or JSON Lines file.
+
+    The format is taken from the file extension unless given, and files
+    ending in ``.gz`` are decompressed on the fly. Records are read one at
+    a time, so memory use doesn't grow with the size of the file.
+
+    :param path: Path of the file to read
+    :param format: Either 'csv' or 'jsonl'
+    :returns: Generator of record dicts
+    :raises ValueError: If the format can't be determined
+    """
+    name = path[:-3] if path.endswith('.gz') else path
+    format = format or name.rsplit('.', 1)[-1].lower()
+    if format == 'ndjson':
+        format = 'jsonl'
+    if format not in FORMATS:
+        raise ValueError(f'Unsupported import format: {format}')
+
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt', encoding='utf-8', newline='') as source:
+        if format == 'csv':
+            yield from csv.DictReader(source)
+        else:
+            for line in source:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def import_records(kind, records, batch_size=None, signals=True,
+                   progress=None):
+    """Insert records of one kind with bulk inserts.
+
+    ``bulk_create`` sends no signals. With ``signals`` enabled, the work the
+    signal handlers would have done is done once per batch instead: users
+    join their role group, reader feeds and the search index are updated
+    and the cached home page is invalidated. Imported content is never
+    emailed to subscribers.
+
+    Malformed records, such as content without a title, users with an
+    unknown role or values too long for their column, and records
+    referencing unknown users or publishers are skipped and counted in the
+    ``skipped`` total.
+
+    Usage::
+
+        import_records('articles', read_records('archive.jsonl.gz'))
+
+    :param kind: One of :data:`KINDS`
+    :param records: Iterable of record dicts, e.g. from :func:`read_records`
+    :param batch_size: Records inserted per query
+    :param signals: Whether to do the work of the signal handlers
+    :param progress: Optional callable receiving the running totals
+    :returns: Totals of imported and skipped records and the rate
+    :rtype: dict
+    """
+    if kind not in KINDS:
+        raise ValueError(f'Unknown import kind: {kind}')
+    importer = IMPORTERS[kind]
+    batch_size = batch_size or get_batch_size()
+    lookups = Lookups()
+    totals = {'imported': 0, 'skipped': 0, 'rows_per_second': 0.0}
+    started = time.perf_counter()
+
+    records = iter(records)
+    while True:
+        batch = list(islice(records, batch_size))
+        if not batch:
+            break
+        valid = [record for record in batch if isinstance(record, dict)]
+        with transaction.atomic():
+            imported = importer(valid, lookups, batch_size, signals)
+        totals['imported'] += imported
+        totals['skipped'] += len(batch) - imported
+        elapsed = time.perf_counter() - started
+        totals['rows_per_second'] = (
+            (totals['imported'] + totals['skipped']) / elapsed
+            if elapsed else 0.0
+        )
+        if progress is not None:
+            progress(totals)
+
+    if signals and totals['imported'] and kind != 'subscriptions':
+        page_cache.invalidate()
+    return totals
+
+
+class Lookups:
+    """Usernames and publisher names resolved to IDs, loaded on first use."""
+
+    def __init__(self):
+        self._users = None
+        self._publishers = None
+
+    def user(self, username):
+        if self._users is None:
+            self._users = dict(
+                CustomUser.objects.values_list('username', 'pk').iterator()
+            )
+        return self._users.get(username)
+
+    def add_user(self, user):
+        self.user(user.username)
+        self._users[user.username] = user.pk or 0
+
+    def add_users(self, users):
+        for user in users:
+            self._users[user.username] = user.pk
+
+    def publisher(self, name):
+        if self._publishers is None:
+            # Names aren't unique; references resolve to the oldest
+            self._publishers = {}
+            rows = Publisher.objects.order_by('-pk').values_list('name', 'pk')
+            for publisher_name, pk in rows.iterator():
+                self._publishers[publisher_name] = pk
+        return self._publishers.get(name)
+
+
+def _bulk_create(model, objs, batch_size, natural_key):
+    """Insert objects in bulk and make sure they get their primary keys.
+
+    MySQL and MariaDB don't return the IDs of bulk inserted rows, which the
+    publishers' staff and the signal work need. There the new rows are read
+    back, matching them to the objects by their natural key among the rows
+    newer than any that existed before the insert.
+
+    :param model: The model to insert
+    :param objs: The unsaved instances
+    :param batch_size: Rows inserted per query
+    :param natural_key: Names of the fields identifying a new row
+    :returns: The inserted instances
+    :rtype: list
+    :raises RuntimeError: If an inserted row can't be found again
+    """
+    if not objs or connection.features.can_return_rows_from_bulk_insert:
+        return model.objects.bulk_create(objs, batch_size=batch_size)
+
+    last_pk = model.objects.aggregate(last_pk=Max('pk'))['last_pk'] or 0
+    objs = model.objects.bulk_create(objs, batch_size=batch_size)
+    unsaved = defaultdict(deque)
+    for obj in objs:
+        unsaved[tuple(getattr(obj, name) for name in natural_key)].append(obj)
+    rows = (
+        model.objects.filter(pk__gt=last_pk)
+        .order_by('pk')
+        .values_list(*natural_key, 'pk')
+    )
+    for *key, pk in rows.iterator():
+        waiting = unsaved.get(tuple(key))
+        if waiting:
+            waiting.popleft().pk = pk
+    if any(unsaved.values()):
+        raise RuntimeError(
+            f'Inserted {model._meta.verbose_name_plural} could not be found'
+        )
+    return objs
+
+
+def _split(value):
+    """Return a list from a JSON list or a ``|`` separated CSV value."""
+    if not value:
+        return []
+    if isinstance(value, list):
+        return value
+    return [item.strip() for item in value.split('|') if item.strip()]
+
+
+def _fits(model, field_name, value, required=False):
+    """Return True if a value can be stored in a model's text field.
+
+    Values that aren't strings or are longer than the column are caught
+    here, since MySQL's strict mode would reject the whole batch.
+
+    :param model: The model the value is for
+    :param field_name: Name of the text field
+    :param value: The value from the record
+    :param required: Whether an empty value is rejected
+    :rtype: bool
+    """
+    if value is None or value == '':
+        return not required
+    max_length = model._meta.get_field(field_name).max_length
+    return isinstance(value, str) and (
+        max_length is None or len(value) <= max_length
+    )
+
+
+def _is_valid_user(record):
+    """Return True if a user record can be imported as it is."""
+    username = record.get('username')
+    if not _fits(CustomUser, 'username', username, required=True):
+        return False
+    email = record.get('email')
+    try:
+        CustomUser.username_validator(username)
+        if email:
+            validate_email(email)
+    except (ValidationError, TypeError):
+        return False
+    return (
+        (record.get('role') or 'reader') in ROLES
+        and _fits(CustomUser, 'email', email)
+        and all(
+            _fits(CustomUser, name, record.get(name))
+            for name in ('first_name', 'last_name', 'password')
+        )
+    )
+
+
+def _parse_created_at(value):
+    """Return the aware creation time of a record, or None if it has none.
+
+    :raises ValueError: If the value isn't a valid date and time
+    :raises TypeError: If the value isn't a string
+    """
+    if not value:
+        return None
+    created_at = parse_datetime(value)
+    if created_at is None:
+        raise ValueError(f'Not a date and time: {value!r}')
+    if timezone.is_naive(created_at):
+        created_at = timezone.make_aware(created_at)
+    return created_at
+
+
+def _parse_bool(value):
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ('1', 'true', 'yes')
+
+
+def _import_publishers(batch, lookups, batch_size, signals):
+    batch = [
+        record for record in batch
+        if _fits(Publisher, 'name', record.get('name'), required=True)
+        and _fits(Publisher, 'description', record.get('description'))
+    ]
+    publishers = _bulk_create(
+        Publisher,
+        [
+            Publisher(
+                name=record['name'],
+                description=record.get('description') or None
+            )
+            for record in batch
+        ],
+        batch_size,
+        ('name',)
+    )
+    editors = []
+    journalists = []
+    for publisher, record in zip(publishers, batch):
+        for rows, through, key in (
+            (editors, PublisherEditor, 'editors'),
+            (journalists, PublisherJournalist, 'journalists'),
+        ):
+            for username in _split(record.get(key)):
+                user_id = lookups.user(username)
+                if user_id is not None:
+                    rows.append(through(
+                        publisher_id=publisher.pk, customuser_id=user_id
+                    ))
+    PublisherEditor.objects.bulk_create(
+        editors, batch_size=batch_size, ignore_conflicts=True
+    )
+    PublisherJournalist.objects.bulk_create(
+        journalists, batch_size=batch_size, ignore_conflicts=True
+    )
+    return len(publishers)
+
+
+def _import_users(batch, lookups, batch_size, signals):
+    users = []
+    for record in batch:
+        if not _is_valid_user(record):
+            continue
+        username = record['username']
+        if lookups.user(username) is not None:
+            continue  # Existing or repeated usernames are skipped
+        user = CustomUser(
+            username=username,
+            email=record.get('email') or '',
+            first_name=record.get('first_name') or '',
+            last_name=record.get('last_name') or '',
+            role=record.get('role') or 'reader',
+            # Passwords are expected to be hashed already; hashing plain
+            # text here would dominate the import time
+            password=record.get('password') or make_password(None)
+        )
+        lookups.add_user(user)
+        users.append(user)
+
+    users = _bulk_create(CustomUser, users, batch_size, ('username',))
+    lookups.add_users(users)
+    if signals and users:
+        assign_role_groups(users, batch_size=batch_size)
+    return len(users)
+
+
+def _import_subscriptions(batch, lookups, batch_size, signals):
+    publisher_rows = []
+    journalist_rows = []
+    added = defaultdict(lambda: (set(), set()))
+    for record in batch:
+        reader_id = lookups.user(record.get('reader'))
+        if reader_id is None:
+            continue
+        if record.get('publisher'):
+            publisher_id = lookups.publisher(record['publisher'])
+            if publisher_id is None:
+                continue
+            publisher_rows.append(PublisherSubscription(
+                customuser_id=reader_id, publisher_id=publisher_id
+            ))
+            added[reader_id][0].add(publisher_id)
+        elif record.get('journalist'):
+            journalist_id = lookups.user(record['journalist'])
+            if journalist_id is None:
+                continue
+            journalist_rows.append(JournalistSubscription(
+                from_customuser_id=reader_id, to_customuser_id=journalist_id
+            ))
+            added[reader_id][1].add(journalist_id)
+
+    PublisherSubscription.objects.bulk_create(
+        publisher_rows, batch_size=batch_size, ignore_conflicts=True
+    )
+    JournalistSubscription.objects.bulk_create(
+        journalist_rows, batch_size=batch_size, ignore_conflicts=True
+    )
+    if signals:
+        for reader_id, (publisher_ids, journalist_ids) in added.items():
+            backfill_feed(reader_id, publisher_ids, journalist_ids)
+        # Feed versions are bumped by the backfill
+        reader_ids = list(added)
+        transaction.on_commit(
+            lambda: conditional.bump_subscription_versions(reader_ids)
+        )
+    return len(publisher_rows) + len(journalist_rows)
+
+
+def _import_content(model, batch, lookups, batch_size, signals):
+    items = []
+    now = timezone.now()
+    for record in batch:
+        title = record.get('title')
+        content = record.get('content') or ''
+        if not (
+            _fits(model, 'title', title, required=True)
+            and _fits(model, 'content', content)
+        ):
+            continue
+        author_id = lookups.user(record.get('author'))
+        if author_id is None:
+            continue
+        publisher_id = None
+        if record.get('publisher'):
+            publisher_id = lookups.publisher(record['publisher'])
+            if publisher_id is None:
+                continue
+        try:
+            created_at = _parse_created_at(record.get('created_at'))
+        except (ValueError, TypeError):
+            continue
+        items.append(model(
+            title=title,
+            content=content,
+            summary=make_summary(content),
+            author_id=author_id,
+            publisher_id=publisher_id,
+            approved=_parse_bool(record.get('approved', False)),
+            created_at=created_at or now
+        ))
+
+    # created_at is set on every item, so archived dates are kept
+    items = _bulk_create(
+        model, items, batch_size, ('author_id', 'title', 'created_at')
+    )
+
+    if signals and items:
+        fan_out_many(items)
+        index_many(items, batch_size=batch_size)
+    return len(items)
+
+
+def _import_articles(batch, lookups, batch_size, signals):
+    return _import_content(Article, batch, lookups, batch_size, signals)
+
+
+def _import_newsletters(batch, lookups, batch_size, signals):
+    return _import_content(Newsletter, batch, lookups, batch_size, signals)
+
+
+IMPORTERS = {
+    'publishers': _import_publishers,
+    'users': _import_users,
+    'subscriptions': _import_subscriptions,
+    'articles': _import_articles,
+    'newsletters': _import_newsletters,
+}
@@ -0,0 +1,73 @@
+import base64
+import time
+
+from django.core.management.base import BaseCommand
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from news.models import CustomUser
+
+
+class Command(BaseCommand):
+    """Compare API throughput with Basic and token authentication.
+
+    Calls the subscribed articles API as a benchmark reader, first with
+    HTTP Basic authentication, which hashes the password on every call, and
+    then with an API token, and prints the requests per second of each.
+    The reader and their token are created if they don't exist, so point
+    it at a scratch database::
+
+        USE_SQLITE_FOR_DOCKER=true python manage.py benchmark_api_auth
+        python manage.py benchmark_api_auth --requests 200
+    """
+    help = 'Time API requests with Basic and token authentication.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=50,
+            help='Number of timed requests per authentication method.'
+        )
+
+    def handle(self, *args, **options):
+        password = 'bench-password'
+        reader, created = CustomUser.objects.get_or_create(
+            username='bench_api_reader', defaults={'role': 'reader'}
+        )
+        if created:
+            reader.set_password(password)
+            reader.save()
+        token, _ = Token.objects.get_or_create(user=reader)
+        credentials = base64.b64encode(
+            f'{reader.username}:{password}'.encode()
+        ).decode()
+
+        url = reverse('subscribed_articles')
+        client = APIClient(SERVER_NAME='localhost')
+        rates = {}
+        for label, header in (
+            ('Basic', f'Basic {credentials}'),
+            ('Token', f'Token {token.key}'),
+        ):
+            # One untimed call to warm caches
+            client.get(url, HTTP_AUTHORIZATION=header)
+            started = time.perf_counter()
+            for _ in range(options['requests']):
+                response = client.get(url, HTTP_AUTHORIZATION=header)
+                if response.status_code != 200:
+                    self.stderr.write(
+                        f'{label}: unexpected status {response.status_code}'
+                    )
+                    return
+            elapsed = time.perf_counter() - started
+            rates[label] = options['requests'] / elapsed
+            self.stdout.write(
+                f'{label}: {rates[label]:.1f} requests/s '
+                f'({elapsed / options["requests"] * 1000:.1f}ms per request)'
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f'Token authentication is {rates["Token"] / rates["Basic"]:.1f}x '
+            'faster'
+        ))
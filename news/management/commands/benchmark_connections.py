@@ -0,0 +1,108 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection
+from django.db.backends.signals import connection_created
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from news.models import CustomUser
+
+
+class Command(BaseCommand):
+    """Compare request latency with and without persistent connections.
+
+    Times the home page and the subscribed articles API, first closing the
+    database connection after every request (``CONN_MAX_AGE`` of 0) and
+    then keeping it open between requests, and prints the mean and 95th
+    percentile latency and the number of connections opened in each mode.
+    Connections are closed at the end of each request as the request
+    handler would. The benchmark reader and their token are created if they
+    don't exist, so point it at a scratch database::
+
+        python manage.py benchmark_connections
+        python manage.py benchmark_connections --requests 500 --max-age 300
+    """
+    help = 'Time requests with and without persistent DB connections.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=100,
+            help='Number of timed requests per view and mode.'
+        )
+        parser.add_argument(
+            '--max-age',
+            type=int,
+            default=60,
+            help='CONN_MAX_AGE used for the persistent mode.'
+        )
+
+    def handle(self, *args, **options):
+        reader, _ = CustomUser.objects.get_or_create(
+            username='bench_db_reader', defaults={'role': 'reader'}
+        )
+        token, _ = Token.objects.get_or_create(user=reader)
+        views = (
+            ('home', reverse('home'), {}),
+            ('subscribed_articles', reverse('subscribed_articles'),
+             {'HTTP_AUTHORIZATION': f'Token {token.key}'}),
+        )
+
+        opened = []
+
+        def count(sender, **kwargs):
+            opened.append(sender)
+
+        settings_dict = connection.settings_dict
+        original_max_age = settings_dict['CONN_MAX_AGE']
+        client = APIClient(SERVER_NAME='localhost')
+        connection_created.connect(count)
+        try:
+            for mode, max_age in (
+                ('per request', 0), ('persistent', options['max_age'])
+            ):
+                settings_dict['CONN_MAX_AGE'] = max_age
+                for name, url, headers in views:
+                    connection.close()
+                    # One untimed call to warm caches
+                    client.get(url, **headers)
+                    close_old_connections()
+                    opened.clear()
+                    timings = []
+                    for _ in range(options['requests']):
+                        started = time.perf_counter()
+                        response = client.get(url, **headers)
+                        close_old_connections()
+                        timings.append(time.perf_counter() - started)
+                        if response.status_code != 200:
+                            self.stderr.write(
+                                f'{name}: unexpected status '
+                                f'{response.status_code}'
+                            )
+                            return
+                    self.report(mode, name, timings, len(opened))
+        finally:
+            connection_created.disconnect(count)
+            settings_dict['CONN_MAX_AGE'] = original_max_age
+            connection.close()
+
+    def report(self, mode, name, timings, opened):
+        """Write the latency of one view in one mode.
+
+        :param mode: Label of the connection mode
+        :param name: Name of the view
+        :param timings: Seconds taken by each request
+        :param opened: Number of connections opened
+        """
+        p95 = max(timings)
+        if len(timings) > 1:
+            p95 = statistics.quantiles(timings, n=20)[-1]
+        self.stdout.write(
+            f'{name} ({mode}): mean {statistics.mean(timings) * 1000:.2f}ms, '
+            f'p95 {p95 * 1000:.2f}ms, {opened} connection(s) opened for '
+            f'{len(timings)} requests'
+        )
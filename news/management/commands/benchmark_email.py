@@ -0,0 +1,59 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from news.delivery import ConnectionPool, build_message, deliver
+
+
+class Command(BaseCommand):
+    """Measure per-recipient email delivery throughput.
+
+    Uses Django's in-memory backend by default. To measure against a local
+    SMTP stand-in, start one with ``python -m aiosmtpd -n -l localhost:8025``
+    and run::
+
+        python manage.py benchmark_email --smtp-host localhost --smtp-port 8025
+    """
+    help = 'Benchmark per-recipient email delivery in messages/sec.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--messages', type=int, default=1000)
+        parser.add_argument('--batch-size', type=int, default=None)
+        parser.add_argument('--connections', type=int, default=None)
+        parser.add_argument('--smtp-host', default=None)
+        parser.add_argument('--smtp-port', type=int, default=25)
+
+    def handle(self, *args, **options):
+        if options['smtp_host']:
+            backend = 'django.core.mail.backends.smtp.EmailBackend'
+            backend_kwargs = {
+                'host': options['smtp_host'],
+                'port': options['smtp_port'],
+                'username': '',
+                'password': '',
+                'use_tls': False,
+            }
+        else:
+            backend = 'django.core.mail.backends.locmem.EmailBackend'
+            backend_kwargs = {}
+
+        html_message = '<p>Benchmark message</p>' * 50
+        messages = (
+            build_message(
+                'Benchmark',
+                html_message,
+                settings.DEFAULT_FROM_EMAIL,
+                f'reader{i}@example.com'
+            )
+            for i in range(options['messages'])
+        )
+        with ConnectionPool(
+            options['connections'], backend, **backend_kwargs
+        ) as pool:
+            result = deliver(
+                messages, pool=pool, batch_size=options['batch_size']
+            )
+            opened = pool.opened
+
+        self.stdout.write(
+            self.style.SUCCESS(f'{result} using {opened} connection(s)')
+        )
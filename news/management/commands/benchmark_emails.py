@@ -0,0 +1,83 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.template.loader import render_to_string
+
+from news.emails import (
+    ContentEmail, get_unsubscribe_signer, make_unsubscribe_token
+)
+from news.models import Article, CustomUser
+
+
+class Command(BaseCommand):
+    """Compare rendering notification emails per recipient and once per job.
+
+    Renders the article notification for every recipient of a made up
+    audience, first through the templates for each recipient and then with
+    :class:`news.emails.ContentEmail`, which renders once and substitutes
+    each recipient's greeting and unsubscribe link. Nothing is written to
+    the database or sent.
+
+    Usage::
+
+        python manage.py benchmark_emails
+        python manage.py benchmark_emails --recipients 10000 --paragraphs 20
+    """
+    help = 'Time rendering notification emails for many recipients.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--recipients',
+            type=int,
+            default=100000,
+            help='Number of recipients to render for.'
+        )
+        parser.add_argument(
+            '--paragraphs',
+            type=int,
+            default=8,
+            help='Paragraphs of article content.'
+        )
+
+    def handle(self, *args, **options):
+        recipients = options['recipients']
+        article = Article(
+            pk=1,
+            title='Council approves new harbour bridge',
+            content='\n\n'.join(
+                '<p>' + 'The council met to discuss the bridge. ' * 12 + '</p>'
+                for _ in range(options['paragraphs'])
+            ),
+            author=CustomUser(pk=1, username='bench_journalist')
+        )
+
+        signer = get_unsubscribe_signer()
+        started = time.perf_counter()
+        for i in range(recipients):
+            context = {
+                'article': article,
+                'greeting': f'Hi reader{i},',
+                'unsubscribe_url': make_unsubscribe_token(i, article, signer),
+            }
+            render_to_string('news/article_email.html', context)
+            render_to_string('news/article_email.txt', context)
+        per_recipient = time.perf_counter() - started
+
+        started = time.perf_counter()
+        email = ContentEmail('article', article)
+        for i in range(recipients):
+            email.render(i, f'reader{i}')
+        render_once = time.perf_counter() - started
+
+        for label, elapsed in (
+            ('Rendered per recipient', per_recipient),
+            ('Rendered once', render_once),
+        ):
+            self.stdout.write(
+                f'{label}: {elapsed:.2f}s '
+                f'({elapsed / recipients * 1e6:.1f}us per recipient)'
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f'{per_recipient / render_once:.1f}x faster for '
+            f'{recipients} recipients'
+        ))
@@ -0,0 +1,234 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from news.models import Article, CustomUser, Newsletter, Publisher
+
+
+# The content models whose listing queries are benchmarked
+MODELS = (Article, Newsletter)
+
+
+class Command(BaseCommand):
+    """Benchmark the content listing queries with and without indexes.
+
+    Seeds articles and newsletters in bulk, then runs each listing query
+    shape from ``news/views.py`` twice: once with the composite indexes on
+    ``Article`` and ``Newsletter`` dropped and once with them in place,
+    printing the ``EXPLAIN`` plan and the average time of each. Listings
+    are timed for their first page of 50, except the editor dashboard's
+    pending content, which is read in full so the time shows how the
+    pending rows are found rather than how soon the first 50 turn up.
+    Works on SQLite and MariaDB.
+
+    This writes a large amount of data and drops indexes while it runs, so
+    it refuses to start unless ``--scratch`` confirms the database is a
+    scratch copy::
+
+        USE_SQLITE_FOR_DOCKER=true python manage.py benchmark_queries --scratch
+        python manage.py benchmark_queries --scratch --rows 1000000 --repeat 10
+    """
+    help = 'Seed content and compare listing query plans and timings.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows',
+            type=int,
+            default=1000000,
+            help='Number of articles and of newsletters to seed.'
+        )
+        parser.add_argument(
+            '--skip-seed',
+            action='store_true',
+            help='Benchmark the existing data without seeding.'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=5,
+            help='Number of timed runs per query.'
+        )
+        parser.add_argument(
+            '--database',
+            default='default',
+            help='Database alias to benchmark.'
+        )
+        parser.add_argument(
+            '--scratch',
+            action='store_true',
+            help='Confirm the database is a scratch copy that may be seeded '
+                 'and have its indexes dropped.'
+        )
+
+    def handle(self, *args, **options):
+        if not options['scratch']:
+            raise CommandError(
+                'This seeds data and drops indexes on the '
+                f"'{options['database']}' database. Point it at a scratch "
+                'database and pass --scratch to confirm.'
+            )
+        self.database = options['database']
+        if not options['skip_seed']:
+            self.seed(options['rows'])
+
+        journalist = (
+            CustomUser.objects.using(self.database)
+            .filter(username__startswith='bench_journalist_')
+            .first()
+        )
+        publisher = (
+            Publisher.objects.using(self.database)
+            .filter(name__startswith='Bench Publisher ')
+            .first()
+        )
+        if journalist is None or publisher is None:
+            raise CommandError(
+                'No benchmark data found; run without --skip-seed.'
+            )
+
+        queries = {}
+        for model in MODELS:
+            queries.update(self.listing_queries(model, journalist, publisher))
+
+        connection = connections[self.database]
+        with connection.schema_editor() as schema_editor:
+            for model in MODELS:
+                for index in model._meta.indexes:
+                    schema_editor.remove_index(model, index)
+        try:
+            self.stdout.write(self.style.MIGRATE_HEADING('Without indexes'))
+            before = self.run_queries(queries, options['repeat'])
+        finally:
+            with connection.schema_editor() as schema_editor:
+                for model in MODELS:
+                    for index in model._meta.indexes:
+                        schema_editor.add_index(model, index)
+        self.analyze(connection)
+
+        self.stdout.write(self.style.MIGRATE_HEADING('With indexes'))
+        after = self.run_queries(queries, options['repeat'])
+
+        self.stdout.write(self.style.MIGRATE_HEADING('Summary'))
+        for name in queries:
+            speedup = before[name] / after[name] if after[name] else 0
+            self.stdout.write(
+                f'{name}: {before[name] * 1000:.2f}ms -> '
+                f'{after[name] * 1000:.2f}ms ({speedup:.1f}x)'
+            )
+
+    def listing_queries(self, model, journalist, publisher):
+        """Return the listing queries of one content model.
+
+        :param model: ``Article`` or ``Newsletter``
+        :param journalist: A seeded journalist
+        :param publisher: A seeded publisher
+        :returns: Mapping of query name to queryset
+        :rtype: dict
+        """
+        content = model.objects.using(self.database)
+        label = model._meta.verbose_name
+        return {
+            f'{label} home / content management': content.filter(
+                approved=True
+            ).order_by('-created_at')[:50],
+            f'{label} editor dashboard (all pending)': content.pending()
+            .order_by('-created_at', '-id'),
+            f'{label} journalist dashboard': content.filter(
+                author=journalist
+            ).order_by('-created_at')[:50],
+            f'{label} publisher listing': content.filter(
+                publisher=publisher, approved=True
+            ).order_by('-created_at')[:50],
+        }
+
+    def seed(self, rows):
+        """Bulk insert journalists, publishers, articles and newsletters.
+
+        ``bulk_create`` sends no signals, so seeding doesn't queue
+        distribution jobs or update reader feeds.
+
+        :param rows: Number of articles, and of newsletters, to insert
+        """
+        journalists = CustomUser.objects.using(self.database).bulk_create(
+            [
+                CustomUser(
+                    username=f'bench_journalist_{i}_{time.time_ns()}',
+                    role='journalist'
+                )
+                for i in range(max(rows // 1000, 1))
+            ],
+            batch_size=500
+        )
+        publishers = Publisher.objects.using(self.database).bulk_create(
+            [
+                Publisher(name=f'Bench Publisher {i}')
+                for i in range(max(rows // 10000, 1))
+            ]
+        )
+        if not journalists[0].pk:
+            # Backends that can't return IDs from bulk inserts
+            journalists = list(
+                CustomUser.objects.using(self.database)
+                .filter(username__startswith='bench_journalist_')
+            )
+            publishers = list(
+                Publisher.objects.using(self.database)
+                .filter(name__startswith='Bench Publisher ')
+            )
+
+        batch_size = 10000
+        started = time.perf_counter()
+        for model in MODELS:
+            label = model._meta.verbose_name
+            for offset in range(0, rows, batch_size):
+                model.objects.using(self.database).bulk_create([
+                    model(
+                        title=f'Benchmark {label} {i}',
+                        content='Benchmark content.',
+                        author=journalists[i % len(journalists)],
+                        publisher=publishers[i % len(publishers)],
+                        # Roughly 1 in 17 items is awaiting approval,
+                        # spread across authors and publishers
+                        approved=i % 17 != 0
+                    )
+                    for i in range(offset, min(offset + batch_size, rows))
+                ])
+                self.stdout.write(
+                    f'Seeded {min(offset + batch_size, rows)} {label} rows'
+                )
+        self.stdout.write(self.style.SUCCESS(
+            f'Seeded {rows} articles and {rows} newsletters in '
+            f'{time.perf_counter() - started:.1f}s'
+        ))
+
+    def analyze(self, connection):
+        """Refresh the query planner statistics after changing indexes."""
+        with connection.cursor() as cursor:
+            if connection.vendor == 'sqlite':
+                cursor.execute('ANALYZE')
+            elif connection.vendor == 'mysql':
+                tables = ', '.join(model._meta.db_table for model in MODELS)
+                cursor.execute(f'ANALYZE TABLE {tables}')
+
+    def run_queries(self, queries, repeat):
+        """Print the plan of each query and return its average time.
+
+        :param queries: Mapping of query name to queryset
+        :param repeat: Number of timed runs per query
+        :returns: Mapping of query name to average seconds for one run
+        :rtype: dict
+        """
+        timings = {}
+        for name, queryset in queries.items():
+            self.stdout.write(f'{name}:')
+            for line in queryset.explain().splitlines():
+                self.stdout.write(f'    {line}')
+            started = time.perf_counter()
+            for _ in range(repeat):
+                rows = len(queryset.all())
+            timings[name] = (time.perf_counter() - started) / repeat
+            self.stdout.write(
+                f'    {timings[name] * 1000:.2f}ms for {rows} rows'
+            )
+        return timings
@@ -0,0 +1,159 @@
+import random
+import time
+from functools import reduce
+from itertools import accumulate
+from operator import and_
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+
+from news.models import Article, CustomUser
+from news.search import SearchResults, get_backend, get_terms, index_many
+
+
+# Each seeded article mentions a few of these topics, so a one word query
+# matches a few percent of articles
+TOPICS = (
+    'election harbour council budget school transport housing market '
+    'energy weather football cricket museum festival hospital police '
+    'river bridge railway airport farming fishing theatre library '
+    'science climate economy tourism heritage coastline parliament '
+    'minister mayor inquiry strike protest charity village city'
+).split()
+
+
+class Command(BaseCommand):
+    """Compare full-text search with a naive ``icontains`` scan.
+
+    Seeds approved articles of random text, then times each query through
+    the search index and as ``icontains`` filters over the article table,
+    fetching the match count and the first page both ways.
+
+    This writes a large amount of data, so point it at a scratch database::
+
+        USE_SQLITE_FOR_DOCKER=true python manage.py benchmark_search
+        python manage.py benchmark_search --rows 1000000 --query "river bridge"
+    """
+    help = 'Seed articles and compare search index and icontains timings.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows',
+            type=int,
+            default=200000,
+            help='Number of articles to seed.'
+        )
+        parser.add_argument(
+            '--skip-seed',
+            action='store_true',
+            help='Benchmark the existing data without seeding.'
+        )
+        parser.add_argument(
+            '--query',
+            action='append',
+            dest='queries',
+            help='Query to benchmark; may be repeated.'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=3,
+            help='Number of timed runs per query.'
+        )
+
+    def handle(self, *args, **options):
+        if not options['skip_seed']:
+            self.seed(options['rows'])
+        queries = options['queries'] or [
+            'election', 'harbour council', 'railway strike minister'
+        ]
+
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f'Search backend: {get_backend()}'
+        ))
+        for query in queries:
+            if not get_terms(query):
+                raise CommandError(f'Query has no words: {query!r}')
+            indexed, matches = self.time(
+                lambda: self.search_index(query), options['repeat']
+            )
+            naive, naive_matches = self.time(
+                lambda: self.search_icontains(query), options['repeat']
+            )
+            speedup = naive / indexed if indexed else 0
+            self.stdout.write(
+                f'{query!r}: index {indexed * 1000:.2f}ms '
+                f'({matches} matches), icontains {naive * 1000:.2f}ms '
+                f'({naive_matches} matches), {speedup:.1f}x'
+            )
+
+    def seed(self, rows):
+        """Bulk insert and index approved articles of random text.
+
+        :param rows: Number of articles to insert
+        """
+        author = CustomUser.objects.create_user(
+            username=f'bench_search_{time.time_ns()}', role='journalist'
+        )
+        generator = random.Random(rows)
+        # Filler words with a Zipf-like frequency, as in natural text
+        syllables = ['ka', 'lo', 'mi', 'ren', 'tu', 'sa', 'vel', 'dor', 'in']
+        filler = [
+            ''.join(generator.choices(syllables, k=generator.randint(2, 4)))
+            for _ in range(20000)
+        ]
+        cum_weights = list(accumulate(
+            1 / rank for rank in range(1, len(filler) + 1)
+        ))
+
+        def text(words):
+            chosen = generator.choices(filler, cum_weights=cum_weights, k=words)
+            chosen += generator.sample(TOPICS, 2)
+            generator.shuffle(chosen)
+            return ' '.join(chosen)
+
+        batch_size = 5000
+        started = time.perf_counter()
+        for offset in range(0, rows, batch_size):
+            articles = Article.objects.bulk_create([
+                Article(
+                    title=text(4),
+                    content=text(80),
+                    author=author,
+                    approved=True
+                )
+                for _ in range(min(batch_size, rows - offset))
+            ])
+            if articles[0].pk is None:
+                raise CommandError(
+                    'The database did not return IDs; use SQLite or MariaDB '
+                    '10.5+ to seed.'
+                )
+            index_many(articles)
+            self.stdout.write(f'Seeded {offset + len(articles)} rows')
+        self.stdout.write(self.style.SUCCESS(
+            f'Seeded {rows} articles in {time.perf_counter() - started:.1f}s'
+        ))
+
+    def search_index(self, query):
+        results = SearchResults(query)
+        list(results[:20])
+        return results.count()
+
+    def search_icontains(self, query):
+        articles = Article.objects.filter(
+            reduce(and_, (
+                Q(title__icontains=term) | Q(content__icontains=term)
+                for term in get_terms(query)
+            )),
+            approved=True
+        )
+        list(articles.order_by('-created_at')[:20])
+        return articles.count()
+
+    def time(self, search, repeat):
+        """Return the average time of a search and its match count."""
+        started = time.perf_counter()
+        for _ in range(repeat):
+            matches = search()
+        return (time.perf_counter() - started) / repeat, matches
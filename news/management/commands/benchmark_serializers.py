@@ -0,0 +1,82 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from news.models import Article, CustomUser, Publisher
+from news.serializers import ArticleSerializer, serialize_content_values
+
+
+class Command(BaseCommand):
+    """Compare the model serializers with serializing database rows.
+
+    Seeds approved articles, then serializes them newest first with
+    :class:`ArticleSerializer` and with
+    :func:`news.serializers.serialize_content_values`, checks both give the
+    same output and prints the average time of each.
+
+    This writes data, so point it at a scratch database::
+
+        USE_SQLITE_FOR_DOCKER=true python manage.py benchmark_serializers
+        python manage.py benchmark_serializers --rows 50000 --repeat 5
+    """
+    help = 'Seed articles and time model serializers against row values.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows',
+            type=int,
+            default=10000,
+            help='Number of articles to seed.'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=3,
+            help='Number of timed runs per serializer.'
+        )
+
+    def handle(self, *args, **options):
+        name = f'bench_serializers_{time.time_ns()}'
+        author = CustomUser.objects.create_user(
+            username=name, role='journalist'
+        )
+        publisher = Publisher.objects.create(name=name)
+        Article.objects.bulk_create(
+            (
+                Article(
+                    title=f'Bench {i}', content='Body ' * 50, summary='Body',
+                    author=author, publisher=publisher, approved=True
+                )
+                for i in range(options['rows'])
+            ),
+            batch_size=2000
+        )
+        queryset = Article.objects.filter(author=author).order_by(
+            '-created_at', '-id'
+        )
+
+        serializer_time, data = self.time(
+            lambda: ArticleSerializer(
+                queryset.select_related('author', 'publisher'), many=True
+            ).data,
+            options['repeat']
+        )
+        values_time, values = self.time(
+            lambda: serialize_content_values(queryset), options['repeat']
+        )
+        if values != data:
+            raise CommandError('The two serializers gave different output.')
+
+        speedup = serializer_time / values_time if values_time else 0
+        self.stdout.write(
+            f'Serialized {len(values)} articles: model serializer '
+            f'{serializer_time * 1000:.2f}ms, values '
+            f'{values_time * 1000:.2f}ms ({speedup:.1f}x)'
+        )
+
+    def time(self, serialize, repeat):
+        """Return the average time of a serializer run and its output."""
+        started = time.perf_counter()
+        for _ in range(repeat):
+            data = serialize()
+        return (time.perf_counter() - started) / repeat, data
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+
+from news import counters, page_cache
+
+
+class Command(BaseCommand):
+    """Show the home page cache hit and miss counters.
+
+    The counters need a cache shared by every process, see
+    :func:`news.counters.is_enabled`.
+
+    Usage::
+
+        python manage.py cache_stats
+        python manage.py cache_stats --reset
+    """
+    help = 'Show home page cache hit/miss counters.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reset',
+            action='store_true',
+            help='Reset the counters after showing them.'
+        )
+
+    def handle(self, *args, **options):
+        if not counters.is_enabled():
+            self.stderr.write(counters.DISABLED_WARNING)
+        for part, counts in page_cache.get_stats().items():
+            total = counts['hit'] + counts['miss']
+            ratio = counts['hit'] / total if total else 0
+            self.stdout.write(
+                f"{part}: {counts['hit']} hits, {counts['miss']} misses "
+                f"({ratio:.0%} hit rate)"
+            )
+        if options['reset']:
+            page_cache.reset_stats()
+            self.stdout.write(self.style.SUCCESS('Counters reset.'))
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+
+from news import connections, counters
+
+
+class Command(BaseCommand):
+    """Show how often database connections are opened and reused.
+
+    The counters need a cache shared by every process, see
+    :func:`news.counters.is_enabled`.
+
+    Usage::
+
+        python manage.py db_stats
+        python manage.py db_stats --reset
+    """
+    help = 'Show database connection open/reuse counters.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reset',
+            action='store_true',
+            help='Reset the counters after showing them.'
+        )
+
+    def handle(self, *args, **options):
+        if not counters.is_enabled():
+            self.stderr.write(counters.DISABLED_WARNING)
+        stats = connections.get_stats()
+        total = stats['requests'] + stats['cycles']
+        ratio = stats['reused'] / total if total else 0
+        self.stdout.write(
+            f"{stats['opened']} connections opened for {stats['requests']} "
+            f"requests and {stats['cycles']} worker cycles "
+            f"({ratio:.0%} reused a connection)"
+        )
+        if options['reset']:
+            connections.reset_stats()
+            self.stdout.write(self.style.SUCCESS('Counters reset.'))
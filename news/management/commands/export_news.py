@@ -0,0 +1,73 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from news.exporter import EXPORT_MODELS, gzip_stream, iter_ndjson
+
+
+class Command(BaseCommand):
+    """Export all approved articles and newsletters as NDJSON.
+
+    Each line is one JSON object with the content's author and publisher
+    names. Output is written as it is produced, so memory use stays flat
+    however many rows are exported. Files ending in ``.gz`` are gzipped.
+
+    Usage::
+
+        python manage.py export_news > content.ndjson
+        python manage.py export_news --type article --output articles.ndjson.gz
+    """
+    help = 'Stream approved content to a file or stdout as NDJSON.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output',
+            default='-',
+            help='File to write to; - for stdout.'
+        )
+        parser.add_argument(
+            '--type',
+            choices=list(EXPORT_MODELS),
+            action='append',
+            dest='content_types',
+            help='Content type to export; may be repeated. Default: all.'
+        )
+        parser.add_argument(
+            '--gzip',
+            action='store_true',
+            help='Compress the output; implied by a .gz output file.'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            help='Number of rows fetched per query.'
+        )
+
+    def handle(self, *args, **options):
+        compress = options['gzip'] or options['output'].endswith('.gz')
+        chunks = iter_ndjson(options['content_types'], options['chunk_size'])
+        if compress:
+            chunks = gzip_stream(chunks)
+
+        if options['output'] == '-':
+            target = getattr(self.stdout, 'buffer', None)
+            if target is not None:
+                self.write(chunks, target)
+                target.flush()
+            elif compress:
+                raise CommandError('Gzipped output needs a binary stream.')
+            else:
+                # A text stream, e.g. when called with call_command
+                for chunk in chunks:
+                    self.stdout.write(chunk.decode('utf-8'), ending='')
+        else:
+            with open(options['output'], 'wb') as target:
+                written = self.write(chunks, target)
+            self.stderr.write(self.style.SUCCESS(
+                f"Wrote {written} bytes to {options['output']}."
+            ))
+
+    def write(self, chunks, target):
+        written = 0
+        for chunk in chunks:
+            target.write(chunk)
+            written += len(chunk)
+        return written
@@ -0,0 +1,74 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from news.importer import FORMATS, KINDS, import_records, read_records
+
+
+class Command(BaseCommand):
+    """Bulk import publishers, users, subscriptions or content from a file.
+
+    Records are streamed from CSV or JSON Lines files (optionally gzipped)
+    and inserted in batches. Users and publishers are referenced by
+    username and name, so import publishers and users before the
+    subscriptions and content that refer to them. Fields by kind:
+
+    * publishers: ``name``, ``description``, ``editors``, ``journalists``
+    * users: ``username``, ``email``, ``role``, ``first_name``,
+      ``last_name``, ``password`` (already hashed)
+    * subscriptions: ``reader`` and either ``publisher`` or ``journalist``
+    * articles/newsletters: ``title``, ``content``, ``author``,
+      ``publisher``, ``approved``, ``created_at``
+
+    In CSV files, lists of usernames are separated with ``|``.
+
+    Usage::
+
+        python manage.py import_news users users.csv
+        python manage.py import_news articles archive.jsonl.gz --no-signals
+    """
+    help = 'Bulk import news data from a CSV or JSON Lines file.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=KINDS)
+        parser.add_argument('path', help='CSV or JSON Lines file to import.')
+        parser.add_argument(
+            '--format',
+            choices=FORMATS,
+            help='File format; taken from the file extension by default.'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            help='Number of records inserted per query.'
+        )
+        parser.add_argument(
+            '--no-signals',
+            action='store_true',
+            help=(
+                'Skip role groups, feed and search index updates and cache '
+                'invalidation; run sync_roles, rebuild_feeds and '
+                'rebuild_search_index afterwards.'
+            )
+        )
+
+    def handle(self, *args, **options):
+        def report(totals):
+            self.stdout.write(
+                f"Imported {totals['imported']} record(s) "
+                f"({totals['rows_per_second']:.0f} rows/sec)..."
+            )
+
+        try:
+            totals = import_records(
+                options['kind'],
+                read_records(options['path'], options['format']),
+                batch_size=options['batch_size'],
+                signals=not options['no_signals'],
+                progress=report
+            )
+        except (OSError, ValueError, KeyError) as e:
+            raise CommandError(f'Import failed: {e!r}')
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {totals['imported']} {options['kind']}, skipped "
+            f"{totals['skipped']} ({totals['rows_per_second']:.0f} rows/sec)."
+        ))
@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand
+
+from news.feeds import rebuild_feed
+from news.models import CustomUser
+
+
+class Command(BaseCommand):
+    """Recompute the precomputed feeds of all readers.
+
+    Usage::
+
+        python manage.py rebuild_feeds
+        python manage.py rebuild_feeds --batch-size 200
+    """
+    help = 'Rebuild the precomputed subscription feed of every reader.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Number of readers loaded per batch.'
+        )
+
+    def handle(self, *args, **options):
+        readers = CustomUser.objects.filter(role='reader').order_by('pk')
+        last_id = 0
+        rebuilt = 0
+        entries = 0
+        while True:
+            batch = list(
+                readers.filter(pk__gt=last_id)
+                .values_list('pk', flat=True)[:options['batch_size']]
+            )
+            if not batch:
+                break
+            for reader_id in batch:
+                entries += rebuild_feed(reader_id)
+            rebuilt += len(batch)
+            last_id = batch[-1]
+            self.stdout.write(f'Rebuilt {rebuilt} feed(s)...')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt {rebuilt} feed(s) with {entries} entries.'
+        ))
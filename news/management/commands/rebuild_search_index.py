@@ -0,0 +1,53 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from news.models import SearchDocument
+from news.search import FTS_TABLE, SEARCH_MODELS, get_backend, index_many
+
+
+class Command(BaseCommand):
+    """Rebuild the full-text search index from approved content.
+
+    Content is indexed in batches, so search results are incomplete until
+    the rebuild finishes.
+
+    Usage::
+
+        python manage.py rebuild_search_index
+        python manage.py rebuild_search_index --batch-size 5000
+    """
+    help = 'Rebuild the search index of approved articles and newsletters.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of documents indexed per batch.'
+        )
+
+    def handle(self, *args, **options):
+        SearchDocument.objects.all().delete()
+        indexed = 0
+        for model in SEARCH_MODELS.values():
+            content = model.objects.filter(approved=True).order_by('pk')
+            last_id = 0
+            while True:
+                batch = list(
+                    content.filter(pk__gt=last_id)[:options['batch_size']]
+                )
+                if not batch:
+                    break
+                indexed += index_many(batch, options['batch_size'])
+                last_id = batch[-1].pk
+                self.stdout.write(f'Indexed {indexed} document(s)...')
+
+        if get_backend() == 'fts5':
+            # Merge the index segments written by the batches
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')"
+                )
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt the search index with {indexed} document(s).'
+        ))
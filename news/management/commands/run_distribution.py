@@ -0,0 +1,67 @@
+from django.core.management.base import BaseCommand
+
+from news.connections import end_cycle
+from news.distribution import get_setting, run_pending_jobs, wait_for_jobs
+
+
+class Command(BaseCommand):
+    """Worker that delivers queued article and newsletter distribution jobs.
+
+    While the queue is empty the worker waits for an approval to commit,
+    checking the queue at least every ``--poll-interval`` seconds.
+
+    Usage::
+
+        python manage.py run_distribution
+        python manage.py run_distribution --once --chunk-size 1000
+    """
+    help = 'Process queued distribution jobs for approved content.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Process the current queue and exit instead of polling.'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=None,
+            help='Number of recipients per chunk.'
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=None,
+            help='Seconds to wait between polls when the queue is empty.'
+        )
+
+    def handle(self, *args, **options):
+        poll_interval = options['poll_interval'] or get_setting(
+            'NEWS_DISTRIBUTION_POLL_INTERVAL', 5
+        )
+        while True:
+            processed = run_pending_jobs(
+                chunk_size=options['chunk_size'],
+                progress=self.report_progress
+            )
+            end_cycle()
+            if processed:
+                self.stdout.write(
+                    self.style.SUCCESS(f'Processed {processed} job(s).')
+                )
+            if options['once']:
+                break
+            if not processed:
+                wait_for_jobs(poll_interval)
+
+    def report_progress(self, job):
+        """Write a progress line for a job after each chunk.
+
+        :param job: The distribution job being processed
+        """
+        self.stdout.write(
+            f'Job {job.pk} ({job.content_type} #{job.object_id}): '
+            f'{job.sent_recipients}/{job.total_recipients} recipients'
+            f' ({job.failed_recipients} failed)'
+        )
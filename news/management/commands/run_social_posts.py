@@ -0,0 +1,50 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from news.connections import end_cycle
+from news.social import SocialPoster, get_setting
+
+
+class Command(BaseCommand):
+    """Worker that publishes queued X/Twitter posts for approved content.
+
+    One HTTP session is kept open for the life of the worker, and posts
+    are sent no faster than ``NEWS_SOCIAL_POSTS_PER_HOUR``.
+
+    Usage::
+
+        python manage.py run_social_posts
+        python manage.py run_social_posts --once
+    """
+    help = 'Publish queued X/Twitter posts for approved content.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Send the posts that are due and exit instead of polling.'
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=None,
+            help='Seconds to wait between polls when no post is due.'
+        )
+
+    def handle(self, *args, **options):
+        poll_interval = options['poll_interval'] or get_setting(
+            'NEWS_DISTRIBUTION_POLL_INTERVAL', 5
+        )
+        with SocialPoster() as poster:
+            while True:
+                attempted = poster.send_due()
+                end_cycle()
+                if attempted:
+                    self.stdout.write(
+                        self.style.SUCCESS(f'Attempted {attempted} post(s).')
+                    )
+                if options['once']:
+                    break
+                if not attempted:
+                    time.sleep(poll_interval)
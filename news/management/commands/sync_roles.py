@@ -0,0 +1,56 @@
+from django.core.management.base import BaseCommand
+
+from news.models import CustomUser
+from news.roles import assign_role_groups, sync_roles
+
+
+class Command(BaseCommand):
+    """Provision the role groups and their permissions.
+
+    Also adds every user to their role's group, which backfills users
+    created with ``bulk_create``. Running it again changes nothing.
+
+    Usage::
+
+        python manage.py sync_roles
+        python manage.py sync_roles --skip-users
+    """
+    help = 'Create the role groups, grant their permissions and add users.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--skip-users',
+            action='store_true',
+            help='Only provision the groups and permissions.'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of users loaded per batch.'
+        )
+
+    def handle(self, *args, **options):
+        groups = sync_roles()
+        for role, group in groups.items():
+            self.stdout.write(
+                f'{group.name}: {group.permissions.count()} permission(s)'
+            )
+        if options['skip_users']:
+            return
+
+        users = CustomUser.objects.order_by('pk').only('pk', 'role')
+        last_id = 0
+        assigned = 0
+        while True:
+            batch = list(
+                users.filter(pk__gt=last_id)[:options['batch_size']]
+            )
+            if not batch:
+                break
+            assigned += assign_role_groups(batch)
+            last_id = batch[-1].pk
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Checked the group of {assigned} user(s).'
+        ))
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-17 04:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0002_distributionjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='distributionjob',
+            name='failed_recipients',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 4.2.30 on 2026-10-17 04:35
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def populate_feeds(apps, schema_editor):
+    """Build feed entries for existing readers and approved content."""
+    CustomUser = apps.get_model('news', 'CustomUser')
+    FeedEntry = apps.get_model('news', 'FeedEntry')
+    content_models = (
+        ('article', apps.get_model('news', 'Article')),
+        ('newsletter', apps.get_model('news', 'Newsletter')),
+    )
+    for reader in CustomUser.objects.filter(role='reader').iterator():
+        publisher_ids = reader.subscriptions_publishers.values('pk')
+        journalist_ids = reader.subscriptions_journalists.values('pk')
+        for content_type, model in content_models:
+            rows = model.objects.filter(
+                models.Q(publisher__in=publisher_ids) |
+                models.Q(author__in=journalist_ids),
+                approved=True
+            ).values_list('pk', 'created_at')
+            FeedEntry.objects.bulk_create(
+                [
+                    FeedEntry(
+                        reader_id=reader.pk,
+                        content_type=content_type,
+                        content_id=pk,
+                        created_at=created_at
+                    )
+                    for pk, created_at in rows
+                ],
+                batch_size=1000,
+                ignore_conflicts=True
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0003_distributionjob_failed_recipients'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeedEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content_type', models.CharField(choices=[('article', 'Article'), ('newsletter', 'Newsletter')], max_length=20)),
+                ('content_id', models.PositiveBigIntegerField()),
+                ('created_at', models.DateTimeField()),
+                ('reader', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='feed_entries', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name_plural': 'Feed Entries',
+                'indexes': [models.Index(fields=['reader', 'content_type', '-created_at'], name='feed_reader_type_created_idx'), models.Index(fields=['content_type', 'content_id'], name='feed_content_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='feedentry',
+            constraint=models.UniqueConstraint(fields=('reader', 'content_type', 'content_id'), name='unique_feed_entry'),
+        ),
+        migrations.RunPython(populate_feeds, migrations.RunPython.noop),
+    ]
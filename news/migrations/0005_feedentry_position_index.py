@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-10-17 04:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0004_feedentry'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='feedentry',
+            name='feed_reader_type_created_idx',
+        ),
+        migrations.AddIndex(
+            model_name='feedentry',
+            index=models.Index(fields=['reader', 'content_type', '-created_at', '-content_id'], name='feed_reader_position_idx'),
+        ),
+    ]
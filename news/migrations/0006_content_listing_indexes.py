@@ -0,0 +1,37 @@
+# Generated by Django 4.2.30 on 2026-10-17 04:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0005_feedentry_position_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['-created_at'], name='article_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['author', '-created_at'], name='article_author_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['publisher', '-created_at'], name='article_pub_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='newsletter',
+            index=models.Index(fields=['-created_at'], name='nl_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='newsletter',
+            index=models.Index(fields=['author', '-created_at'], name='nl_author_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='newsletter',
+            index=models.Index(fields=['publisher', '-created_at'], name='nl_pub_created_idx'),
+        ),
+    ]
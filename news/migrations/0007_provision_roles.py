@@ -0,0 +1,67 @@
+from django.contrib.auth.management import create_permissions
+from django.db import migrations
+
+
+ROLE_GROUPS = {
+    'reader': 'Readers',
+    'editor': 'Editors',
+    'journalist': 'Journalists',
+}
+
+ROLE_PERMISSIONS = {
+    'reader': ['view_article', 'view_newsletter'],
+    'editor': [
+        'view_article', 'change_article', 'delete_article',
+        'view_newsletter', 'change_newsletter', 'delete_newsletter',
+    ],
+    'journalist': [
+        'add_article', 'view_article', 'change_article', 'delete_article',
+        'add_newsletter', 'view_newsletter', 'change_newsletter',
+        'delete_newsletter',
+    ],
+}
+
+
+def provision_roles(apps, schema_editor):
+    """Create the role groups and add existing users to them."""
+    # Permissions are normally created after all migrations have run
+    app_config = apps.get_app_config('news')
+    app_config.models_module = True
+    create_permissions(app_config, apps=apps, verbosity=0)
+    app_config.models_module = None
+
+    Group = apps.get_model('auth', 'Group')
+    Permission = apps.get_model('auth', 'Permission')
+    CustomUser = apps.get_model('news', 'CustomUser')
+    Membership = CustomUser.groups.through
+
+    for role, name in ROLE_GROUPS.items():
+        group, _ = Group.objects.get_or_create(name=name)
+        group.permissions.add(*Permission.objects.filter(
+            content_type__app_label='news',
+            codename__in=ROLE_PERMISSIONS[role]
+        ))
+        users = CustomUser.objects.filter(role=role).values_list(
+            'pk', flat=True
+        )
+        Membership.objects.bulk_create(
+            [
+                Membership(customuser_id=pk, group_id=group.pk)
+                for pk in users.iterator()
+            ],
+            batch_size=1000,
+            ignore_conflicts=True
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('news', '0006_content_listing_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(provision_roles, migrations.RunPython.noop),
+    ]
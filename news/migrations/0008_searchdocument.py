@@ -0,0 +1,127 @@
+# Generated by Django 4.2.30 on 2026-10-17 05:05
+
+from django.db import migrations, models
+
+
+SQLITE_CREATE = [
+    # External content table: the text is stored once, in the documents
+    """CREATE VIRTUAL TABLE news_searchdocument_fts USING fts5(
+        title, body, content='news_searchdocument', content_rowid='id',
+        tokenize='porter unicode61'
+    )""",
+    """CREATE TRIGGER news_searchdocument_ai AFTER INSERT
+    ON news_searchdocument BEGIN
+        INSERT INTO news_searchdocument_fts(rowid, title, body)
+        VALUES (new.id, new.title, new.body);
+    END""",
+    """CREATE TRIGGER news_searchdocument_ad AFTER DELETE
+    ON news_searchdocument BEGIN
+        INSERT INTO news_searchdocument_fts(
+            news_searchdocument_fts, rowid, title, body
+        ) VALUES ('delete', old.id, old.title, old.body);
+    END""",
+    """CREATE TRIGGER news_searchdocument_au AFTER UPDATE
+    ON news_searchdocument BEGIN
+        INSERT INTO news_searchdocument_fts(
+            news_searchdocument_fts, rowid, title, body
+        ) VALUES ('delete', old.id, old.title, old.body);
+        INSERT INTO news_searchdocument_fts(rowid, title, body)
+        VALUES (new.id, new.title, new.body);
+    END""",
+]
+
+SQLITE_DROP = [
+    'DROP TRIGGER IF EXISTS news_searchdocument_au',
+    'DROP TRIGGER IF EXISTS news_searchdocument_ad',
+    'DROP TRIGGER IF EXISTS news_searchdocument_ai',
+    'DROP TABLE IF EXISTS news_searchdocument_fts',
+]
+
+MYSQL_CREATE = [
+    'ALTER TABLE news_searchdocument '
+    'ADD FULLTEXT INDEX news_search_fulltext (title, body)',
+]
+
+MYSQL_DROP = [
+    'ALTER TABLE news_searchdocument DROP INDEX news_search_fulltext',
+]
+
+
+def sqlite_has_fts5(connection):
+    with connection.cursor() as cursor:
+        cursor.execute('PRAGMA compile_options')
+        return ('ENABLE_FTS5',) in cursor.fetchall()
+
+
+def create_search_index(apps, schema_editor):
+    """Create the full-text index and index existing approved content."""
+    connection = schema_editor.connection
+    statements = []
+    if connection.vendor == 'sqlite' and sqlite_has_fts5(connection):
+        statements = SQLITE_CREATE
+    elif connection.vendor == 'mysql':
+        statements = MYSQL_CREATE
+    for statement in statements:
+        schema_editor.execute(statement)
+
+    SearchDocument = apps.get_model('news', 'SearchDocument')
+    for content_type, model_name in (
+        ('article', 'Article'), ('newsletter', 'Newsletter')
+    ):
+        model = apps.get_model('news', model_name)
+        rows = model.objects.filter(approved=True).values_list(
+            'pk', 'title', 'content', 'created_at'
+        )
+        SearchDocument.objects.bulk_create(
+            [
+                SearchDocument(
+                    content_type=content_type,
+                    content_id=pk,
+                    title=title,
+                    body=content,
+                    created_at=created_at
+                )
+                for pk, title, content, created_at in rows.iterator()
+            ],
+            batch_size=1000
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    statements = []
+    if connection.vendor == 'sqlite':
+        statements = SQLITE_DROP
+    elif connection.vendor == 'mysql':
+        statements = MYSQL_DROP
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0007_provision_roles'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content_type', models.CharField(choices=[('article', 'Article'), ('newsletter', 'Newsletter')], max_length=20)),
+                ('content_id', models.PositiveBigIntegerField()),
+                ('title', models.CharField(max_length=200)),
+                ('body', models.TextField()),
+                ('created_at', models.DateTimeField()),
+            ],
+            options={
+                'verbose_name_plural': 'Search Documents',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='searchdocument',
+            constraint=models.UniqueConstraint(fields=('content_type', 'content_id'), name='unique_search_document'),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
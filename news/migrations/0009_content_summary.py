@@ -0,0 +1,43 @@
+# Generated by Django 4.2.30 on 2026-10-17 05:14
+
+from django.db import migrations, models
+from django.utils.html import strip_tags
+from django.utils.text import Truncator
+
+
+def populate_summaries(apps, schema_editor):
+    """Compute the summary of existing articles and newsletters."""
+    for model_name in ('Article', 'Newsletter'):
+        items = apps.get_model('news', model_name).objects.order_by('pk')
+        last_id = 0
+        while True:
+            batch = list(
+                items.filter(pk__gt=last_id).only('pk', 'content')[:1000]
+            )
+            if not batch:
+                break
+            for item in batch:
+                item.summary = Truncator(strip_tags(item.content)).chars(200)
+            items.model.objects.bulk_update(batch, ['summary'])
+            last_id = batch[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0008_searchdocument'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='summary',
+            field=models.CharField(blank=True, editable=False, max_length=200),
+        ),
+        migrations.AddField(
+            model_name='newsletter',
+            name='summary',
+            field=models.CharField(blank=True, editable=False, max_length=200),
+        ),
+        migrations.RunPython(populate_summaries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 4.2.30 on 2026-10-17 06:02
+
+from django.db import migrations, models
+from django.db.models import F
+import django.utils.timezone
+
+
+def copy_created_at(apps, schema_editor):
+    """Treat existing content as last saved when it was created."""
+    for model_name in ('Article', 'Newsletter'):
+        apps.get_model('news', model_name).objects.update(
+            updated_at=F('created_at')
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0009_content_summary'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='updated_at',
+            field=models.DateTimeField(
+                auto_now=True, default=django.utils.timezone.now
+            ),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='newsletter',
+            name='updated_at',
+            field=models.DateTimeField(
+                auto_now=True, default=django.utils.timezone.now
+            ),
+            preserve_default=False,
+        ),
+        migrations.RunPython(copy_created_at, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.30 on 2026-10-17 05:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0011_socialpost'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='distributionjob',
+            name='items',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AlterField(
+            model_name='distributionjob',
+            name='content_type',
+            field=models.CharField(choices=[('article', 'Article'), ('newsletter', 'Newsletter'), ('digest', 'Digest')], max_length=20),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 4.2.30 on 2026-10-17 06:17
+
+from django.db import migrations, models
+from django.db.models import F
+import django.utils.timezone
+
+
+def start_heartbeats(apps, schema_editor):
+    """Give jobs that are already running a heartbeat."""
+    DistributionJob = apps.get_model('news', 'DistributionJob')
+    DistributionJob.objects.filter(status='running').update(
+        heartbeat_at=F('started_at')
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0012_distributionjob_items'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='distributionjob',
+            name='heartbeat_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='distributionjob',
+            name='next_attempt_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.RunPython(start_heartbeats, migrations.RunPython.noop),
+    ]
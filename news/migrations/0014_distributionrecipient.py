@@ -0,0 +1,27 @@
+# Generated by Django 4.2.30 on 2026-10-17 06:21
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0013_distributionjob_retry_heartbeat'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DistributionRecipient',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('recipient_id', models.PositiveBigIntegerField()),
+                ('email', models.EmailField(max_length=254)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recipients', to='news.distributionjob')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='distributionrecipient',
+            constraint=models.UniqueConstraint(fields=('job', 'recipient_id'), name='unique_distribution_recipient'),
+        ),
+    ]
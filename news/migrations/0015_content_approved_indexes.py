@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-10-17 06:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0014_distributionrecipient'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['approved', '-created_at'], name='article_approved_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='newsletter',
+            index=models.Index(fields=['approved', '-created_at'], name='nl_approved_created_idx'),
+        ),
+    ]
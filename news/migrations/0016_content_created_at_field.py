@@ -0,0 +1,24 @@
+# Generated by Django 4.2.30 on 2026-10-17 06:44
+
+from django.db import migrations
+import news.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0015_content_approved_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='article',
+            name='created_at',
+            field=news.models.CreatedAtField(auto_now_add=True),
+        ),
+        migrations.AlterField(
+            model_name='newsletter',
+            name='created_at',
+            field=news.models.CreatedAtField(auto_now_add=True),
+        ),
+    ]
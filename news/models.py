@@ -1,8 +1,41 @@
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth.models import AbstractUser
-from django.contrib.auth.models import Group, Permission
 from django.db.models.signals import post_save, pre_save
 from django.dispatch import receiver
+from django.utils import timezone
+from django.utils.html import strip_tags
+from django.utils.text import Truncator
+
+from .roles import get_role_group_ids
+
+
+# Length of the plain text excerpt shown in content listings
+SUMMARY_LENGTH = 200
+
+
+def make_summary(content):
+    """Return a plain text excerpt of article or newsletter content.
+
+    :param content: The full content, which may contain HTML
+    :returns: At most ``SUMMARY_LENGTH`` characters of text
+    :rtype: str
+    """
+    return Truncator(strip_tags(content)).chars(SUMMARY_LENGTH)
+
+
+def refresh_summary(instance, update_fields=None):
+    """Recompute the summary of an article or newsletter before saving.
+
+    :param instance: An Article or Newsletter instance
+    :param update_fields: Fields passed to ``save(update_fields=...)``
+    :returns: The fields to save, including the summary if it changed
+    """
+    if 'content' not in instance.__dict__:
+        return update_fields  # Deferred, so the content isn't changing
+    instance.summary = make_summary(instance.content)
+    if update_fields is not None and 'content' in update_fields:
+        return {*update_fields, 'summary'}
+    return update_fields
 
 
 # Create your models here.
@@ -64,6 +97,33 @@ class CustomUser(AbstractUser):
     def __str__(self):
         return self.username
 
+    # This is a flag to check the previous value of the 'role' field
+    _original_role = None
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.pk is not None:
+            # Read from __dict__ so a deferred role doesn't trigger a query
+            self._original_role = self.__dict__.get('role')
+        else:
+            self._original_role = None
+
+    def get_session_auth_hash(self):
+        """Return an HMAC of the password, which signed in sessions store.
+
+        Users served from the cache don't hold their password hash but
+        carry this HMAC instead (see :mod:`news.authentication`), so
+        checking their session costs no query.
+
+        :rtype: str
+        """
+        if (
+            'password' in self.get_deferred_fields()
+            and hasattr(self, '_session_auth_hash')
+        ):
+            return self._session_auth_hash
+        return super().get_session_auth_hash()
+
     class Meta:
         # A simple Meta class to add a more descriptive
         # name in the admin panel.
@@ -98,6 +158,36 @@ class Publisher(models.Model):
         return self.name
 
 
+class CreatedAtField(models.DateTimeField):
+    """Creation time set when a row is first saved, unless already given.
+
+    Works like ``auto_now_add``, except that a time assigned before the
+    first save is kept, so imported content keeps its original dates.
+    """
+
+    def pre_save(self, model_instance, add):
+        value = getattr(model_instance, self.attname)
+        if add and value is not None:
+            return value
+        return super().pre_save(model_instance, add)
+
+
+class ContentQuerySet(models.QuerySet):
+    """Queries shared by articles and newsletters."""
+
+    def pending(self):
+        """Return the content awaiting approval.
+
+        Django writes ``approved=False`` as a bare ``NOT approved``, which
+        SQLite and MySQL can't use to seek on the ``(approved, created_at)``
+        index; the equivalent ``IN`` lookup can, so the editor dashboard
+        only reads the pending rows however much content is approved.
+
+        :rtype: QuerySet
+        """
+        return self.filter(approved__in=[False])
+
+
 class Article(models.Model):
     """Represents a news article in the system.
     
@@ -106,13 +196,18 @@ class Article(models.Model):
     
     :field title: The title of the article
     :field content: The main content of the article
+    :field summary: Plain text excerpt of the content, kept up to date on save
     :field author: The journalist who wrote the article
     :field publisher: The publisher associated with the article
     :field approved: Whether the article has been approved for publication
     :field created_at: Timestamp of when the article was created
+    :field updated_at: Timestamp of when the article was last saved
     """
     title = models.CharField(max_length=200)
     content = models.TextField()
+    summary = models.CharField(
+        max_length=SUMMARY_LENGTH, blank=True, editable=False
+    )
     author = models.ForeignKey(
         CustomUser,
         on_delete=models.CASCADE,
@@ -126,7 +221,10 @@ class Article(models.Model):
         blank=True
     )
     approved = models.BooleanField(default=False)
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = CreatedAtField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = ContentQuerySet.as_manager()
 
     def __str__(self):
         return self.title
@@ -141,6 +239,41 @@ class Article(models.Model):
         else:
             self._original_approved = None
 
+    def save(self, *args, **kwargs):
+        # Listings show the summary so they can defer loading the content
+        update_fields = refresh_summary(self, kwargs.get('update_fields'))
+        if update_fields:
+            # auto_now only reaches the database if the field is written
+            update_fields = {*update_fields, 'updated_at'}
+        kwargs['update_fields'] = update_fields
+        super().save(*args, **kwargs)
+
+    class Meta:
+        # Indexes matching the listing queries in views.py. Django filters
+        # booleans as a bare column on SQLite, which can't seek on it, so
+        # the approved listings scan newest first and filter on approved;
+        # almost all content is approved, so a page is found quickly. The
+        # few pending rows are found through the approved index instead,
+        # see ContentQuerySet.pending().
+        indexes = [
+            models.Index(
+                fields=['-created_at'],
+                name='article_created_idx'
+            ),
+            models.Index(
+                fields=['approved', '-created_at'],
+                name='article_approved_created_idx'
+            ),
+            models.Index(
+                fields=['author', '-created_at'],
+                name='article_author_created_idx'
+            ),
+            models.Index(
+                fields=['publisher', '-created_at'],
+                name='article_pub_created_idx'
+            ),
+        ]
+
 
 class Newsletter(models.Model):
     """Represents a newsletter in the system.
@@ -150,13 +283,18 @@ class Newsletter(models.Model):
     
     :field title: The title of the newsletter
     :field content: The main content of the newsletter
+    :field summary: Plain text excerpt of the content, kept up to date on save
     :field author: The journalist who created the newsletter
     :field publisher: The publisher associated with the newsletter
     :field approved: Whether the newsletter has been approved for sending
     :field created_at: Timestamp of when the newsletter was created
+    :field updated_at: Timestamp of when the newsletter was last saved
     """
     title = models.CharField(max_length=200)
     content = models.TextField()
+    summary = models.CharField(
+        max_length=SUMMARY_LENGTH, blank=True, editable=False
+    )
     author = models.ForeignKey(
         CustomUser,
         on_delete=models.CASCADE,
@@ -170,7 +308,10 @@ class Newsletter(models.Model):
         blank=True
     )
     approved = models.BooleanField(default=False)
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = CreatedAtField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = ContentQuerySet.as_manager()
 
     def __str__(self):
         return self.title
@@ -185,89 +326,340 @@ class Newsletter(models.Model):
         else:
             self._original_approved = None
 
+    def save(self, *args, **kwargs):
+        # Listings show the summary so they can defer loading the content
+        update_fields = refresh_summary(self, kwargs.get('update_fields'))
+        if update_fields:
+            # auto_now only reaches the database if the field is written
+            update_fields = {*update_fields, 'updated_at'}
+        kwargs['update_fields'] = update_fields
+        super().save(*args, **kwargs)
+
+    class Meta:
+        # Same listing indexes as Article
+        indexes = [
+            models.Index(
+                fields=['-created_at'],
+                name='nl_created_idx'
+            ),
+            models.Index(
+                fields=['approved', '-created_at'],
+                name='nl_approved_created_idx'
+            ),
+            models.Index(
+                fields=['author', '-created_at'],
+                name='nl_author_created_idx'
+            ),
+            models.Index(
+                fields=['publisher', '-created_at'],
+                name='nl_pub_created_idx'
+            ),
+        ]
+
+
+class DistributionJob(models.Model):
+    """A durable outbox entry for distributing approved content to subscribers.
+
+    Jobs are created in the same transaction as the approval, so they only
+    become visible to the distribution worker once the approval commits.
+    The worker streams recipients in chunks and records its progress here,
+    allowing an interrupted job to resume where it left off.
+
+    :field content_type: The kind of content being distributed; a digest
+        covers several items approved together
+    :field object_id: Primary key of the article or newsletter (0 for a
+        digest)
+    :field items: ``[content_type, object_id]`` pairs of a digest's items
+    :field status: Current processing state of the job
+    :field total_recipients: Number of recipients resolved for the job
+    :field sent_recipients: Number of recipients emailed successfully
+    :field failed_recipients: Number of recipients whose email failed
+    :field last_recipient_id: ID of the last recipient processed (resume cursor)
+    :field attempts: Number of times a worker has picked up the job
+    :field next_attempt_at: Earliest time the job may be (re)tried
+    :field last_error: Error message from the most recent failed attempt
+    :field created_at: Timestamp of when the job was enqueued
+    :field started_at: Timestamp of when the latest attempt started
+    :field heartbeat_at: Timestamp of the running worker's latest progress
+    :field finished_at: Timestamp of when the job completed or failed
+    """
+    CONTENT_TYPE_CHOICES = (
+        ('article', 'Article'),
+        ('newsletter', 'Newsletter'),
+    )
+    JOB_TYPE_CHOICES = CONTENT_TYPE_CHOICES + (
+        ('digest', 'Digest'),
+    )
+    STATUS_CHOICES = (
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    )
+    content_type = models.CharField(
+        max_length=20,
+        choices=JOB_TYPE_CHOICES
+    )
+    object_id = models.PositiveBigIntegerField()
+    items = models.JSONField(default=list, blank=True)
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default='pending',
+        db_index=True
+    )
+    total_recipients = models.PositiveIntegerField(default=0)
+    sent_recipients = models.PositiveIntegerField(default=0)
+    failed_recipients = models.PositiveIntegerField(default=0)
+    last_recipient_id = models.PositiveBigIntegerField(default=0)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return (
+            f"{self.content_type} #{self.object_id} ({self.status}: "
+            f"{self.sent_recipients}/{self.total_recipients})"
+        )
+
+    class Meta:
+        ordering = ['created_at']
+
+
+class DistributionRecipient(models.Model):
+    """A recipient of a distribution job, resolved when the job starts.
+
+    A job's audience is deduplicated once, in a single streamed query, and
+    stored here, so every chunk is a short range scan over the job's own
+    rows instead of rerunning the deduplicating query. The rows are
+    deleted once the job is done or has failed.
+
+    :field job: The distribution job
+    :field recipient_id: Lowest ID of the users sharing the address
+    :field email: The recipient's email address
+    """
+    job = models.ForeignKey(
+        DistributionJob,
+        on_delete=models.CASCADE,
+        related_name='recipients'
+    )
+    recipient_id = models.PositiveBigIntegerField()
+    email = models.EmailField()
+
+    def __str__(self):
+        return f"{self.email} (job #{self.job_id})"
+
+    class Meta:
+        constraints = [
+            # Also the index the worker pages through
+            models.UniqueConstraint(
+                fields=['job', 'recipient_id'],
+                name='unique_distribution_recipient'
+            ),
+        ]
+
+
+class SocialPost(models.Model):
+    """A queued announcement of approved content on X/Twitter.
+
+    Posts are sent by the social posting worker, never during the
+    approval itself. Failed posts are retried with exponential backoff
+    until ``NEWS_SOCIAL_MAX_ATTEMPTS`` is reached.
+
+    :field content_type: The kind of content announced
+    :field object_id: Primary key of the article or newsletter
+    :field text: The text of the post
+    :field status: Current processing state of the post
+    :field attempts: Number of times sending has been attempted
+    :field next_attempt_at: Earliest time the post may be (re)sent
+    :field last_error: Error message from the most recent failed attempt
+    :field post_id: ID of the published post returned by the API
+    :field created_at: Timestamp of when the post was queued
+    :field sent_at: Timestamp of when the post was published
+    """
+    STATUS_CHOICES = (
+        ('pending', 'Pending'),
+        ('sending', 'Sending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    )
+    content_type = models.CharField(
+        max_length=20,
+        choices=DistributionJob.CONTENT_TYPE_CHOICES
+    )
+    object_id = models.PositiveBigIntegerField()
+    text = models.TextField()
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default='pending'
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True, default='')
+    post_id = models.CharField(max_length=64, blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.content_type} #{self.object_id} ({self.status})"
+
+    class Meta:
+        ordering = ['next_attempt_at']
+        indexes = [
+            # The worker's queue scan: due pending posts, oldest first
+            models.Index(
+                fields=['status', 'next_attempt_at'],
+                name='social_post_queue_idx'
+            ),
+        ]
+
+
+class FeedEntry(models.Model):
+    """A precomputed row of a reader's subscription feed.
+
+    Rows are written when content is approved (fan-out on write) so that a
+    reader's dashboard is a single indexed range scan over their own rows
+    instead of a join across both subscription tables.
+
+    :field reader: The reader whose feed the entry belongs to
+    :field content_type: The kind of content referenced
+    :field content_id: Primary key of the article or newsletter
+    :field created_at: Creation time of the content, used for ordering
+    """
+    CONTENT_TYPE_CHOICES = DistributionJob.CONTENT_TYPE_CHOICES
+    reader = models.ForeignKey(
+        CustomUser,
+        on_delete=models.CASCADE,
+        related_name='feed_entries'
+    )
+    content_type = models.CharField(
+        max_length=20,
+        choices=CONTENT_TYPE_CHOICES
+    )
+    content_id = models.PositiveBigIntegerField()
+    created_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.reader} - {self.content_type} #{self.content_id}"
+
+    class Meta:
+        verbose_name_plural = "Feed Entries"
+        constraints = [
+            models.UniqueConstraint(
+                fields=['reader', 'content_type', 'content_id'],
+                name='unique_feed_entry'
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=[
+                    'reader', 'content_type', '-created_at', '-content_id'
+                ],
+                name='feed_reader_position_idx'
+            ),
+            models.Index(
+                fields=['content_type', 'content_id'],
+                name='feed_content_idx'
+            ),
+        ]
+
+
+class SearchDocument(models.Model):
+    """The searchable text of an approved article or newsletter.
+
+    The full-text index over these rows lives in the database: an FTS5
+    table kept in sync by triggers on SQLite and a FULLTEXT index on
+    MariaDB/MySQL, both created by migration 0008. SQLite drops the
+    triggers if Django remakes this table, so migrations altering it must
+    recreate them.
+
+    :field content_type: The kind of content indexed
+    :field content_id: Primary key of the article or newsletter
+    :field title: Title of the content
+    :field body: Text of the content
+    :field created_at: Creation time of the content
+    """
+    CONTENT_TYPE_CHOICES = DistributionJob.CONTENT_TYPE_CHOICES
+    content_type = models.CharField(
+        max_length=20,
+        choices=CONTENT_TYPE_CHOICES
+    )
+    content_id = models.PositiveBigIntegerField()
+    title = models.CharField(max_length=200)
+    body = models.TextField()
+    created_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.content_type} #{self.content_id}: {self.title}"
+
+    class Meta:
+        verbose_name_plural = "Search Documents"
+        constraints = [
+            models.UniqueConstraint(
+                fields=['content_type', 'content_id'],
+                name='unique_search_document'
+            ),
+        ]
+
 
 @receiver(post_save, sender=CustomUser)
 def assign_permissions_to_groups(sender, instance, created, **kwargs):
-    """Signal receiver to assign permissions when a new user is created.
+    """Signal receiver to add a new user to their role's group.
     
-    Automatically assigns users to appropriate groups and permissions
-    based on their selected role.
+    The groups and their permissions are provisioned once by a migration and
+    the ``sync_roles`` command, and the group IDs are cached, so this is a
+    single insert per user.
     
     :param sender: The model class (CustomUser)
     :param instance: The actual instance being saved
     :param created: Boolean indicating if this is a new instance
     """
     if created:
-        try:
-            reader_group, created = Group.objects.get_or_create(name='Readers')
-            editor_group, created = Group.objects.get_or_create(name='Editors')
-            journalist_group, created = Group.objects.get_or_create(
-                name='Journalists'
-            )
-
-            if instance.role == 'reader':
-                instance.groups.add(reader_group)
-                # Assign permissions
-                reader_permissions = Permission.objects.filter(
-                    codename__in=['view_article', 'view_newsletter']
-                )
-                reader_group.permissions.add(*reader_permissions)
-            elif instance.role == 'editor':
-                instance.groups.add(editor_group)
-                # Assign permissions
-                editor_permissions = Permission.objects.filter(
-                    codename__in=[
-                        'view_article', 'change_article', 'delete_article',
-                        'view_newsletter',
-                        'change_newsletter',
-                        'delete_newsletter'
-                    ]
-                )
-                editor_group.permissions.add(*editor_permissions)
-            elif instance.role == 'journalist':
-                instance.groups.add(journalist_group)
-                # Assign permissions
-                journalist_permissions = Permission.objects.filter(
-                    codename__in=[
-                        'add_article', 'view_article', 'change_article',
-                        'delete_article', 'add_newsletter', 'view_newsletter',
-                        'change_newsletter', 'delete_newsletter'
-                    ]
-                )
-                journalist_group.permissions.add(*journalist_permissions)
-        except (Group.DoesNotExist, Permission.DoesNotExist) as e:
-            print(f"Error assigning permissions to groups: {e}")
-        except ValueError as e:
-            # For unexpected errors, optionally log or handle differently
-            print(f"Unexpected error assigning permissions to groups: {e}")
+        group_id = get_role_group_ids().get(instance.role)
+        if group_id is not None:
+            instance.groups.add(group_id)
 
 
 @receiver(pre_save, sender=CustomUser)
-def clear_unrelated_fields(sender, instance, **kwargs):
+def clear_unrelated_fields(sender, instance, update_fields=None, **kwargs):
     """Signal receiver to clear role-specific fields when user role changes.
     
     Ensures that users don't retain permissions or data from previous roles
-    when their role is updated.
+    when their role is updated. The previous role is the one tracked on the
+    instance when it was loaded, so ordinary saves such as ``last_login``
+    updates on login don't query the database.
     
     :param sender: The model class (CustomUser)
     :param instance: The actual instance being saved
+    :param update_fields: Fields passed to ``save(update_fields=...)``
     """
-    # Check if this is an existing user being
-    # updated and if the role has changed
-    if instance.pk:
-        try:
-            old_instance = CustomUser.objects.get(pk=instance.pk)
-            if old_instance.role != instance.role:
-                # Role has changed, clear fields not relevant to the new role
-                if instance.role in ['reader', 'editor']:
-                    # Clear journalist-related fields
-                    instance.articles.clear()
-                    instance.newsletters.clear()
-
-                if instance.role != 'reader':
-                    # Clear reader-related fields
-                    instance.subscriptions_publishers.clear()
-                    instance.subscriptions_journalists.clear()
-
-        except CustomUser.DoesNotExist:
-            pass  # New user, no need to clear fields yet
\ No newline at end of file
+    if instance._state.adding:
+        return  # New user, no need to clear fields yet
+    if update_fields is not None and 'role' not in update_fields:
+        return
+
+    old_role = instance._original_role
+    if old_role is None:
+        # The role was deferred when the user was loaded
+        old_role = CustomUser.objects.filter(pk=instance.pk).values_list(
+            'role', flat=True
+        ).first()
+    if old_role is None or old_role == instance.role:
+        return
+
+    # Role has changed, clear fields not relevant to the new role
+    with transaction.atomic():
+        if instance.role in ['reader', 'editor']:
+            # Clear journalist-related fields
+            instance.articles.clear()
+            instance.newsletters.clear()
+
+        if instance.role != 'reader':
+            # Clear reader-related fields
+            instance.subscriptions_publishers.clear()
+            instance.subscriptions_journalists.clear()
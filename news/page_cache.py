@@ -0,0 +1,123 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from . import counters
+from .replicas import use_primary
+
+
+VERSION_KEY = 'news:home:version'
+STATS_PARTS = ('page', 'fragment')
+STATS_EVENTS = ('hit', 'miss')
+
+
+def get_timeout():
+    """Return how long rendered home page content is cached, in seconds."""
+    return getattr(settings, 'NEWS_HOME_CACHE_TIMEOUT', 300)
+
+
+def get_version():
+    """Return the current version of the cached home page content.
+
+    The version is part of every cache key, so invalidating the cache only
+    has to replace this one value; stale entries are never read again and
+    simply expire.
+
+    :returns: The current version token
+    :rtype: int
+    """
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, time.time_ns(), None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def invalidate():
+    """Invalidate all cached home page content."""
+    cache.set(VERSION_KEY, time.time_ns(), None)
+
+
+def make_key(part, variant):
+    """Return the cache key for part of the home page.
+
+    :param part: Either 'page' or 'fragment'
+    :param variant: Audience variant, 'anonymous' or 'authenticated'
+    :returns: The versioned cache key
+    :rtype: str
+    """
+    return f'news:home:{part}:{variant}:{get_version()}'
+
+
+def get_or_render(part, variant, render):
+    """Return cached content, rendering and caching it on a miss.
+
+    :param part: Either 'page' or 'fragment'
+    :param variant: Audience variant, 'anonymous' or 'authenticated'
+    :param render: Callable producing the content on a cache miss
+    :returns: Tuple of the content and whether it came from the cache
+    :rtype: tuple
+    """
+    key = make_key(part, variant)
+    content = cache.get(key)
+    if content is not None:
+        record(part, 'hit')
+        return content, True
+
+    record(part, 'miss')
+    # Cached for everyone, so never rendered from a lagging replica
+    with use_primary():
+        content = render()
+    cache.set(key, content, get_timeout())
+    return content, False
+
+
+def make_stats_key(part, event):
+    """Return the cache key of a hit or miss counter.
+
+    :param part: Either 'page' or 'fragment'
+    :param event: Either 'hit' or 'miss'
+    :rtype: str
+    """
+    return f'news:home:stats:{part}:{event}'
+
+
+def record(part, event):
+    """Increment a hit or miss counter.
+
+    Does nothing unless counters are kept, see :func:`counters.is_enabled`.
+
+    :param part: Either 'page' or 'fragment'
+    :param event: Either 'hit' or 'miss'
+    """
+    counters.increment(make_stats_key(part, event))
+
+
+def get_stats():
+    """Return the hit and miss counters for each cached part.
+
+    :returns: Mapping of part to its hit and miss counts
+    :rtype: dict
+    """
+    counts = counters.get_counts([
+        make_stats_key(part, event)
+        for part in STATS_PARTS
+        for event in STATS_EVENTS
+    ])
+    return {
+        part: {
+            event: counts[make_stats_key(part, event)]
+            for event in STATS_EVENTS
+        }
+        for part in STATS_PARTS
+    }
+
+
+def reset_stats():
+    """Reset all hit and miss counters to zero."""
+    counters.reset([
+        make_stats_key(part, event)
+        for part in STATS_PARTS
+        for event in STATS_EVENTS
+    ])
@@ -0,0 +1,181 @@
+import base64
+import json
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetCursorPagination(BasePagination):
+    """Keyset (cursor) pagination over a ``(created_at, id)`` ordering.
+
+    Each page is fetched with a ``WHERE (created_at, id) < (x, y)`` range
+    condition and a ``LIMIT`` instead of an ``OFFSET``, so the cost of a page
+    stays constant however deep a client pages. The position is handed to
+    clients as an opaque cursor in the ``next`` and ``previous`` links.
+
+    The queryset is ordered newest first by :attr:`ordering`, which must name
+    a timestamp field followed by a unique tie-breaker field.
+    """
+    ordering = ('created_at', 'id')
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def get_page_size(self, request):
+        """Return the requested page size, capped at the configured maximum.
+
+        :param request: The API request
+        :returns: Number of items per page
+        :rtype: int
+        """
+        page_size = getattr(settings, 'NEWS_API_PAGE_SIZE', 20)
+        max_page_size = getattr(settings, 'NEWS_API_MAX_PAGE_SIZE', 100)
+        try:
+            requested = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return page_size
+        return max(1, min(requested, max_page_size))
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Return one page of the queryset as a list.
+
+        :param queryset: The queryset to paginate
+        :param request: The API request
+        :param view: The calling view
+        :returns: Items on the requested page
+        :rtype: list
+        """
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        position = self.decode_cursor(request)
+        time_field, id_field = self.ordering
+
+        if position is None or position['d'] == 'n':
+            queryset = queryset.order_by(f'-{time_field}', f'-{id_field}')
+            if position is not None:
+                queryset = queryset.filter(
+                    self.after_condition(position, 'lt')
+                )
+            results = list(queryset[:self.page_size + 1])
+            self.has_next = len(results) > self.page_size
+            self.has_previous = position is not None
+            self.page = results[:self.page_size]
+        else:
+            queryset = queryset.order_by(time_field, id_field).filter(
+                self.after_condition(position, 'gt')
+            )
+            results = list(queryset[:self.page_size + 1])
+            self.has_previous = len(results) > self.page_size
+            self.has_next = True
+            self.page = list(reversed(results[:self.page_size]))
+        return self.page
+
+    def after_condition(self, position, lookup):
+        """Build the keyset filter for rows beyond a cursor position."""
+        time_field, id_field = self.ordering
+        created_at = parse_datetime(position['t'])
+        return Q(**{f'{time_field}__{lookup}': created_at}) | Q(**{
+            time_field: created_at,
+            f'{id_field}__{lookup}': position['i'],
+        })
+
+    def get_paginated_response(self, data):
+        """Wrap serialized page data with the next and previous links.
+
+        :param data: Serialized items on the page
+        :returns: Paginated API response
+        :rtype: Response
+        """
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_next_link(self):
+        """Return the link to the following page, if there is one."""
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], 'n')
+
+    def get_previous_link(self):
+        """Return the link to the previous page, if there is one."""
+        if not self.has_previous:
+            return None
+        if not self.page:
+            # Paged past the end; go back to the first page
+            url = self.request.build_absolute_uri()
+            return remove_query_param(url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], 'p')
+
+    def encode_cursor(self, item, direction):
+        """Build a link to the page next to an item.
+
+        :param item: First or last item on the current page
+        :param direction: 'n' for the following page, 'p' for the previous
+        :returns: Absolute URL with an opaque cursor
+        :rtype: str
+        """
+        time_field, id_field = self.ordering
+        position = {
+            't': getattr(item, time_field).isoformat(),
+            'i': getattr(item, id_field),
+            'd': direction,
+        }
+        cursor = base64.urlsafe_b64encode(
+            json.dumps(position).encode('ascii')
+        ).decode('ascii')
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def decode_cursor(self, request):
+        """Decode the cursor query parameter of a request.
+
+        :param request: The API request
+        :returns: The decoded position, or None for the first page
+        :raises NotFound: If the cursor is malformed
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            position = json.loads(base64.urlsafe_b64decode(encoded))
+            if (
+                position['d'] not in ('n', 'p')
+                or parse_datetime(position['t']) is None
+            ):
+                raise ValueError(position)
+            position['i'] = int(position['i'])
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        return position
+
+
+class FeedCursorPagination(KeysetCursorPagination):
+    """Cursor pagination over a reader's feed entries."""
+    ordering = ('created_at', 'content_id')
+
+
+class SearchPagination(PageNumberPagination):
+    """Page number pagination over ranked search results.
+
+    Results are ordered by relevance rather than by a unique key, so they
+    are paged with an offset and the total number of matches is included.
+    """
+    page_size_query_param = 'page_size'
+
+    def get_page_size(self, request):
+        """Return the requested page size, capped at the configured maximum.
+
+        :param request: The API request
+        :returns: Number of items per page
+        :rtype: int
+        """
+        self.page_size = getattr(settings, 'NEWS_API_PAGE_SIZE', 20)
+        self.max_page_size = getattr(settings, 'NEWS_API_MAX_PAGE_SIZE', 100)
+        return super().get_page_size(request)
@@ -0,0 +1,62 @@
+from django.conf import settings
+from django.core.cache import cache
+
+from .audience import JournalistSubscription, PublisherSubscription
+from .conditional import get_subscription_version
+from .replicas import use_primary
+
+
+PROFILE_KEY = 'news:profile:{}:{}'
+
+
+def get_timeout():
+    """Return how long profile snapshots are cached, in seconds."""
+    return getattr(settings, 'NEWS_PROFILE_CACHE_TIMEOUT', 300)
+
+
+def load_profile(user):
+    """Load a snapshot of a user's role and subscriptions from the database.
+
+    :param user: The signed in user
+    :returns: The snapshot, see :func:`get_profile`
+    :rtype: dict
+    """
+    return {
+        'role': user.role,
+        'publisher_ids': frozenset(
+            PublisherSubscription.objects.filter(customuser_id=user.pk)
+            .values_list('publisher_id', flat=True)
+        ),
+        'journalist_ids': frozenset(
+            JournalistSubscription.objects.filter(from_customuser_id=user.pk)
+            .values_list('to_customuser_id', flat=True)
+        ),
+    }
+
+
+def get_profile(user):
+    """Return a cached snapshot of a user's role and subscriptions.
+
+    The snapshot is cached under the user's subscription version, which
+    is replaced whenever their subscriptions change (including when a role
+    change clears them), so a stale snapshot is never read. A snapshot
+    taken under a different role is reloaded.
+
+    Usage::
+
+        profile = get_profile(request.user)
+        if publisher.pk in profile['publisher_ids']:
+            ...
+
+    :param user: The signed in user
+    :returns: Dict of the ``role`` and the frozensets ``publisher_ids`` and
+        ``journalist_ids`` of the publishers and journalists followed
+    :rtype: dict
+    """
+    key = PROFILE_KEY.format(user.pk, get_subscription_version(user.pk))
+    profile = cache.get(key)
+    if profile is None or profile['role'] != user.role:
+        with use_primary():
+            profile = load_profile(user)
+        cache.set(key, profile, get_timeout())
+    return profile
@@ -0,0 +1,178 @@
+import hashlib
+import random
+import threading
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+PIN_COOKIE = 'news_primary'
+PIN_KEY = 'news:db:pin:{}'
+REPLICA_VIEWS = (
+    'home', 'article_detail', 'dashboard',
+    'subscribed_articles', 'subscribed_newsletters',
+)
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+_state = threading.local()
+
+
+def get_replicas():
+    """Return the database aliases of the read replicas.
+
+    :returns: The replica aliases, empty when there are none
+    :rtype: list
+    """
+    return getattr(settings, 'NEWS_DB_REPLICAS', [])
+
+
+def get_pin_seconds():
+    """Return how long a client reads from the primary after writing."""
+    return getattr(settings, 'NEWS_DB_PIN_SECONDS', 10)
+
+
+def pick_replica():
+    """Return the alias of a randomly chosen read replica.
+
+    :rtype: str
+    """
+    return random.choice(get_replicas())
+
+
+def current_replica():
+    """Return the replica the current request reads from.
+
+    :returns: The replica's alias, or None while reading from the primary
+    :rtype: str
+    """
+    return getattr(_state, 'replica', None)
+
+
+def reading_from_replica():
+    """Return True while the current request may read from a replica."""
+    return current_replica() is not None
+
+
+@contextmanager
+def use_primary():
+    """Read from the primary inside the block, even on a read-only page.
+
+    Used for anything stored in the shared cache, so a lagging replica
+    can't leave stale data cached after it has caught up.
+
+    Usage::
+
+        with use_primary():
+            user = load_user()
+    """
+    replica = current_replica()
+    _state.replica = None
+    try:
+        yield
+    finally:
+        _state.replica = replica
+
+
+def make_pin_key(authorization):
+    """Return the cache key pinning an API client to the primary.
+
+    The header is hashed so the cache never holds usable credentials.
+
+    :param authorization: The client's ``Authorization`` header
+    :returns: The cache key
+    :rtype: str
+    """
+    return PIN_KEY.format(hashlib.sha256(authorization.encode()).hexdigest())
+
+
+def is_pinned(request):
+    """Return True if the client wrote recently and must use the primary.
+
+    :param request: The current request
+    :rtype: bool
+    """
+    if PIN_COOKIE in request.COOKIES:
+        return True
+    authorization = request.META.get('HTTP_AUTHORIZATION')
+    return bool(authorization) and bool(cache.get(
+        make_pin_key(authorization)
+    ))
+
+
+def pin(request, response):
+    """Send the client's reads to the primary for the next few seconds.
+
+    Browsers are pinned with a short lived cookie, and API clients, which
+    may not keep cookies, by their ``Authorization`` header.
+
+    :param request: The request that wrote
+    :param response: Its response
+    """
+    seconds = get_pin_seconds()
+    response.set_cookie(
+        PIN_COOKIE, '1', max_age=seconds, httponly=True, samesite='Lax'
+    )
+    authorization = request.META.get('HTTP_AUTHORIZATION')
+    if authorization:
+        cache.set(make_pin_key(authorization), True, seconds)
+
+
+class ReplicaRouter:
+    """Database router sending read-only pages to the read replicas.
+
+    Reads go to the replica :class:`ReplicaMiddleware` chose for the
+    request only while it is serving one of the read-only views;
+    everything else, including background workers, management commands
+    and every write, uses ``default``, the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        return current_replica() or 'default'
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas get the schema by replicating the primary
+        return db not in get_replicas()
+
+
+class ReplicaMiddleware:
+    """Choose between the primary and the replicas for each request.
+
+    ``GET`` requests for the views in ``NEWS_REPLICA_VIEWS`` read from one
+    replica from ``NEWS_DB_REPLICAS``, picked at random once per request so
+    every query of a page sees the same snapshot. Any other request reads
+    from the primary, and a request that may have written (``POST`` and
+    the like) pins its client to the primary for ``NEWS_DB_PIN_SECONDS``,
+    so editors see their own changes immediately even while the replicas
+    lag behind. Without replicas this does nothing.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        _state.replica = None
+        try:
+            response = self.get_response(request)
+        finally:
+            _state.replica = None
+        if request.method not in SAFE_METHODS and get_replicas():
+            pin(request, response)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        replica_views = getattr(settings, 'NEWS_REPLICA_VIEWS', REPLICA_VIEWS)
+        if (
+            get_replicas()
+            and request.method in SAFE_METHODS
+            and request.resolver_match.url_name in replica_views
+            and not is_pinned(request)
+        ):
+            _state.replica = pick_replica()
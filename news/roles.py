@@ -0,0 +1,95 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group, Permission
+
+
+# The group each role's users belong to
+ROLE_GROUPS = {
+    'reader': 'Readers',
+    'editor': 'Editors',
+    'journalist': 'Journalists',
+}
+
+# Permissions granted to each role's group
+ROLE_PERMISSIONS = {
+    'reader': ['view_article', 'view_newsletter'],
+    'editor': [
+        'view_article', 'change_article', 'delete_article',
+        'view_newsletter', 'change_newsletter', 'delete_newsletter',
+    ],
+    'journalist': [
+        'add_article', 'view_article', 'change_article', 'delete_article',
+        'add_newsletter', 'view_newsletter', 'change_newsletter',
+        'delete_newsletter',
+    ],
+}
+
+# Role to group ID, loaded once per process by get_role_group_ids()
+_group_ids = {}
+
+
+def sync_roles():
+    """Create the role groups and grant each one its permissions.
+
+    Safe to run repeatedly; existing groups and grants are left in place.
+
+    :returns: Mapping of role to its Group
+    :rtype: dict
+    """
+    groups = {}
+    for role, name in ROLE_GROUPS.items():
+        group, _ = Group.objects.get_or_create(name=name)
+        group.permissions.add(*Permission.objects.filter(
+            content_type__app_label='news',
+            codename__in=ROLE_PERMISSIONS[role]
+        ))
+        groups[role] = group
+    clear_cache()
+    return groups
+
+
+def get_role_group_ids():
+    """Return the ID of each role's group, provisioning missing groups.
+
+    The IDs are cached for the life of the process, so adding a new user to
+    their group doesn't look the group up again.
+
+    :returns: Mapping of role to group ID
+    :rtype: dict
+    """
+    if not _group_ids:
+        names = {name: role for role, name in ROLE_GROUPS.items()}
+        rows = Group.objects.filter(name__in=names).values_list('name', 'pk')
+        found = {names[name]: pk for name, pk in rows}
+        if len(found) < len(ROLE_GROUPS):
+            found = {role: group.pk for role, group in sync_roles().items()}
+        _group_ids.update(found)
+    return _group_ids
+
+
+def clear_cache():
+    """Forget the cached group IDs, e.g. after groups are deleted."""
+    _group_ids.clear()
+
+
+def assign_role_groups(users, batch_size=1000):
+    """Add users to their role's group with bulk inserts.
+
+    Memberships that already exist are skipped, so this can be used to
+    backfill users created with ``bulk_create``, which sends no signals.
+
+    :param users: Iterable of saved users
+    :param batch_size: Memberships inserted per query
+    :returns: Number of memberships submitted, including existing ones
+    :rtype: int
+    """
+    group_ids = get_role_group_ids()
+    Membership = get_user_model().groups.through
+    memberships = [
+        Membership(customuser_id=user.pk, group_id=group_ids[user.role])
+        for user in users
+        if user.role in group_ids
+    ]
+    Membership.objects.bulk_create(
+        memberships, batch_size=batch_size, ignore_conflicts=True
+    )
+    return len(memberships)
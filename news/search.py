@@ -0,0 +1,236 @@
+import re
+from collections import defaultdict
+from functools import reduce
+from operator import and_
+
+from django.db import connection, transaction
+from django.db.models import Q
+
+from .models import Article, Newsletter, SearchDocument
+
+
+SEARCH_MODELS = {
+    'article': Article,
+    'newsletter': Newsletter,
+}
+FTS_TABLE = 'news_searchdocument_fts'
+# Relative weight of a title match over a body match when ranking
+TITLE_WEIGHT = 5.0
+
+_backend = None
+
+
+def get_backend():
+    """Return the full-text search backend of the database.
+
+    :returns: 'fts5' for SQLite with the FTS5 index, 'fulltext' for
+        MariaDB/MySQL, otherwise 'basic' for a ``LIKE`` scan
+    :rtype: str
+    """
+    global _backend
+    if _backend is None:
+        if connection.vendor == 'mysql':
+            _backend = 'fulltext'
+        elif (
+            connection.vendor == 'sqlite'
+            and FTS_TABLE in connection.introspection.table_names()
+        ):
+            _backend = 'fts5'
+        else:
+            _backend = 'basic'
+    return _backend
+
+
+def get_terms(query):
+    """Split a search query into lower case words.
+
+    :param query: Text typed by the user
+    :returns: The words of the query, without punctuation or operators
+    :rtype: list
+    """
+    return re.findall(r'\w+', query.lower())
+
+
+def index_content(content):
+    """Add or update an approved article or newsletter in the search index.
+
+    :param content: An Article or Newsletter instance
+    """
+    SearchDocument.objects.update_or_create(
+        content_type=content._meta.model_name,
+        content_id=content.pk,
+        defaults={
+            'title': content.title,
+            'body': content.content,
+            'created_at': content.created_at,
+        }
+    )
+
+
+def index_many(contents, batch_size=1000):
+    """Add approved content to the search index in bulk.
+
+    Documents left over for the same content, for example from an earlier
+    approval that was withdrawn, are replaced.
+
+    :param contents: Saved Article or Newsletter instances; unapproved ones
+        are skipped
+    :param batch_size: Documents inserted per query
+    :returns: Number of documents written
+    :rtype: int
+    """
+    documents = [
+        SearchDocument(
+            content_type=content._meta.model_name,
+            content_id=content.pk,
+            title=content.title,
+            body=content.content,
+            created_at=content.created_at
+        )
+        for content in contents
+        if content.approved
+    ]
+    content_ids = defaultdict(list)
+    for document in documents:
+        content_ids[document.content_type].append(document.content_id)
+    with transaction.atomic():
+        for content_type, ids in content_ids.items():
+            for start in range(0, len(ids), batch_size):
+                SearchDocument.objects.filter(
+                    content_type=content_type,
+                    content_id__in=ids[start:start + batch_size]
+                ).delete()
+        documents = SearchDocument.objects.bulk_create(
+            documents, batch_size=batch_size
+        )
+    return len(documents)
+
+
+def remove_content(content):
+    """Remove an article or newsletter from the search index.
+
+    :param content: An Article or Newsletter instance
+    """
+    SearchDocument.objects.filter(
+        content_type=content._meta.model_name,
+        content_id=content.pk
+    ).delete()
+
+
+class SearchResults:
+    """Ranked search results, fetched lazily one slice at a time.
+
+    Counting and slicing each run a single query against the full-text
+    index, so the results can be handed to Django's ``Paginator`` or DRF
+    pagination without loading every match.
+
+    Usage::
+
+        results = SearchResults('election results')
+        total = results.count()
+        for content in results[:20]:
+            ...
+
+    Slices return the matching Article and Newsletter instances, best
+    match first, each with a ``content_type`` attribute.
+    """
+
+    def __init__(self, query):
+        self.terms = get_terms(query)
+        self.backend = get_backend()
+        self._count = None
+
+    def count(self):
+        """Return the number of matching documents.
+
+        :rtype: int
+        """
+        if self._count is None:
+            if not self.terms:
+                self._count = 0
+            elif self.backend == 'basic':
+                self._count = self._basic_queryset().count()
+            else:
+                sql, params = self._match_sql()
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        f'SELECT COUNT(*) FROM ({sql}) matches', params
+                    )
+                    self._count = cursor.fetchone()[0]
+        return self._count
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index:index + 1][0]
+        start = index.start or 0
+        stop = self.count() if index.stop is None else index.stop
+        if not self.terms or stop <= start:
+            return []
+        return self._load(self._ranked_keys(start, stop - start))
+
+    def _match_sql(self):
+        """Return the SQL selecting matching document IDs and scores."""
+        if self.backend == 'fts5':
+            # Every word must match; quoting disables FTS5 query syntax
+            match = ' '.join(f'"{term}"' for term in self.terms)
+            return (
+                f'SELECT rowid AS id, bm25({FTS_TABLE}, %s, 1.0) AS score '
+                f'FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s',
+                [TITLE_WEIGHT, match]
+            )
+        # Boolean mode requires every word; the natural language relevance
+        # ranks the matches. Both are answered from the FULLTEXT index.
+        return (
+            'SELECT id, -(MATCH(title, body) AGAINST '
+            '(%s IN NATURAL LANGUAGE MODE)) AS score '
+            'FROM news_searchdocument '
+            'WHERE MATCH(title, body) AGAINST (%s IN BOOLEAN MODE)',
+            [
+                ' '.join(self.terms),
+                ' '.join(f'+{term}' for term in self.terms),
+            ]
+        )
+
+    def _basic_queryset(self):
+        return SearchDocument.objects.filter(reduce(and_, (
+            Q(title__icontains=term) | Q(body__icontains=term)
+            for term in self.terms
+        )))
+
+    def _ranked_keys(self, offset, limit):
+        """Return ``(content_type, content_id)`` of a slice of matches."""
+        if self.backend == 'basic':
+            keys = self._basic_queryset().order_by(
+                '-created_at', '-id'
+            ).values_list('content_type', 'content_id')
+            return list(keys[offset:offset + limit])
+        sql, params = self._match_sql()
+        # Lower scores are better matches; ties go to the newest document
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT document.content_type, document.content_id '
+                f'FROM ({sql}) matches '
+                'INNER JOIN news_searchdocument document '
+                'ON document.id = matches.id '
+                'ORDER BY matches.score, document.created_at DESC '
+                'LIMIT %s OFFSET %s',
+                params + [limit, offset]
+            )
+            return [tuple(row) for row in cursor.fetchall()]
+
+    def _load(self, keys):
+        """Load the content referenced by search results, keeping order."""
+        content = {}
+        for content_type, model in SEARCH_MODELS.items():
+            ids = [pk for kind, pk in keys if kind == content_type]
+            if not ids:
+                continue
+            for item in model.objects.select_related(
+                'author', 'publisher'
+            ).filter(pk__in=ids):
+                item.content_type = content_type
+                content[content_type, item.pk] = item
+        return [content[key] for key in keys if key in content]
@@ -2,7 +2,24 @@ from rest_framework import serializers
 from .models import Article, Publisher, CustomUser, Newsletter
 
 
-class ArticleSerializer(serializers.ModelSerializer):
+# Fields returned by the content APIs with ``?view=summary``
+SUMMARY_FIELDS = (
+    'id', 'title', 'summary', 'published_date', 'author', 'publisher'
+)
+
+
+class DynamicFieldsMixin:
+    """
+    Serializer mixin taking a ``fields`` argument to return only some fields.
+    """
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+class ArticleSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for the Article model.
     """
@@ -20,11 +37,14 @@ class ArticleSerializer(serializers.ModelSerializer):
     class Meta:
         model = Article
         fields = [
-            'id', 'title', 'content', 'published_date', 'author', 'publisher'
+            'id', 'title', 'summary', 'content', 'published_date', 'author',
+            'publisher'
         ]
 
 
-class NewsletterSerializer(serializers.ModelSerializer):
+class NewsletterSerializer(
+    DynamicFieldsMixin, serializers.ModelSerializer
+):
     """
     Serializer for the Newsletter model.
     """
@@ -37,10 +57,68 @@ class NewsletterSerializer(serializers.ModelSerializer):
     class Meta:
         model = Newsletter
         fields = [
-            'id', 'title', 'content', 'published_date', 'author', 'publisher'
+            'id', 'title', 'summary', 'content', 'published_date', 'author',
+            'publisher'
         ]
 
 
+# Column read by serialize_content_values for each content serializer field
+CONTENT_COLUMNS = {
+    'id': 'id',
+    'title': 'title',
+    'summary': 'summary',
+    'content': 'content',
+    'published_date': 'created_at',
+    'author': 'author__username',
+    'publisher': 'publisher__name',
+}
+
+
+def serialize_content_values(queryset, fields=None):
+    """Serialize articles or newsletters straight from database rows.
+
+    Gives the same output as :class:`ArticleSerializer` and
+    :class:`NewsletterSerializer`, but reads plain tuples with the author
+    and publisher names joined in, rather than building model instances and
+    running every serializer field for each row.
+
+    :param queryset: Articles or newsletters, in the order to return them
+    :param fields: Names of the fields to return, all by default
+    :returns: One dict per row
+    :rtype: list
+    """
+    fields = list(fields or ArticleSerializer.Meta.fields)
+    # Look up the current time zone once rather than for every row
+    to_date = serializers.DateTimeField(
+        default_timezone=serializers.DateTimeField().default_timezone()
+    ).to_representation
+    data = []
+    for row in queryset.values_list(*(CONTENT_COLUMNS[f] for f in fields)):
+        item = dict(zip(fields, row))
+        if 'published_date' in item:
+            item['published_date'] = to_date(item['published_date'])
+        # The model serializers skip the publisher when there is none
+        if 'publisher' in item and item['publisher'] is None:
+            del item['publisher']
+        data.append(item)
+    return data
+
+
+class SearchResultSerializer(serializers.Serializer):
+    """
+    Serializer for a search result, which is an article or a newsletter.
+    """
+    type = serializers.CharField(source='content_type', read_only=True)
+    id = serializers.IntegerField(read_only=True)
+    title = serializers.CharField(read_only=True)
+    content = serializers.CharField(read_only=True)
+    published_date = serializers.DateTimeField(
+        source='created_at', read_only=True
+    )
+    author = serializers.ReadOnlyField(source='author.username')
+    publisher = serializers.ReadOnlyField(source='publisher.name')
+
+
 class PublisherSerializer(serializers.ModelSerializer):
     """
     Serializer for the Publisher model, including articles and journalists.
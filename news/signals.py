@@ -1,21 +1,28 @@
-from django.db.models.signals import post_save
+from django.contrib.auth.models import Group
+from django.core.signals import request_finished
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import (
+    m2m_changed, post_delete, post_migrate, post_save
+)
 from django.dispatch import receiver
-from django.core.mail import send_mail
-from django.conf import settings
-from django.template.loader import render_to_string
-import requests
-from requests_oauthlib import OAuth1
-import os
+from rest_framework.authtoken.models import Token
 
-from .models import Article, CustomUser, Publisher, Newsletter
+from . import (
+    authentication, conditional, connections, page_cache, roles, search
+)
+from .audience import JournalistSubscription, PublisherSubscription
+from .distribution import enqueue_distribution
+from .feeds import backfill_feed, fan_out, rebuild_feed, remove_content
+from .models import Article, CustomUser, Newsletter, Publisher
 
 
 @receiver(post_save, sender=Article)
 def approve_article(sender, instance, created, **kwargs):
     """Signal handler for article approval and distribution.
     
-    Sends email notifications to subscribers and posts to X/Twitter
-    when an article is approved.
+    Queues a distribution job that updates reader feeds, emails
+    subscribers and posts to X/Twitter once the approval has been committed.
     
     :param sender: The model class
     :param instance: The article instance
@@ -27,84 +34,17 @@ def approve_article(sender, instance, created, **kwargs):
         and instance.approved
         and instance.approved != instance._original_approved
     ):
-        author = instance.author
-        publisher = instance.publisher
-
-        subscribers_to_author = CustomUser.objects.filter(
-            subscriptions_journalists=author
-        ).values_list('email', flat=True)
-
-        if publisher:
-            subscribers_to_publisher = CustomUser.objects.filter(
-                subscriptions_publishers=publisher
-            ).values_list('email', flat=True)
-            subscribers_emails = list(
-                set(
-                    list(subscribers_to_author) +
-                    list(subscribers_to_publisher)
-                )
-            )
-        else:
-            subscribers_emails = list(subscribers_to_author)
-
-        if subscribers_emails:
-            subject = f'New Article from {author.username}!'
-            message = render_to_string(
-                'news/article_email.html',
-                {'article': instance}
-            )
-            from_email = settings.DEFAULT_FROM_EMAIL
-            recipient_list = subscribers_emails
-            send_mail(
-                subject,
-                message,
-                from_email,
-                recipient_list,
-                html_message=message
-            )
-
-        # X/Twitter integration - requires environment variables
-        try:
-            consumer_key = os.environ.get('X_API_KEY')
-            consumer_secret = os.environ.get('X_API_SECRET')
-            access_token = os.environ.get('X_ACCESS_TOKEN')
-            access_token_secret = os.environ.get('X_ACCESS_SECRET')
-
-            if all([consumer_key, consumer_secret, access_token, access_token_secret]):
-                oauth = OAuth1(
-                    consumer_key,
-                    client_secret=consumer_secret,
-                    resource_owner_key=access_token,
-                    resource_owner_secret=access_token_secret
-                )
-
-                api_url = "https://api.x.com/2/tweets"
-                post_data = {
-                    'text': (
-                        f"New article from {author.username}: {instance.title} - "
-                        + f"Read more @ http://yrdomain.com/articles/{instance.id}"
-                    )
-                }
-
-                response = requests.post(api_url, auth=oauth, json=post_data)
-
-                if response.status_code == 201:
-                    print(f"Successfully posted to X: {response.json()}")
-                else:
-                    print(f"Failed to post to X: {response.json()}")
-
-        except requests.exceptions.RequestException as e:
-            print(f"Error posting to X: {e}")
-        except ValueError as e:
-            print(f"Error processing response from X: {e}")
+        enqueue_distribution(instance)
+        # Avoid queuing a second job if the instance is saved again
+        instance._original_approved = instance.approved
 
 
 @receiver(post_save, sender=Newsletter)
 def approve_newsletter(sender, instance, created, **kwargs):
     """Signal handler for newsletter approval and distribution.
     
-    Sends email notifications to subscribers and posts to X/Twitter
-    when a newsletter is approved.
+    Queues a distribution job that updates reader feeds, emails
+    subscribers and posts to X/Twitter once the approval has been committed.
     
     :param sender: The model class
     :param instance: The newsletter instance
@@ -116,77 +56,263 @@ def approve_newsletter(sender, instance, created, **kwargs):
         and instance.approved
         and instance.approved != instance._original_approved
     ):
-        author = instance.author
-        publisher = instance.publisher
-
-        subscribers_to_author = CustomUser.objects.filter(
-            subscriptions_journalists=author
-        ).values_list('email', flat=True)
-
-        if publisher:
-            subscribers_to_publisher = CustomUser.objects.filter(
-                subscriptions_publishers=publisher
-            ).values_list('email', flat=True)
-            subscribers_emails = list(
-                set(
-                    list(subscribers_to_author) +
-                    list(subscribers_to_publisher)
-                )
-            )
+        enqueue_distribution(instance)
+        # Avoid queuing a second job if the instance is saved again
+        instance._original_approved = instance.approved
+
+
+@receiver(post_save, sender=Article)
+@receiver(post_save, sender=Newsletter)
+def update_feeds_on_save(sender, instance, created, **kwargs):
+    """Signal handler keeping reader feeds in step with content changes.
+    
+    Content saved as already approved (e.g. through the admin) has no
+    distribution job, so it is added to feeds straight away. Content that
+    is withdrawn is removed from all feeds.
+    
+    :param sender: The model class
+    :param instance: The article or newsletter instance
+    :param created: Boolean indicating if this is a new instance
+    """
+    if created and instance.approved:
+        fan_out(instance)
+    elif not instance.approved and instance._original_approved:
+        remove_content(instance)
+
+
+@receiver(post_delete, sender=Article)
+@receiver(post_delete, sender=Newsletter)
+def update_feeds_on_delete(sender, instance, **kwargs):
+    """Signal handler removing deleted content from reader feeds.
+    
+    :param sender: The model class
+    :param instance: The article or newsletter instance
+    """
+    remove_content(instance)
+
+
+@receiver(post_save, sender=Article)
+@receiver(post_save, sender=Newsletter)
+def update_search_index_on_save(sender, instance, **kwargs):
+    """Signal handler keeping the search index in step with content changes.
+    
+    Approved content is (re)indexed on every save so edits are searchable
+    straight away. Withdrawn content is removed from the index.
+    
+    :param sender: The model class
+    :param instance: The article or newsletter instance
+    """
+    if instance.approved:
+        search.index_content(instance)
+    elif instance._original_approved:
+        search.remove_content(instance)
+
+
+@receiver(post_delete, sender=Article)
+@receiver(post_delete, sender=Newsletter)
+def update_search_index_on_delete(sender, instance, **kwargs):
+    """Signal handler removing deleted content from the search index.
+    
+    :param sender: The model class
+    :param instance: The article or newsletter instance
+    """
+    search.remove_content(instance)
+
+
+@receiver(m2m_changed, sender=PublisherSubscription)
+@receiver(m2m_changed, sender=JournalistSubscription)
+def update_feeds_on_subscription(sender, instance, action, reverse, pk_set,
+                                 **kwargs):
+    """Signal handler updating reader feeds when subscriptions change.
+    
+    New subscriptions backfill the reader's feed with existing approved
+    content. Removed subscriptions rebuild the affected feeds, since the
+    same content may still be reachable through another subscription.
+    Either way the readers get a new subscription version, which changes
+    the ETags of their pages.
+    
+    :param sender: The subscription through model
+    :param instance: The instance whose relation changed
+    :param action: The m2m_changed action
+    :param reverse: True if the change was made from the related side
+    :param pk_set: Primary keys added or removed
+    """
+    is_publisher = sender is PublisherSubscription
+    if action == 'pre_clear' and reverse:
+        # The cleared readers are not passed to post_clear
+        if is_publisher:
+            subscriptions = sender.objects.filter(publisher_id=instance.pk)
+            reader_field = 'customuser_id'
+        else:
+            subscriptions = sender.objects.filter(to_customuser_id=instance.pk)
+            reader_field = 'from_customuser_id'
+        instance._cleared_readers = list(
+            subscriptions.values_list(reader_field, flat=True)
+        )
+    elif action == 'post_add':
+        if reverse:
+            for reader_id in pk_set:
+                _backfill(reader_id, [instance.pk], is_publisher)
+            _bump_on_commit(pk_set)
         else:
-            subscribers_emails = list(subscribers_to_author)
-
-        if subscribers_emails:
-            try:
-                subject = f'New Newsletter from {author.username}!'
-                message = render_to_string(
-                    'news/newsletter_email.html',
-                    {'newsletter': instance}
-                )
-                from_email = settings.DEFAULT_FROM_EMAIL
-                recipient_list = subscribers_emails
-                send_mail(
-                    subject,
-                    message,
-                    from_email,
-                    recipient_list,
-                    html_message=message
-                )
-            except Exception as e:
-                print(f"Error sending email for newsletter: {e}")
-
-        # X/Twitter integration - requires environment variables
-        try:
-            consumer_key = os.environ.get('X_API_KEY')
-            consumer_secret = os.environ.get('X_API_SECRET')
-            access_token = os.environ.get('X_ACCESS_TOKEN')
-            access_token_secret = os.environ.get('X_ACCESS_SECRET')
-
-            if all([consumer_key, consumer_secret, access_token, access_token_secret]):
-                oauth = OAuth1(
-                    consumer_key,
-                    client_secret=consumer_secret,
-                    resource_owner_key=access_token,
-                    resource_owner_secret=access_token_secret
-                )
-
-                api_url = "https://api.x.com/2/tweets"
-                post_data = {
-                    'text': (
-                        f"New newsletter from {author.username}: "
-                        f"{instance.title} - "
-                        f"Read more @ http://yrdomain.com/articles/{instance.id}"
-                    )
-                }
-
-                response = requests.post(api_url, auth=oauth, json=post_data)
-
-                if response.status_code == 201:
-                    print(f"Successfully posted to X: {response.json()}")
-                else:
-                    print(f"Failed to post to X: {response.json()}")
-
-        except requests.exceptions.RequestException as e:
-            print(f"Error posting to X: {e}")
-        except ValueError as e:
-            print(f"Error processing response from X: {e}")
\ No newline at end of file
+            _backfill(instance.pk, pk_set, is_publisher)
+            _bump_on_commit([instance.pk])
+    elif action in ('post_remove', 'post_clear'):
+        if not reverse:
+            reader_ids = [instance.pk]
+        elif action == 'post_remove':
+            reader_ids = pk_set
+        else:
+            reader_ids = getattr(instance, '_cleared_readers', [])
+        for reader_id in reader_ids:
+            rebuild_feed(reader_id)
+        _bump_on_commit(reader_ids)
+
+
+def _bump_on_commit(reader_ids):
+    # A version bumped before the commit could be cached with the old state
+    reader_ids = list(reader_ids)
+    transaction.on_commit(
+        lambda: conditional.bump_subscription_versions(reader_ids)
+    )
+
+
+def _backfill(reader_id, target_ids, is_publisher):
+    if is_publisher:
+        backfill_feed(reader_id, publisher_ids=target_ids)
+    else:
+        backfill_feed(reader_id, journalist_ids=target_ids)
+
+
+@receiver(post_save, sender=Article)
+@receiver(post_save, sender=Newsletter)
+@receiver(post_delete, sender=Article)
+@receiver(post_delete, sender=Newsletter)
+def invalidate_home_cache_on_content_change(sender, instance, **kwargs):
+    """Signal handler invalidating the cached home page for content changes.
+    
+    Only approved content is shown on the home page, so saving a draft
+    leaves the cache untouched. The cache is invalidated once the change
+    commits; invalidating it earlier would let a concurrent request cache
+    the page as it was before the change.
+    
+    :param sender: The model class
+    :param instance: The article or newsletter instance
+    """
+    if instance.approved or instance._original_approved:
+        transaction.on_commit(page_cache.invalidate)
+
+
+@receiver(post_save, sender=Publisher)
+@receiver(post_delete, sender=Publisher)
+def invalidate_home_cache_on_publisher_change(sender, instance, **kwargs):
+    """Signal handler invalidating the cached home page for publishers.
+    
+    :param sender: The model class
+    :param instance: The publisher instance
+    """
+    transaction.on_commit(page_cache.invalidate)
+
+
+@receiver(post_save, sender=CustomUser)
+@receiver(post_delete, sender=CustomUser)
+def invalidate_home_cache_on_journalist_change(sender, instance,
+                                               update_fields=None, **kwargs):
+    """Signal handler invalidating the cached home page for journalists.
+    
+    The home page lists journalists, so the cache is invalidated when a
+    user becomes or stops being a journalist, or a journalist is edited.
+    Login bookkeeping saves (``last_login``, password rehashing) are ignored.
+    
+    :param sender: The model class
+    :param instance: The user instance
+    :param update_fields: Fields passed to ``save(update_fields=...)``
+    """
+    if 'journalist' not in (instance.role, instance._original_role):
+        return
+    if update_fields and set(update_fields) <= {'last_login', 'password'}:
+        return
+    transaction.on_commit(page_cache.invalidate)
+
+
+@receiver(post_save, sender=CustomUser)
+@receiver(post_delete, sender=CustomUser)
+def forget_cached_api_user(sender, instance, **kwargs):
+    """Signal handler dropping a changed user from the API token cache.
+    
+    Token authenticated requests then see the user's new role, or are
+    refused if the user was deactivated or deleted.
+    
+    :param sender: The model class (CustomUser)
+    :param instance: The user instance
+    """
+    user_id = instance.pk
+    transaction.on_commit(lambda: authentication.forget_user(user_id))
+
+
+@receiver(post_delete, sender=Token)
+def forget_revoked_token(sender, instance, **kwargs):
+    """Signal handler dropping a revoked API token from the cache.
+    
+    :param sender: The model class (Token)
+    :param instance: The deleted token
+    """
+    key = instance.key
+    transaction.on_commit(lambda: authentication.forget_token(key))
+
+
+@receiver(post_save, sender=CustomUser)
+def track_saved_role(sender, instance, **kwargs):
+    """Signal handler recording the saved role as the user's original role.
+    
+    Connected after the other ``CustomUser`` handlers, which compare
+    ``role`` with ``_original_role`` to detect role changes.
+    
+    :param sender: The model class (CustomUser)
+    :param instance: The user instance
+    """
+    if 'role' in instance.__dict__:
+        instance._original_role = instance.role
+
+
+@receiver(post_migrate)
+def provision_roles(sender, using='default', **kwargs):
+    """Signal handler provisioning the role groups after migrations.
+    
+    Besides ``migrate`` this runs after ``flush``, which empties the groups
+    table without sending delete signals.
+    
+    :param sender: The app config that was migrated
+    :param using: The database alias
+    """
+    if sender.name == 'news' and using == 'default':
+        roles.sync_roles()
+
+
+@receiver(post_delete, sender=Group)
+def forget_role_groups(sender, instance, **kwargs):
+    """Signal handler dropping the cached role group IDs.
+    
+    :param sender: The model class (Group)
+    :param instance: The deleted group
+    """
+    roles.clear_cache()
+
+
+@receiver(connection_created)
+def count_new_connection(sender, connection, **kwargs):
+    """Count every new database connection.
+    
+    :param sender: The database backend class
+    :param connection: The new database connection
+    """
+    connections.record('opened')
+
+
+@receiver(request_finished)
+def count_finished_request(sender, **kwargs):
+    """Count finished requests, to compare with the connections opened.
+    
+    :param sender: The request handler class
+    """
+    connections.record('requests')
@@ -0,0 +1,341 @@
+import email.utils
+import os
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+import requests
+from requests.adapters import HTTPAdapter
+from requests_oauthlib import OAuth1
+
+from .models import SocialPost
+
+
+CREDENTIAL_VARIABLES = (
+    'X_API_KEY', 'X_API_SECRET', 'X_ACCESS_TOKEN', 'X_ACCESS_SECRET'
+)
+
+
+def get_setting(name, default):
+    """Return a social posting setting, falling back to a default.
+
+    :param name: Name of the Django setting
+    :param default: Value used when the setting is not defined
+    :returns: The configured value or the default
+    """
+    return getattr(settings, name, default)
+
+
+def get_credentials():
+    """Return the X API credentials set in the environment.
+
+    :returns: The consumer key and secret and the access token and secret,
+        or None unless all four are set
+    :rtype: list or None
+    """
+    credentials = [os.environ.get(name) for name in CREDENTIAL_VARIABLES]
+    return credentials if all(credentials) else None
+
+
+def enqueue_post(content_type, content):
+    """Queue an announcement of approved content on X/Twitter.
+
+    Nothing is queued unless the X API credentials are configured.
+
+    :param content_type: Either 'article' or 'newsletter'
+    :param content: The Article or Newsletter instance
+    :returns: The queued post, or None
+    :rtype: SocialPost or None
+    """
+    if get_credentials() is None:
+        return None
+    return SocialPost.objects.create(
+        content_type=content_type,
+        object_id=content.pk,
+        text=(
+            f"New {content_type} from {content.author.username}: "
+            f"{content.title} - "
+            f"Read more @ http://yrdomain.com/articles/{content.id}"
+        )
+    )
+
+
+class TokenBucket:
+    """A token bucket limiting how often posts are sent.
+
+    The bucket holds up to ``capacity`` tokens and refills at ``rate``
+    tokens per second; every post takes one. After a 429 response the
+    bucket is paused until the API's rate limit window resets.
+
+    :param rate: Tokens added per second
+    :param capacity: Maximum number of tokens, i.e. the largest burst
+    :param clock: Monotonic clock returning seconds
+    :param sleep: Function sleeping for a number of seconds
+    """
+
+    def __init__(self, rate, capacity, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.sleep = sleep
+        self.tokens = float(capacity)
+        self.updated = clock()
+        self.paused_until = 0.0
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self.updated) * self.rate
+        )
+        self.updated = now
+
+    def is_paused(self):
+        """Return True while the bucket is paused by :meth:`pause`."""
+        return self.clock() < self.paused_until
+
+    def wait_time(self):
+        """Return the number of seconds until a token is available.
+
+        :rtype: float
+        """
+        self._refill()
+        wait = max(0.0, self.paused_until - self.clock())
+        if self.tokens < 1:
+            wait = max(wait, (1 - self.tokens) / self.rate)
+        return wait
+
+    def acquire(self):
+        """Take a token, sleeping until one is available."""
+        wait = self.wait_time()
+        if wait:
+            self.sleep(wait)
+            self._refill()
+        self.tokens -= 1
+
+    def pause(self, seconds):
+        """Hand out no tokens for the given number of seconds.
+
+        :param seconds: How long to pause for
+        """
+        self.paused_until = max(self.paused_until, self.clock() + seconds)
+        self.tokens = 0.0
+
+
+def retry_after(response):
+    """Return how long a rate limited (429) response asks us to wait.
+
+    Uses the ``Retry-After`` header, or the ``x-rate-limit-reset`` epoch
+    time sent by the X API, falling back to ``NEWS_SOCIAL_RETRY_DELAY``.
+
+    :param response: The 429 response
+    :returns: Seconds to wait
+    :rtype: float
+    """
+    value = response.headers.get('Retry-After')
+    if value:
+        if value.isdigit():
+            return float(value)
+        try:
+            reset = email.utils.parsedate_to_datetime(value)
+            return max(0.0, reset.timestamp() - time.time())
+        except (TypeError, ValueError):
+            pass
+    value = response.headers.get('x-rate-limit-reset')
+    if value and value.isdigit():
+        return max(0.0, int(value) - time.time())
+    return float(get_setting('NEWS_SOCIAL_RETRY_DELAY', 30))
+
+
+class SocialPoster:
+    """Sends queued posts to the X API over one persistent session.
+
+    The session keeps its connections to the API open between posts, and
+    its OAuth signer is built once. Every request has a timeout, so a slow
+    API can't hold up the worker indefinitely.
+
+    Usage::
+
+        with SocialPoster() as poster:
+            poster.send_due()
+    """
+
+    def __init__(self, api_url=None, credentials=None, bucket=None,
+                 timeout=None):
+        self.api_url = api_url or get_setting(
+            'NEWS_X_API_URL', 'https://api.x.com/2/tweets'
+        )
+        self.timeout = timeout or get_setting('NEWS_SOCIAL_TIMEOUT', 10)
+        self.bucket = bucket or TokenBucket(
+            get_setting('NEWS_SOCIAL_POSTS_PER_HOUR', 100) / 3600,
+            get_setting('NEWS_SOCIAL_BURST', 5)
+        )
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=1)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        credentials = credentials or get_credentials()
+        if credentials:
+            consumer_key, consumer_secret, access_token, access_secret = (
+                credentials
+            )
+            self.session.auth = OAuth1(
+                consumer_key,
+                client_secret=consumer_secret,
+                resource_owner_key=access_token,
+                resource_owner_secret=access_secret
+            )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Close the session's open connections."""
+        self.session.close()
+
+    def send_due(self, limit=None):
+        """Send queued posts that are due, oldest first.
+
+        Stops early while the API's rate limit is exhausted; the remaining
+        posts are picked up by a later call.
+
+        :param limit: Maximum number of posts to send
+        :returns: Number of posts attempted
+        :rtype: int
+        """
+        requeue_stale_posts()
+        attempted = 0
+        while limit is None or attempted < limit:
+            if self.bucket.is_paused():
+                break
+            post = claim_next_post()
+            if post is None:
+                break
+            self.bucket.acquire()
+            self.send(post)
+            attempted += 1
+        return attempted
+
+    def send(self, post):
+        """Make one attempt at publishing a claimed post.
+
+        Server errors, timeouts and connection errors are retried later
+        with exponential backoff; other client errors fail the post.
+
+        :param post: A post claimed with :func:`claim_next_post`
+        :returns: True if the post was published
+        :rtype: bool
+        """
+        try:
+            response = self.session.post(
+                self.api_url, json={'text': post.text}, timeout=self.timeout
+            )
+        except requests.exceptions.RequestException as e:
+            print(f"Error posting to X: {e}")
+            _retry_later(post, str(e))
+            return False
+
+        if response.status_code in (200, 201):
+            try:
+                body = response.json()
+            except ValueError:
+                body = {}
+            post.post_id = str(body.get('data', body).get('id', ''))
+            post.status = 'sent'
+            post.sent_at = timezone.now()
+            post.last_error = ''
+            post.save(update_fields=[
+                'post_id', 'status', 'sent_at', 'last_error'
+            ])
+            print(f"Successfully posted to X: {body}")
+            return True
+
+        error = f'HTTP {response.status_code}: {response.text[:500]}'
+        print(f"Failed to post to X: {error}")
+        if response.status_code == 429:
+            # Not the post's fault, so it doesn't count as an attempt
+            wait = retry_after(response)
+            self.bucket.pause(wait)
+            post.status = 'pending'
+            post.next_attempt_at = timezone.now() + timedelta(seconds=wait)
+            post.last_error = error
+            post.save(update_fields=[
+                'status', 'next_attempt_at', 'last_error'
+            ])
+        elif response.status_code >= 500:
+            _retry_later(post, error)
+        else:
+            post.attempts += 1
+            post.status = 'failed'
+            post.last_error = error
+            post.save(update_fields=['attempts', 'status', 'last_error'])
+        return False
+
+
+def _retry_later(post, error):
+    post.attempts += 1
+    max_attempts = get_setting('NEWS_SOCIAL_MAX_ATTEMPTS', 5)
+    if post.attempts >= max_attempts:
+        post.status = 'failed'
+    else:
+        post.status = 'pending'
+        delay = min(
+            get_setting('NEWS_SOCIAL_RETRY_DELAY', 30)
+            * 2 ** (post.attempts - 1),
+            get_setting('NEWS_SOCIAL_MAX_RETRY_DELAY', 3600)
+        )
+        post.next_attempt_at = timezone.now() + timedelta(seconds=delay)
+    post.last_error = error
+    post.save(update_fields=[
+        'attempts', 'status', 'next_attempt_at', 'last_error'
+    ])
+
+
+def claim_next_post():
+    """Atomically claim the oldest due post for this worker.
+
+    :returns: The claimed post, or None if no post is due
+    :rtype: SocialPost or None
+    """
+    now = timezone.now()
+    due = SocialPost.objects.filter(status='pending', next_attempt_at__lte=now)
+    for pk in due.values_list('pk', flat=True)[:10]:
+        # The claim time is kept in next_attempt_at to spot crashed workers
+        claimed = SocialPost.objects.filter(pk=pk, status='pending').update(
+            status='sending', next_attempt_at=now
+        )
+        if claimed:
+            return SocialPost.objects.get(pk=pk)
+    return None
+
+
+def requeue_stale_posts():
+    """Return posts abandoned by a crashed worker to the queue.
+
+    :returns: Number of posts requeued
+    :rtype: int
+    """
+    stale_after = get_setting('NEWS_DISTRIBUTION_STALE_AFTER', 1800)
+    cutoff = timezone.now() - timedelta(seconds=stale_after)
+    return SocialPost.objects.filter(
+        status='sending',
+        next_attempt_at__lt=cutoff
+    ).update(status='pending', attempts=F('attempts') + 1)
+
+
+def send_pending_posts(limit=None, poster=None):
+    """Send the queued posts that are due.
+
+    :param limit: Maximum number of posts to send
+    :param poster: Poster to send with; a temporary one is used if omitted
+    :returns: Number of posts attempted
+    :rtype: int
+    """
+    if poster is None:
+        with SocialPoster() as temporary_poster:
+            return temporary_poster.send_due(limit)
+    return poster.send_due(limit)
@@ -1,11 +1,67 @@
-from django.test import TestCase
-from django.urls import reverse
+from django.test import RequestFactory, TestCase, TransactionTestCase
+from django.urls import resolve, reverse
 from rest_framework.test import APITestCase
 from unittest.mock import patch
 from django.core import mail
+from django.core.cache import cache
+from django.core.mail import get_connection
+from django.core.management import CommandError, call_command
+from django.http import HttpResponse
 from django.conf import settings
-
-from .models import CustomUser, Publisher, Article, Newsletter
+from django.contrib.auth import base_user
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import Group
+from django.db import connection, transaction
+from django.db import connections as db_connections
+from django.utils import timezone
+from datetime import timedelta
+from django.db.backends.signals import connection_created
+from django.test.signals import template_rendered
+from django.test.utils import CaptureQueriesContext, override_settings
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+import base64
+import copy
+import gzip
+import json
+import os
+import pickle
+import tempfile
+import threading
+import time
+import requests
+
+from . import (
+    conditional, connections, counters, emails, page_cache, replicas, roles,
+    search
+)
+from .audience import (
+    iter_recipient_chunks, resolve_recipients, store_recipients
+)
+from .authentication import USER_KEY, make_token_key
+from .delivery import ConnectionPool, build_message, deliver
+from .distribution import (
+    requeue_stale_jobs, run_pending_jobs, wait_for_jobs, wake_workers
+)
+from .feeds import feed_queryset, fan_out_many, remove_content
+from .hashers import PBKDF2PasswordHasher
+from .profiles import get_profile
+from .search import SearchResults
+from .serializers import (
+    ArticleSerializer, NewsletterSerializer, serialize_content_values
+)
+from .social import SocialPoster, TokenBucket, send_pending_posts
+from .models import (
+    CustomUser, Publisher, Article, Newsletter, DistributionJob, FeedEntry,
+    SearchDocument, SocialPost
+)
+
+X_CREDENTIALS = {
+    'X_API_KEY': 'key',
+    'X_API_SECRET': 'secret',
+    'X_ACCESS_TOKEN': 'token',
+    'X_ACCESS_SECRET': 'token-secret',
+}
 
 
 # Test cases for the signals
@@ -64,22 +120,23 @@ class TestSignal(TestCase):
         settings.EMAIL_BACKEND = self.original_email_backend
 
 
-@patch('requests.post')
-@patch('news.signals.send_mail')
+@patch.dict('os.environ', X_CREDENTIALS)
+@patch('requests.Session.post')
 def test_approve_article_sends_email_and_posts_to_x(
-    self, mock_send_mail, mock_requests_post
+    self, mock_requests_post
 ):
     # Mock the X API response to avoid rate limiting
     mock_requests_post.return_value.status_code = 201
     mock_requests_post.return_value.json.return_value = {'id': 'test123'}
 
-    # Approve the article
+    # Approve the article and run the distribution and posting workers
     self.unapproved_article.approved = True
     self.unapproved_article.save()
+    run_pending_jobs()
+    send_pending_posts()
 
-    # Assert that the mocked send_mail function was called
-    mock_send_mail.assert_called_once()
-    self.assertEqual(len(mail.outbox), 0)
+    # Assert that a single email was sent to the subscriber
+    self.assertEqual(len(mail.outbox), 1)
 
     # Check if API call was made
     mock_requests_post.assert_called_once()
@@ -89,10 +146,10 @@ def test_approve_article_sends_email_and_posts_to_x(
     )
 
 
-@patch('requests.post')
-@patch('news.signals.send_mail')
+@patch.dict('os.environ', X_CREDENTIALS)
+@patch('requests.Session.post')
 def test_approve_newsletter_sends_email_and_posts_to_x(
-    self, mock_send_mail, mock_requests_post
+    self, mock_requests_post
 ):
     # Clear outbox before test
     mail.outbox = []
@@ -101,13 +158,14 @@ def test_approve_newsletter_sends_email_and_posts_to_x(
     mock_requests_post.return_value.status_code = 201
     mock_requests_post.return_value.json.return_value = {'id': '67890'}
 
-    # Approve the newsletter
+    # Approve the newsletter and run the distribution and posting workers
     self.unapproved_newsletter.approved = True
     self.unapproved_newsletter.save()
+    run_pending_jobs()
+    send_pending_posts()
 
-    # Assert that the mocked send_mail function was called
-    mock_send_mail.assert_called_once()
-    self.assertEqual(len(mail.outbox), 0)
+    # Assert that a single email was sent to the subscriber
+    self.assertEqual(len(mail.outbox), 1)
 
     # Check if API call was made
     mock_requests_post.assert_called_once()
@@ -120,6 +178,7 @@ def test_approve_newsletter_sends_email_and_posts_to_x(
 # Test cases for the API views
 class TestSubscribedArticlesView(APITestCase):
     def setUp(self):
+        cache.clear()
         self.url = reverse('subscribed_articles')
 
         # Create users, publishers, and articles for testing
@@ -159,7 +218,7 @@ class TestSubscribedArticlesView(APITestCase):
         self.client.force_login(self.reader)
         response = self.client.get(self.url)
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(len(response.data), 0)
+        self.assertEqual(len(response.data['results']), 0)
 
     def test_get_subscribed_articles_authenticated_reader_with_subscriptions(
         self
@@ -168,12 +227,15 @@ class TestSubscribedArticlesView(APITestCase):
         self.client.force_login(self.reader)
         response = self.client.get(self.url)
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]['title'], 'Article 1')
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(
+            response.data['results'][0]['title'], 'Article 1'
+        )
 
 
 class TestSubscribedNewslettersView(APITestCase):
     def setUp(self):
+        cache.clear()
         self.url = reverse('subscribed_newsletters')
 
         # Create users, publishers, and articles for testing
@@ -214,8 +276,10 @@ class TestSubscribedNewslettersView(APITestCase):
         self.client.force_login(self.reader)
         response = self.client.get(self.url)
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]['title'], 'Newsletter 1')
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(
+            response.data['results'][0]['title'], 'Newsletter 1'
+        )
 
 
 # NEW COMPREHENSIVE TEST SUITE
@@ -223,6 +287,7 @@ class TestRoleBasedAccess(APITestCase):
     """Test role-based access control for all views"""
 
     def setUp(self):
+        cache.clear()
         # Create users with different roles
         self.reader = CustomUser.objects.create_user(
             username='reader_test',
@@ -288,6 +353,36 @@ class TestRoleBasedAccess(APITestCase):
         response = self.client.get(reverse('editor_dashboard'))
         self.assertIn(response.status_code, [200, 302])
 
+    @override_settings(NEWS_API_PAGE_SIZE=2)
+    def test_editor_dashboard_is_paged(self):
+        """Test the editor dashboard pages through the pending content"""
+        Article.objects.bulk_create(
+            Article(
+                title=f'Pending {i}', content='Body',
+                author=self.journalist, publisher=self.publisher
+            )
+            for i in range(3)
+        )
+        Article.objects.create(
+            title='Already approved', content='Body',
+            author=self.journalist, publisher=self.publisher, approved=True
+        )
+        self.client.force_login(self.editor)
+
+        response = self.client.get(reverse('editor_dashboard'))
+        articles = response.context['articles']
+        self.assertEqual(articles.paginator.count, 4)
+        self.assertEqual(len(articles), 2)
+        self.assertContains(response, 'articles_page=2&amp;newsletters_page=1')
+
+        response = self.client.get(
+            reverse('editor_dashboard'), {'articles_page': 2}
+        )
+        titles = [article.title for article in response.context['articles']]
+        self.assertEqual(len(titles), 2)
+        self.assertNotIn('Already approved', titles)
+        self.assertEqual(len(response.context['newsletters']), 1)
+
     def test_non_editor_dashboard_access_denied(self):
         """Test non-editors cannot access editor dashboard"""
         for user in [self.reader, self.journalist]:
@@ -300,6 +395,7 @@ class TestSubscriptionLogic(APITestCase):
     """Test subscription functionality"""
 
     def setUp(self):
+        cache.clear()
         self.reader = CustomUser.objects.create_user(
             username='sub_reader',
             password='password123',
@@ -332,17 +428,19 @@ class TestSubscriptionLogic(APITestCase):
         # Test articles endpoint
         article_response = self.client.get(reverse('subscribed_articles'))
         self.assertEqual(article_response.status_code, 200)
-        self.assertEqual(len(article_response.data), 1)
-        self.assertEqual(article_response.data[0]['title'], 'Sub Article')
+        self.assertEqual(len(article_response.data['results']), 1)
+        self.assertEqual(
+            article_response.data['results'][0]['title'], 'Sub Article'
+        )
 
         # Test newsletters endpoint
         newsletter_response = self.client.get(
             reverse('subscribed_newsletters')
         )
         self.assertEqual(newsletter_response.status_code, 200)
-        self.assertEqual(len(newsletter_response.data), 1)
+        self.assertEqual(len(newsletter_response.data['results']), 1)
         self.assertEqual(
-            newsletter_response.data[0]['title'],
+            newsletter_response.data['results'][0]['title'],
             'Sub Newsletter'
         )
 
@@ -352,7 +450,7 @@ class TestSubscriptionLogic(APITestCase):
 
         article_response = self.client.get(reverse('subscribed_articles'))
         self.assertEqual(article_response.status_code, 200)
-        self.assertEqual(len(article_response.data), 0)
+        self.assertEqual(len(article_response.data['results']), 0)
 
 
 class TestEmailXIntegration(APITestCase):
@@ -379,11 +477,9 @@ class TestEmailXIntegration(APITestCase):
         )
         self.article._original_approved = False
 
-    @patch('requests.post')
-    @patch('news.signals.send_mail')
-    def test_approval_sends_email_and_x_post(
-        self, mock_send_mail, mock_requests_post
-    ):
+    @patch.dict('os.environ', X_CREDENTIALS)
+    @patch('requests.Session.post')
+    def test_approval_sends_email_and_x_post(self, mock_requests_post):
         """Test approval triggers both email and X post"""
         # Setup mocks
         mock_requests_post.return_value.status_code = 201
@@ -392,17 +488,24 @@ class TestEmailXIntegration(APITestCase):
         # Subscribe reader to publisher
         self.reader.subscriptions_publishers.add(self.publisher)
 
-        # Approve the article
+        # Approve the article; nothing is sent until the worker runs
         self.article.approved = True
         self.article.save()
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertFalse(mock_requests_post.called)
+        run_pending_jobs()
 
         # Check email was sent
-        self.assertTrue(mock_send_mail.called)
+        self.assertEqual(len(mail.outbox), 1)
+
+        # The post is queued for the posting worker
+        self.assertFalse(mock_requests_post.called)
+        send_pending_posts()
 
         # Check X API was called
         self.assertTrue(mock_requests_post.called)
 
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def test_x_api_failure_handling(self, mock_requests_post):
         """Test X API failure doesn't break the application"""
         # Mock API failure
@@ -415,6 +518,7 @@ class TestEmailXIntegration(APITestCase):
         try:
             self.article.approved = True
             self.article.save()
+            run_pending_jobs()
             success = True
         except requests.RequestException:
             success = False
@@ -426,6 +530,7 @@ class TestAPIComprehensive(APITestCase):
     """Comprehensive API testing"""
 
     def setUp(self):
+        cache.clear()
         self.editor = CustomUser.objects.create_user(
             username='api_editor', password='password123', role='editor'
         )
@@ -487,3 +592,2557 @@ class TestAPIComprehensive(APITestCase):
         articles_url = reverse('subscribed_articles')
         response = self.client.post(articles_url)
         self.assertEqual(response.status_code, 405)
+
+
+class TestDistributionPipeline(TestCase):
+    """Test the queued, chunked distribution of approved content"""
+
+    def setUp(self):
+        self.journalist = CustomUser.objects.create_user(
+            username='dist_journalist',
+            password='password123',
+            role='journalist'
+        )
+        self.publisher = Publisher.objects.create(name='Dist Publisher')
+        self.readers = []
+        for i in range(5):
+            reader = CustomUser.objects.create_user(
+                username=f'dist_reader_{i}',
+                password='password123',
+                role='reader',
+                email=f'dist{i}@test.com'
+            )
+            reader.subscriptions_publishers.add(self.publisher)
+            self.readers.append(reader)
+        # Subscribed to both the journalist and publisher; emailed once
+        self.readers[0].subscriptions_journalists.add(self.journalist)
+
+        self.article = Article.objects.create(
+            title='Dist Article', content='Content',
+            author=self.journalist, publisher=self.publisher, approved=False
+        )
+
+    def approve(self):
+        self.article.approved = True
+        self.article.save()
+
+    def test_approval_enqueues_job_without_sending(self):
+        """Test approving content only records a pending job"""
+        self.approve()
+        job = DistributionJob.objects.get()
+        self.assertEqual(job.content_type, 'article')
+        self.assertEqual(job.object_id, self.article.pk)
+        self.assertEqual(job.status, 'pending')
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_resaving_approved_content_does_not_requeue(self):
+        """Test saving already approved content queues no second job"""
+        self.approve()
+        self.article.title = 'Edited'
+        self.article.save()
+        self.assertEqual(DistributionJob.objects.count(), 1)
+
+    def test_rolled_back_approval_leaves_no_job(self):
+        """Test an approval that rolls back never reaches the worker"""
+        try:
+            with transaction.atomic():
+                self.approve()
+                raise ValueError('rollback')
+        except ValueError:
+            pass
+        self.assertFalse(DistributionJob.objects.exists())
+
+    def test_worker_streams_recipients_in_chunks(self):
+        """Test the worker sends one batch per chunk and tracks progress"""
+        self.approve()
+        progress = []
+        run_pending_jobs(
+            chunk_size=2,
+            progress=lambda job: progress.append(job.sent_recipients)
+        )
+
+        job = DistributionJob.objects.get()
+        self.assertEqual(job.status, 'done')
+        self.assertEqual(job.total_recipients, 5)
+        self.assertEqual(job.sent_recipients, 5)
+        self.assertEqual(progress, [2, 4, 5])
+        # The stored audience is dropped once the job is done
+        self.assertFalse(job.recipients.exists())
+        # One individual message per subscriber
+        self.assertEqual(len(mail.outbox), 5)
+        self.assertTrue(all(len(m.to) == 1 for m in mail.outbox))
+        self.assertEqual(
+            {m.to[0] for m in mail.outbox},
+            {reader.email for reader in self.readers}
+        )
+
+    def test_failed_job_is_retried_from_last_chunk(self):
+        """Test a failure requeues the job and resumes after progress"""
+        self.approve()
+        real_deliver = deliver
+        calls = []
+
+        def flaky_deliver(*args, **kwargs):
+            calls.append(1)
+            if len(calls) == 2:
+                raise OSError('SMTP down')
+            return real_deliver(*args, **kwargs)
+
+        with patch('news.distribution.deliver', side_effect=flaky_deliver):
+            run_pending_jobs(chunk_size=2)
+
+        job = DistributionJob.objects.get()
+        self.assertEqual(job.status, 'pending')
+        self.assertEqual(job.attempts, 1)
+        self.assertEqual(job.sent_recipients, 2)
+        self.assertIn('SMTP down', job.last_error)
+
+        DistributionJob.objects.update(next_attempt_at=timezone.now())
+        run_pending_jobs(chunk_size=2)
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'done')
+        self.assertEqual(job.attempts, 2)
+        self.assertEqual(job.sent_recipients, 5)
+        self.assertEqual(len(mail.outbox), 5)
+
+    def test_outage_backs_off_instead_of_failing(self):
+        """Test a failing job waits longer before each retry"""
+        self.approve()
+        with patch('news.distribution.deliver', side_effect=OSError('down')):
+            self.assertEqual(run_pending_jobs(), 1)
+            job = DistributionJob.objects.get()
+            self.assertEqual(job.status, 'pending')
+            self.assertEqual(job.attempts, 1)
+            delay = job.next_attempt_at - timezone.now()
+            self.assertGreater(delay, timedelta(seconds=55))
+
+            # Nothing is due until the delay has passed
+            self.assertEqual(run_pending_jobs(), 0)
+            DistributionJob.objects.update(next_attempt_at=timezone.now())
+            run_pending_jobs()
+        job.refresh_from_db()
+        self.assertEqual(job.attempts, 2)
+        delay = job.next_attempt_at - timezone.now()
+        self.assertGreater(delay, timedelta(seconds=115))
+
+    def test_only_jobs_without_heartbeat_are_requeued(self):
+        """Test a long job making progress is not handed to another worker"""
+        self.approve()
+        long_ago = timezone.now() - timedelta(hours=2)
+        DistributionJob.objects.update(
+            status='running', started_at=long_ago,
+            heartbeat_at=timezone.now()
+        )
+        self.assertEqual(requeue_stale_jobs(), 0)
+
+        DistributionJob.objects.update(heartbeat_at=long_ago)
+        self.assertEqual(requeue_stale_jobs(), 1)
+
+    def test_progress_renews_heartbeat(self):
+        """Test every chunk renews the running job's heartbeat"""
+        self.approve()
+        heartbeats = []
+        run_pending_jobs(
+            chunk_size=2,
+            progress=lambda job: heartbeats.append(
+                DistributionJob.objects.get(pk=job.pk).heartbeat_at
+            )
+        )
+        self.assertEqual(len(heartbeats), 3)
+        self.assertEqual(heartbeats, sorted(heartbeats))
+        self.assertGreater(heartbeats[-1], heartbeats[0])
+
+    def test_run_distribution_command_reports_progress(self):
+        """Test the worker command processes the queue and exits"""
+        self.approve()
+        out = StringIO()
+        call_command(
+            'run_distribution', '--once', '--chunk-size', '5', stdout=out
+        )
+        self.assertIn('5/5 recipients', out.getvalue())
+        self.assertIn('Processed 1 job(s).', out.getvalue())
+
+
+class TestEmailDelivery(TestCase):
+    """Test per-recipient delivery over pooled connections"""
+
+    def build(self, count):
+        return [
+            build_message(
+                'Subject', '<p>Hello</p>', 'noreply@example.com',
+                f'reader{i}@test.com'
+            )
+            for i in range(count)
+        ]
+
+    def test_messages_have_text_and_html_parts(self):
+        """Test each message has a single recipient and an HTML part"""
+        message = self.build(1)[0]
+        self.assertEqual(message.to, ['reader0@test.com'])
+        self.assertEqual(message.body, 'Hello')
+        self.assertEqual(message.alternatives[0][1], 'text/html')
+
+    def test_connections_are_reused_across_batches(self):
+        """Test batches rotate over a fixed number of connections"""
+        with patch('news.delivery.get_connection', wraps=get_connection) as (
+            mock_get_connection
+        ):
+            with ConnectionPool(size=2) as pool:
+                result = deliver(self.build(10), pool=pool, batch_size=2)
+
+        self.assertEqual(result.sent, 10)
+        self.assertEqual(len(mail.outbox), 10)
+        self.assertEqual(mock_get_connection.call_count, 2)
+        self.assertGreater(result.messages_per_second, 0)
+
+    def test_failed_message_is_retried_individually(self):
+        """Test a transient failure only retries the affected message"""
+        messages = self.build(3)
+        with ConnectionPool(size=1) as pool:
+            connection = pool.acquire()
+            real_send = connection.send_messages
+            failures = []
+
+            def flaky_send(batch):
+                if batch[0].to == ['reader1@test.com'] and not failures:
+                    failures.append(1)
+                    raise OSError('Temporary failure')
+                return real_send(batch)
+
+            connection.send_messages = flaky_send
+            result = deliver(messages, pool=pool, retry_delay=0)
+
+        self.assertEqual(result.sent, 3)
+        self.assertEqual(result.failed, [])
+        self.assertEqual(len(mail.outbox), 3)
+
+    def test_permanent_failure_is_reported(self):
+        """Test a message failing every retry is reported, not raised"""
+        with ConnectionPool(size=1) as pool:
+            connection = pool.acquire()
+            connection.send_messages = lambda batch: 0
+            result = deliver(
+                self.build(2), pool=pool, max_retries=1, retry_delay=0
+            )
+
+        self.assertEqual(result.sent, 0)
+        self.assertEqual(
+            result.failed, ['reader0@test.com', 'reader1@test.com']
+        )
+
+
+class TestRecipientResolution(TestCase):
+    """Test subscriber resolution for approved content"""
+
+    def setUp(self):
+        self.journalist = CustomUser.objects.create_user(
+            username='aud_journalist',
+            password='password123',
+            role='journalist'
+        )
+        self.publisher = Publisher.objects.create(name='Audience Publisher')
+        self.both = self.make_reader('both', 'both@test.com')
+        self.both.subscriptions_publishers.add(self.publisher)
+        self.both.subscriptions_journalists.add(self.journalist)
+        self.follower = self.make_reader('follower', 'follower@test.com')
+        self.follower.subscriptions_journalists.add(self.journalist)
+        self.no_email = self.make_reader('no_email', '')
+        self.no_email.subscriptions_publishers.add(self.publisher)
+        self.duplicate = self.make_reader('duplicate', 'follower@test.com')
+        self.duplicate.subscriptions_publishers.add(self.publisher)
+        self.make_reader('unsubscribed', 'other@test.com')
+
+        self.article = Article.objects.create(
+            title='Audience Article', content='Content',
+            author=self.journalist, publisher=self.publisher
+        )
+
+    def make_reader(self, username, email):
+        return CustomUser.objects.create_user(
+            username=username, password='password123',
+            role='reader', email=email
+        )
+
+    def test_recipients_are_deduplicated_in_one_query(self):
+        """Test each non-empty address is returned once, in one query"""
+        with self.assertNumQueries(1):
+            recipients = list(resolve_recipients(self.article))
+        self.assertEqual(
+            recipients,
+            [
+                (self.both.pk, 'both@test.com'),
+                (self.follower.pk, 'follower@test.com'),
+            ]
+        )
+
+    def test_count_only_mode(self):
+        """Test count-only mode returns the number of recipients"""
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                resolve_recipients(self.article, count_only=True), 2
+            )
+
+    def test_content_without_publisher_uses_followers_only(self):
+        """Test content without a publisher reaches author followers"""
+        self.article.publisher = None
+        emails = [email for _, email in resolve_recipients(self.article)]
+        self.assertEqual(emails, ['both@test.com', 'follower@test.com'])
+
+    def test_chunks_resume_after_recipient(self):
+        """Test keyset chunks page through the stored recipients in order"""
+        job = DistributionJob.objects.create(
+            content_type='article', object_id=self.article.pk
+        )
+        self.assertEqual(store_recipients(job, self.article), 2)
+        chunks = list(iter_recipient_chunks(job, chunk_size=1))
+        self.assertEqual(
+            chunks,
+            [
+                [(self.both.pk, 'both@test.com')],
+                [(self.follower.pk, 'follower@test.com')],
+            ]
+        )
+        self.assertEqual(
+            list(iter_recipient_chunks(job, after_id=self.both.pk)),
+            [[(self.follower.pk, 'follower@test.com')]]
+        )
+
+    def test_chunk_queries_skip_audience_resolution(self):
+        """Test the audience is resolved once, not again for every chunk"""
+        job = DistributionJob.objects.create(
+            content_type='article', object_id=self.article.pk
+        )
+        store_recipients(job, self.article)
+        with CaptureQueriesContext(connection) as queries:
+            list(iter_recipient_chunks(job, chunk_size=1))
+        self.assertEqual(len(queries), 3)
+        for query in queries:
+            self.assertNotIn('news_customuser', query['sql'])
+            self.assertNotIn('GROUP BY', query['sql'])
+
+
+class TestReaderFeeds(TestCase):
+    """Test the precomputed reader feed table"""
+
+    def setUp(self):
+        cache.clear()
+        self.journalist = CustomUser.objects.create_user(
+            username='feed_journalist',
+            password='password123',
+            role='journalist'
+        )
+        self.publisher = Publisher.objects.create(name='Feed Publisher')
+        self.reader = CustomUser.objects.create_user(
+            username='feed_reader',
+            password='password123',
+            role='reader',
+            email='feed@test.com'
+        )
+        self.article = Article.objects.create(
+            title='Feed Article', content='Content',
+            author=self.journalist, publisher=self.publisher, approved=False
+        )
+
+    def feed_titles(self, model=Article):
+        return [item.title for item in feed_queryset(self.reader, model)]
+
+    def test_approval_fans_out_to_subscribers(self):
+        """Test the distribution worker writes feed rows for subscribers"""
+        self.reader.subscriptions_publishers.add(self.publisher)
+        self.article.approved = True
+        self.article.save()
+        self.assertEqual(self.feed_titles(), [])
+
+        run_pending_jobs()
+        entry = FeedEntry.objects.get()
+        self.assertEqual(entry.reader, self.reader)
+        self.assertEqual(entry.content_type, 'article')
+        self.assertEqual(entry.content_id, self.article.pk)
+        self.assertEqual(self.feed_titles(), ['Feed Article'])
+
+    def test_subscribing_backfills_existing_content(self):
+        """Test a new subscription adds already approved content"""
+        Newsletter.objects.create(
+            title='Feed Newsletter', content='Content',
+            author=self.journalist, approved=True
+        )
+        self.client.force_login(self.reader)
+        self.client.post(reverse(
+            'subscribe',
+            kwargs={'subscription_type': 'journalist', 'pk': self.journalist.pk}
+        ))
+        self.assertEqual(self.feed_titles(Newsletter), ['Feed Newsletter'])
+
+    def test_unsubscribing_keeps_content_from_other_subscriptions(self):
+        """Test unsubscribing only drops content no longer subscribed to"""
+        other = Article.objects.create(
+            title='Other Article', content='Content',
+            author=self.journalist, approved=True
+        )
+        self.article.delete()
+        Article.objects.create(
+            title='Publisher Article', content='Content',
+            author=CustomUser.objects.create_user(
+                username='feed_other_journalist',
+                password='password123',
+                role='journalist'
+            ),
+            publisher=self.publisher,
+            approved=True
+        )
+        self.reader.subscriptions_publishers.add(self.publisher)
+        self.reader.subscriptions_journalists.add(self.journalist)
+        self.assertEqual(len(self.feed_titles()), 2)
+
+        self.reader.subscriptions_publishers.remove(self.publisher)
+        self.assertEqual(self.feed_titles(), [other.title])
+
+        self.journalist.followers.clear()
+        self.assertEqual(self.feed_titles(), [])
+
+    def test_withdrawn_and_deleted_content_leaves_feeds(self):
+        """Test unapproved or deleted content is removed from feeds"""
+        self.article.approved = True
+        self.article.save()
+        self.reader.subscriptions_publishers.add(self.publisher)
+        self.assertEqual(self.feed_titles(), ['Feed Article'])
+
+        self.article.approved = False
+        self.article.save()
+        self.assertEqual(self.feed_titles(), [])
+
+        self.reader.subscriptions_journalists.add(self.journalist)
+        self.article.approved = True
+        self.article.save()
+        run_pending_jobs()
+        self.article.delete()
+        self.assertFalse(FeedEntry.objects.exists())
+
+    def test_dashboard_reads_from_feed(self):
+        """Test the reader dashboard shows feed content"""
+        self.reader.subscriptions_publishers.add(self.publisher)
+        self.article.approved = True
+        self.article.save()
+        run_pending_jobs()
+        self.client.force_login(self.reader)
+        response = self.client.get(reverse('dashboard'))
+        self.assertContains(response, 'Feed Article')
+
+    def test_rebuild_feeds_command(self):
+        """Test feeds can be rebuilt from subscriptions"""
+        self.reader.subscriptions_publishers.add(self.publisher)
+        Article.objects.filter(pk=self.article.pk).update(approved=True)
+        FeedEntry.objects.all().delete()
+
+        out = StringIO()
+        call_command('rebuild_feeds', '--batch-size', '1', stdout=out)
+        self.assertIn('Rebuilt 1 feed(s) with 1 entries.', out.getvalue())
+        self.assertEqual(self.feed_titles(), ['Feed Article'])
+
+
+class TestSubscribedPagination(APITestCase):
+    """Test keyset cursor pagination of the subscribed content APIs"""
+
+    def setUp(self):
+        cache.clear()
+        self.reader = CustomUser.objects.create_user(
+            username='page_reader', password='password123', role='reader'
+        )
+        self.journalist = CustomUser.objects.create_user(
+            username='page_journalist',
+            password='password123',
+            role='journalist'
+        )
+        self.reader.subscriptions_journalists.add(self.journalist)
+        for i in range(5):
+            Article.objects.create(
+                title=f'Page Article {i}', content='Content',
+                author=self.journalist, approved=True
+            )
+        # Give two articles the same timestamp to exercise the tie-breaker
+        first = Article.objects.order_by('pk').first()
+        Article.objects.filter(pk=first.pk + 1).update(
+            created_at=first.created_at
+        )
+        FeedEntry.objects.filter(content_id=first.pk + 1).update(
+            created_at=first.created_at
+        )
+        self.client.force_login(self.reader)
+
+    def titles(self, response):
+        return [item['title'] for item in response.data['results']]
+
+    def test_pages_follow_next_and_previous_cursors(self):
+        """Test cursors walk the feed newest first without gaps"""
+        url = reverse('subscribed_articles')
+        first = self.client.get(url, {'page_size': 2})
+        self.assertEqual(
+            self.titles(first), ['Page Article 4', 'Page Article 3']
+        )
+        self.assertIsNone(first.data['previous'])
+
+        second = self.client.get(first.data['next'])
+        self.assertEqual(
+            self.titles(second), ['Page Article 2', 'Page Article 1']
+        )
+
+        third = self.client.get(second.data['next'])
+        self.assertEqual(self.titles(third), ['Page Article 0'])
+        self.assertIsNone(third.data['next'])
+
+        back = self.client.get(third.data['previous'])
+        self.assertEqual(self.titles(back), self.titles(second))
+        back = self.client.get(back.data['previous'])
+        self.assertEqual(self.titles(back), self.titles(first))
+        self.assertIsNone(back.data['previous'])
+
+    def test_page_size_is_capped(self):
+        """Test page_size cannot exceed the configured maximum"""
+        with self.settings(NEWS_API_MAX_PAGE_SIZE=3):
+            response = self.client.get(
+                reverse('subscribed_articles'), {'page_size': 1000}
+            )
+        self.assertEqual(len(response.data['results']), 3)
+
+    def test_invalid_cursor_is_rejected(self):
+        """Test a tampered cursor returns 404"""
+        response = self.client.get(
+            reverse('subscribed_articles'), {'cursor': 'not-a-cursor'}
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_page_query_count_is_constant(self):
+        """Test a page costs the same number of queries at any depth"""
+        url = reverse('subscribed_newsletters')
+        for i in range(30):
+            Newsletter.objects.create(
+                title=f'Page Newsletter {i}', content='Content',
+                author=self.journalist, approved=True
+            )
+        first = self.client.get(url, {'page_size': 5})
+        # Feed entries and content; the ETag, session and user are cached
+        with self.assertNumQueries(2):
+            self.client.get(first.data['next'])
+
+
+class TestHomePageQueries(TestCase):
+    """Test the home page runs a fixed number of queries"""
+
+    def setUp(self):
+        cache.clear()
+        self.reader = CustomUser.objects.create_user(
+            username='home_reader', password='password123', role='reader'
+        )
+        self.count = 0
+
+    def add_content(self, count):
+        with self.captureOnCommitCallbacks(execute=True):
+            for _ in range(count):
+                self.add_row()
+
+    def add_row(self):
+        self.count += 1
+        journalist = CustomUser.objects.create_user(
+            username=f'home_journalist_{self.count}',
+            password='password123',
+            role='journalist'
+        )
+        publisher = Publisher.objects.create(
+            name=f'Home Publisher {self.count}'
+        )
+        Article.objects.create(
+            title=f'Home Article {self.count}', content='Content',
+            author=journalist, publisher=publisher, approved=True
+        )
+        Newsletter.objects.create(
+            title=f'Home Newsletter {self.count}', content='Content',
+            author=journalist, publisher=publisher, approved=True
+        )
+        if self.count % 2:
+            self.reader.subscriptions_publishers.add(publisher)
+            self.reader.subscriptions_journalists.add(journalist)
+
+    def home_queries(self):
+        cache.clear()  # Compare cold caches, whatever was cached before
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('home'))
+        self.assertEqual(response.status_code, 200)
+        return len(queries), response
+
+    def test_query_count_independent_of_content(self):
+        """Test adding articles and publishers adds no queries"""
+        self.client.force_login(self.reader)
+        self.add_content(2)
+        small, _ = self.home_queries()
+        self.add_content(8)
+        large, response = self.home_queries()
+        self.assertEqual(small, large)
+        self.assertContains(response, 'Home Article 10')
+
+    def test_anonymous_query_count_independent_of_content(self):
+        """Test the anonymous home page also has a fixed query count"""
+        self.add_content(2)
+        small, _ = self.home_queries()
+        self.add_content(8)
+        large, _ = self.home_queries()
+        self.assertEqual(small, large)
+
+    def test_subscription_flags(self):
+        """Test sidebar rows are flagged with the reader's subscriptions"""
+        self.client.force_login(self.reader)
+        self.add_content(2)
+        _, response = self.home_queries()
+        flags = {
+            publisher.name: publisher.is_subscribed
+            for publisher in response.context['publishers']
+        }
+        self.assertEqual(
+            flags, {'Home Publisher 1': True, 'Home Publisher 2': False}
+        )
+        self.assertContains(response, 'Unsubscribe', count=2)
+
+
+class TestHomePageCache(TestCase):
+    """Test caching and invalidation of the home page"""
+
+    def setUp(self):
+        cache.clear()
+        self.journalist = CustomUser.objects.create_user(
+            username='cache_journalist',
+            password='password123',
+            role='journalist'
+        )
+        self.reader = CustomUser.objects.create_user(
+            username='cache_reader', password='password123', role='reader'
+        )
+        self.article = Article.objects.create(
+            title='Cached Article', content='Content',
+            author=self.journalist, approved=True
+        )
+
+    def get_home(self):
+        return self.client.get(reverse('home'))
+
+    def assertCached(self, expected=True):
+        response = self.get_home()
+        self.assertEqual(response['X-Cache'], 'HIT' if expected else 'MISS')
+        return response
+
+    def test_anonymous_page_served_from_cache(self):
+        """Test a repeated anonymous request skips the database"""
+        self.assertCached(False)
+        with self.assertNumQueries(0):
+            response = self.assertCached()
+        self.assertContains(response, 'Cached Article')
+
+    def test_approving_content_invalidates_cache(self):
+        """Test approval, edits and deletion refresh the page"""
+        self.assertCached(False)
+        draft = Article.objects.create(
+            title='Draft Article', content='Content',
+            author=self.journalist, approved=False
+        )
+        self.assertCached()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            draft.approved = True
+            draft.save()
+        response = self.assertCached(False)
+        self.assertContains(response, 'Draft Article')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            draft.delete()
+        response = self.assertCached(False)
+        self.assertNotContains(response, 'Draft Article')
+
+    def test_publisher_changes_invalidate_cache(self):
+        """Test adding a publisher refreshes the sidebar"""
+        self.assertCached(False)
+        with self.captureOnCommitCallbacks(execute=True):
+            Publisher.objects.create(name='New Cached Publisher')
+        response = self.assertCached(False)
+        self.assertContains(response, 'New Cached Publisher')
+
+    def test_journalist_role_changes_invalidate_cache(self):
+        """Test only changes affecting the journalist list invalidate"""
+        self.assertCached(False)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.reader.first_name = 'Reader'
+            self.reader.save()
+        self.assertCached()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.reader.role = 'journalist'
+            self.reader.save()
+        response = self.assertCached(False)
+        self.assertContains(response, 'cache_reader')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.login(
+                username='cache_journalist', password='password123'
+            )
+            self.client.logout()
+        self.assertCached()
+
+    def test_authenticated_users_share_content_fragment(self):
+        """Test signed in users get a cached listing but their own sidebar"""
+        self.client.force_login(self.reader)
+        self.assertCached(False)
+        response = self.assertCached()
+        self.assertContains(response, 'cache_reader')
+        self.assertContains(response, 'Cached Article')
+
+    @override_settings(NEWS_STATS_COUNTERS=True)
+    def test_hit_and_miss_counters(self):
+        """Test hits and misses are counted and reported"""
+        page_cache.reset_stats()
+        self.get_home()
+        self.get_home()
+        stats = page_cache.get_stats()
+        self.assertEqual(stats['page'], {'hit': 1, 'miss': 1})
+        self.assertEqual(stats['fragment'], {'hit': 0, 'miss': 1})
+
+        out = StringIO()
+        call_command('cache_stats', '--reset', stdout=out)
+        self.assertIn('page: 1 hits, 1 misses (50% hit rate)', out.getvalue())
+        self.assertEqual(page_cache.get_stats()['page']['hit'], 0)
+
+
+class TestListingIndexes(TransactionTestCase):
+    """Test the listing query indexes and their benchmark"""
+
+    def test_listing_queries_use_indexes(self):
+        """Test listing queries are planned with the composite indexes"""
+        journalist = CustomUser.objects.create_user(
+            username='index_journalist', role='journalist'
+        )
+        plan = Article.objects.filter(approved=True).order_by(
+            '-created_at'
+        )[:50].explain()
+        self.assertIn('article_created_idx', plan)
+
+        plan = Article.objects.filter(author=journalist).order_by(
+            '-created_at'
+        )[:50].explain()
+        self.assertIn('article_author_created_idx', plan)
+
+        # Only the pending rows are read, not every approved one
+        plan = Article.objects.pending().order_by('-created_at').explain()
+        self.assertIn('article_approved_created_idx', plan)
+        plan = Newsletter.objects.pending().order_by('-created_at').explain()
+        self.assertIn('nl_approved_created_idx', plan)
+
+    def test_benchmark_restores_indexes(self):
+        """Test the benchmark reports timings and leaves indexes in place"""
+        out = StringIO()
+        call_command(
+            'benchmark_queries', '--scratch', '--rows', '40', '--repeat', '1',
+            stdout=out
+        )
+        output = out.getvalue()
+        self.assertIn('Seeded 40 articles and 40 newsletters', output)
+        self.assertIn('Without indexes', output)
+        self.assertIn('article publisher listing:', output)
+        self.assertIn('newsletter publisher listing:', output)
+        # 1 in 17 of the 40 seeded items is pending, read in full
+        self.assertIn('3 rows', output)
+        self.assertEqual(Article.objects.count(), 40)
+        self.assertEqual(Newsletter.objects.count(), 40)
+
+        for model in (Article, Newsletter):
+            with connection.cursor() as cursor:
+                names = {
+                    constraint
+                    for constraint, info in connection.introspection
+                    .get_constraints(cursor, model._meta.db_table).items()
+                    if info['index']
+                }
+            for index in model._meta.indexes:
+                self.assertIn(index.name, names)
+
+    def test_benchmark_requires_scratch_confirmation(self):
+        """Test the benchmark won't touch a database it wasn't cleared for"""
+        with self.assertRaisesMessage(CommandError, '--scratch'):
+            call_command('benchmark_queries', '--rows', '40', stdout=StringIO())
+        self.assertFalse(Article.objects.exists())
+
+
+class TestRoleChangeTracking(TestCase):
+    """Test role change detection in the CustomUser pre_save signal"""
+
+    def setUp(self):
+        cache.clear()
+        self.publisher = Publisher.objects.create(name='Role Publisher')
+        self.journalist = CustomUser.objects.create_user(
+            username='role_journalist', role='journalist'
+        )
+        self.reader = CustomUser.objects.create_user(
+            username='role_reader', password='password123', role='reader'
+        )
+        self.reader.subscriptions_publishers.add(self.publisher)
+        self.reader.subscriptions_journalists.add(self.journalist)
+
+    def test_profile_save_issues_single_query(self):
+        """Test saving a user without a role change only updates the row"""
+        reader = CustomUser.objects.get(pk=self.reader.pk)
+        reader.first_name = 'Reader'
+        with self.assertNumQueries(1):
+            reader.save()
+        self.assertEqual(reader.subscriptions_publishers.count(), 1)
+
+        # Saving again after a save is still not a role change
+        with self.assertNumQueries(1):
+            self.reader.save()
+
+    def test_login_skips_role_lookup(self):
+        """Test logging in doesn't query the user a second time"""
+        with CaptureQueriesContext(connection) as queries:
+            self.client.login(username='role_reader', password='password123')
+        user_selects = [
+            query for query in queries.captured_queries
+            if query['sql'].startswith('SELECT')
+            and 'FROM "news_customuser"' in query['sql']
+        ]
+        self.assertEqual(len(user_selects), 1)
+
+    def test_role_change_clears_subscriptions(self):
+        """Test subscriptions are cleared when a reader changes role"""
+        reader = CustomUser.objects.get(pk=self.reader.pk)
+        reader.role = 'editor'
+        reader.save()
+        self.assertFalse(reader.subscriptions_publishers.exists())
+        self.assertFalse(reader.subscriptions_journalists.exists())
+
+    def test_role_change_with_deferred_role(self):
+        """Test a role change is detected when the role was deferred"""
+        reader = CustomUser.objects.only('username').get(pk=self.reader.pk)
+        reader.role = 'journalist'
+        reader.save()
+        self.assertFalse(reader.subscriptions_publishers.exists())
+
+
+class TestRoleGroups(TestCase):
+    """Test provisioning of role groups and new user assignment"""
+
+    def test_new_user_added_to_role_group(self):
+        """Test creating a user costs one insert for its group"""
+        roles.get_role_group_ids()
+        with self.assertNumQueries(2):
+            editor = CustomUser.objects.create(
+                username='group_editor', role='editor'
+            )
+        self.assertTrue(editor.groups.filter(name='Editors').exists())
+        self.assertTrue(editor.has_perm('news.change_article'))
+        self.assertFalse(editor.has_perm('news.add_article'))
+
+    def test_missing_groups_are_provisioned(self):
+        """Test deleted groups are recreated on the next registration"""
+        Group.objects.filter(name='Journalists').delete()
+        journalist = CustomUser.objects.create(
+            username='group_journalist', role='journalist'
+        )
+        self.assertTrue(journalist.has_perm('news.add_newsletter'))
+
+    def test_sync_roles_backfills_bulk_created_users(self):
+        """Test sync_roles is idempotent and adds bulk created users"""
+        CustomUser.objects.bulk_create([
+            CustomUser(username=f'bulk_reader_{i}', role='reader')
+            for i in range(3)
+        ])
+        for _ in range(2):
+            call_command('sync_roles', stdout=StringIO())
+        readers = Group.objects.get(name='Readers')
+        self.assertEqual(
+            readers.user_set.filter(username__startswith='bulk_reader_')
+            .count(),
+            3
+        )
+        self.assertEqual(
+            sorted(readers.permissions.values_list('codename', flat=True)),
+            ['view_article', 'view_newsletter']
+        )
+
+
+class TestImportNews(TestCase):
+    """Test the import_news bulk import command"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def write(self, name, content):
+        path = os.path.join(self.directory.name, name)
+        opener = gzip.open if name.endswith('.gz') else open
+        with opener(path, 'wt', encoding='utf-8') as target:
+            target.write(content)
+        return path
+
+    def import_file(self, kind, name, content, *args):
+        out = StringIO()
+        call_command(
+            'import_news', kind, self.write(name, content), *args, stdout=out
+        )
+        return out.getvalue()
+
+    def test_import_users_publishers_and_subscriptions(self):
+        """Test related records are imported and linked"""
+        output = self.import_file(
+            'users', 'users.csv',
+            'username,email,role\n'
+            'imp_reader,reader@test.com,reader\n'
+            'imp_editor,,editor\n'
+            'imp_journalist,,journalist\n'
+            'imp_reader,duplicate@test.com,reader\n'
+        )
+        self.assertIn('Imported 3 users, skipped 1', output)
+        self.assertIn('rows/sec', output)
+        reader = CustomUser.objects.get(username='imp_reader')
+        self.assertEqual(reader.email, 'reader@test.com')
+        self.assertTrue(reader.groups.filter(name='Readers').exists())
+
+        self.import_file(
+            'publishers', 'publishers.csv',
+            'name,description,editors,journalists\n'
+            'Imported Times,Daily,imp_editor,imp_journalist|unknown\n'
+        )
+        publisher = Publisher.objects.get(name='Imported Times')
+        self.assertEqual(
+            list(publisher.editors.values_list('username', flat=True)),
+            ['imp_editor']
+        )
+        self.assertEqual(publisher.journalists.count(), 1)
+
+        article = Article.objects.create(
+            title='Existing', content='Content', approved=True,
+            author=CustomUser.objects.get(username='imp_journalist')
+        )
+        output = self.import_file(
+            'subscriptions', 'subscriptions.jsonl',
+            '{"reader": "imp_reader", "publisher": "Imported Times"}\n'
+            '{"reader": "imp_reader", "journalist": "imp_journalist"}\n'
+            '{"reader": "missing", "journalist": "imp_journalist"}\n'
+        )
+        self.assertIn('Imported 2 subscriptions, skipped 1', output)
+        self.assertEqual(reader.subscriptions_publishers.get(), publisher)
+        self.assertEqual(
+            list(feed_queryset(reader, Article)), [article]
+        )
+
+    def test_import_content_preserves_dates_and_updates_feeds(self):
+        """Test gzipped content keeps its dates and reaches reader feeds"""
+        journalist = CustomUser.objects.create_user(
+            username='imp_author', role='journalist'
+        )
+        reader = CustomUser.objects.create_user(
+            username='imp_follower', role='reader'
+        )
+        reader.subscriptions_journalists.add(journalist)
+
+        output = self.import_file(
+            'articles', 'archive.jsonl.gz',
+            '{"title": "Old", "content": "A", "author": "imp_author", '
+            '"approved": true, "created_at": "2020-01-02T03:04:05Z"}\n'
+            '{"title": "Draft", "content": "B", "author": "imp_author"}\n'
+            '{"title": "Orphan", "content": "C", "author": "nobody"}\n',
+            '--batch-size', '2'
+        )
+        self.assertIn('Imported 2 articles, skipped 1', output)
+        old = Article.objects.get(title='Old')
+        self.assertEqual(old.created_at.year, 2020)
+        self.assertFalse(Article.objects.get(title='Draft').approved)
+        self.assertEqual(list(feed_queryset(reader, Article)), [old])
+        self.assertFalse(DistributionJob.objects.exists())
+
+    def test_malformed_records_are_skipped(self):
+        """Test records missing required values are skipped, not fatal"""
+        CustomUser.objects.create_user(username='bad_author')
+        output = self.import_file(
+            'articles', 'articles.jsonl',
+            '{"content": "No title", "author": "bad_author"}\n'
+            '["not", "a", "record"]\n'
+            '{"title": "' + 'x' * 201 + '", "author": "bad_author"}\n'
+            '{"title": "Good", "author": "bad_author"}\n'
+        )
+        self.assertIn('Imported 1 articles, skipped 3', output)
+        output = self.import_file(
+            'publishers', 'publishers.csv',
+            'name,description\n,Nameless\nNamed,Fine\n'
+        )
+        self.assertIn('Imported 1 publishers, skipped 1', output)
+
+    def test_bad_dates_and_values_are_skipped(self):
+        """Test content with a bad date or non-text values is skipped"""
+        CustomUser.objects.create_user(username='dated_importer')
+        output = self.import_file(
+            'articles', 'articles.jsonl',
+            '{"title": "Month 13", "author": "dated_importer", '
+            '"created_at": "2020-13-45T00:00:00"}\n'
+            '{"title": "Not a date", "author": "dated_importer", '
+            '"created_at": "yesterday"}\n'
+            '{"title": "Number", "author": "dated_importer", '
+            '"created_at": 12345}\n'
+            '{"title": 42, "author": "dated_importer"}\n'
+            '{"title": "Content", "content": {"a": 1}, '
+            '"author": "dated_importer"}\n'
+            '{"title": "Fine", "author": "dated_importer", '
+            '"created_at": "2020-01-02T03:04:05"}\n'
+        )
+        self.assertIn('Imported 1 articles, skipped 5', output)
+        self.assertEqual(
+            Article.objects.get().created_at.date().isoformat(), '2020-01-02'
+        )
+
+    def test_invalid_users_are_skipped(self):
+        """Test users with a bad role, username or email are skipped"""
+        output = self.import_file(
+            'users', 'users.jsonl',
+            '{"username": "boss", "role": "superadmin"}\n'
+            '{"username": "' + 'u' * 151 + '"}\n'
+            '{"username": "has space"}\n'
+            '{"username": 12345}\n'
+            '{"username": "no_email", "email": "not-an-email"}\n'
+            '{"username": "long_name", "first_name": "' + 'f' * 151 + '"}\n'
+            '{"username": "good_user", "email": "good@test.com", '
+            '"role": "editor"}\n'
+        )
+        self.assertIn('Imported 1 users, skipped 6', output)
+        user = CustomUser.objects.get()
+        self.assertEqual(user.username, 'good_user')
+        self.assertTrue(user.groups.filter(name='Editors').exists())
+
+    def test_subscriptions_change_reader_versions(self):
+        """Test imported subscriptions start new subscription versions"""
+        reader = CustomUser.objects.create_user(username='versioned_reader')
+        CustomUser.objects.create_user(
+            username='versioned_journalist', role='journalist'
+        )
+        version = conditional.get_subscription_version(reader.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.import_file(
+                'subscriptions', 'subscriptions.csv',
+                'reader,journalist\n'
+                'versioned_reader,versioned_journalist\n'
+            )
+        self.assertNotEqual(
+            conditional.get_subscription_version(reader.pk), version
+        )
+
+    def test_creation_time_kept_only_when_given(self):
+        """Test content gets the current time unless one is given"""
+        journalist = CustomUser.objects.create_user(username='dated_author')
+        archived = timezone.now() - timedelta(days=365)
+        dated = Article.objects.create(
+            title='Dated', content='A', author=journalist, created_at=archived
+        )
+        fresh = Newsletter.objects.create(
+            title='Fresh', content='B', author=journalist
+        )
+        self.assertEqual(dated.created_at, archived)
+        self.assertGreater(fresh.created_at, archived)
+
+        dated.title = 'Renamed'
+        dated.save()
+        dated.refresh_from_db()
+        self.assertEqual(dated.created_at, archived)
+
+    def test_import_without_returned_ids(self):
+        """Test imports still link and index rows when no IDs come back"""
+        # MySQL and MariaDB don't return the IDs of bulk inserted rows
+        Publisher.objects.create(name='Daily')
+        with patch.object(
+            type(connection.features), 'can_return_rows_from_bulk_insert',
+            False
+        ):
+            self.import_file(
+                'users', 'users.csv',
+                'username,role\nmy_reader,reader\nmy_journalist,journalist\n'
+            )
+            self.import_file(
+                'publishers', 'publishers.csv',
+                'name,journalists\nDaily,my_journalist\n'
+            )
+            self.import_file(
+                'subscriptions', 'subscriptions.csv',
+                'reader,journalist\nmy_reader,my_journalist\n'
+            )
+            self.import_file(
+                'articles', 'articles.csv',
+                'title,content,author,approved\n'
+                'Same,One,my_journalist,1\nSame,Two,my_journalist,1\n'
+            )
+        reader = CustomUser.objects.get(username='my_reader')
+        journalist = CustomUser.objects.get(username='my_journalist')
+        self.assertTrue(reader.groups.filter(name='Readers').exists())
+        self.assertEqual(reader.subscriptions_journalists.get(), journalist)
+        new_daily = Publisher.objects.latest('pk')
+        self.assertEqual(new_daily.journalists.get(), journalist)
+        self.assertEqual(
+            {article.content for article in feed_queryset(reader, Article)},
+            {'One', 'Two'}
+        )
+        self.assertEqual(SearchDocument.objects.count(), 2)
+
+    def test_no_signals_skips_derived_data(self):
+        """Test --no-signals only inserts the records"""
+        CustomUser.objects.create_user(username='quiet_author')
+        self.import_file(
+            'newsletters', 'newsletters.csv',
+            'title,content,author,approved\nQuiet,Content,quiet_author,1\n',
+            '--no-signals'
+        )
+        self.assertTrue(Newsletter.objects.filter(approved=True).exists())
+        self.assertFalse(FeedEntry.objects.exists())
+
+
+class TestContentExport(APITestCase):
+    """Test the streaming NDJSON export of approved content"""
+
+    def setUp(self):
+        self.journalist = CustomUser.objects.create_user(
+            username='export_journalist', password='password123',
+            role='journalist'
+        )
+        self.publisher = Publisher.objects.create(name='Export Press')
+        for i in range(3):
+            Article.objects.create(
+                title=f'Exported {i}', content='Content', approved=True,
+                author=self.journalist, publisher=self.publisher
+            )
+        Article.objects.create(
+            title='Unapproved', content='Content', author=self.journalist
+        )
+        Newsletter.objects.create(
+            title='Exported Newsletter', content='Content', approved=True,
+            author=self.journalist
+        )
+
+    def parse(self, data):
+        return [json.loads(line) for line in data.decode().splitlines()]
+
+    def test_export_endpoint_streams_approved_content(self):
+        """Test the endpoint streams every approved row with names"""
+        url = reverse('content_export')
+        self.assertIn(self.client.get(url).status_code, (401, 403))
+
+        self.client.force_authenticate(user=self.journalist)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        rows = self.parse(b''.join(response.streaming_content))
+        self.assertEqual(
+            [(row['type'], row['title']) for row in rows],
+            [('article', f'Exported {i}') for i in range(3)]
+            + [('newsletter', 'Exported Newsletter')]
+        )
+        self.assertEqual(rows[0]['author'], 'export_journalist')
+        self.assertEqual(rows[0]['publisher'], 'Export Press')
+        self.assertIsNone(rows[-1]['publisher'])
+
+        response = self.client.get(url, {'type': 'newsletter', 'gzip': '1'})
+        self.assertEqual(response['Content-Type'], 'application/gzip')
+        rows = self.parse(
+            gzip.decompress(b''.join(response.streaming_content))
+        )
+        self.assertEqual([row['type'] for row in rows], ['newsletter'])
+
+        response = self.client.get(url, {'type': 'podcast'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_export_command_reads_in_chunks(self):
+        """Test the command pages through rows a chunk at a time"""
+        out = StringIO()
+        with CaptureQueriesContext(connection) as queries:
+            call_command(
+                'export_news', '--type', 'article', '--chunk-size', '2',
+                stdout=out
+            )
+        rows = self.parse(out.getvalue().encode())
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(len(queries), 2)
+
+        path = os.path.join(tempfile.mkdtemp(), 'export.ndjson.gz')
+        self.addCleanup(os.remove, path)
+        call_command('export_news', '--output', path, stderr=StringIO())
+        with gzip.open(path) as source:
+            self.assertEqual(len(self.parse(source.read())), 4)
+
+
+class TestSearch(APITestCase):
+    """Test the full-text search index and endpoints"""
+
+    def setUp(self):
+        self.journalist = CustomUser.objects.create_user(
+            username='search_journalist', password='password123',
+            role='journalist'
+        )
+        self.title_match = Article.objects.create(
+            title='Harbour election results', content='Counting went on.',
+            author=self.journalist, approved=True
+        )
+        self.body_match = Article.objects.create(
+            title='Weekend roundup',
+            content='A short note on the harbour and its election.',
+            author=self.journalist, approved=True
+        )
+        self.newsletter = Newsletter.objects.create(
+            title='Harbour news', content='Election week in the harbour.',
+            author=self.journalist, approved=True
+        )
+        self.draft = Article.objects.create(
+            title='Harbour election draft', content='Not yet approved.',
+            author=self.journalist
+        )
+
+    def search(self, query):
+        return list(SearchResults(query)[:10])
+
+    def test_uses_database_full_text_index(self):
+        """Test SQLite searches go through the FTS5 index"""
+        self.assertEqual(search.get_backend(), 'fts5')
+
+    def test_ranked_results_of_approved_content(self):
+        """Test every word must match and title matches rank first"""
+        results = SearchResults('harbour election')
+        self.assertEqual(results.count(), 3)
+        self.assertEqual(
+            [(item.content_type, item.pk) for item in results[:10]][0],
+            ('article', self.title_match.pk)
+        )
+        self.assertNotIn(self.draft, self.search('harbour election'))
+        self.assertEqual(self.search('elections counted'), [self.title_match])
+        self.assertEqual(
+            self.search('"harbour" (roundup*'), [self.body_match]
+        )
+        self.assertEqual(self.search('   '), [])
+
+    def test_index_follows_content_changes(self):
+        """Test approval, edits, withdrawal and deletion update the index"""
+        self.draft.approved = True
+        self.draft.save()
+        self.assertIn(self.draft, self.search('draft'))
+
+        self.draft.title = 'Harbour election final'
+        self.draft.save()
+        self.assertEqual(self.search('draft'), [])
+        self.assertIn(self.draft, self.search('final'))
+
+        self.draft.approved = False
+        self.draft.save()
+        self.assertEqual(self.search('final'), [])
+
+        self.newsletter.delete()
+        self.assertEqual(SearchResults('week').count(), 0)
+
+    def test_search_api_is_paginated(self):
+        """Test the API returns ranked pages with a total count"""
+        url = reverse('api_search')
+        self.assertIn(
+            self.client.get(url, {'q': 'harbour'}).status_code, (401, 403)
+        )
+
+        self.client.force_authenticate(user=self.journalist)
+        response = self.client.get(
+            url, {'q': 'harbour election', 'page_size': 2}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 3)
+        self.assertEqual(len(response.data['results']), 2)
+        self.assertIsNotNone(response.data['next'])
+        first = response.data['results'][0]
+        self.assertEqual(first['type'], 'article')
+        self.assertEqual(first['title'], 'Harbour election results')
+        self.assertEqual(first['author'], 'search_journalist')
+
+        response = self.client.get(response.data['next'])
+        self.assertEqual(len(response.data['results']), 1)
+
+    def test_search_page(self):
+        """Test the search page lists results and keeps the query"""
+        response = self.client.get(reverse('search'), {'q': 'roundup'})
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Weekend roundup')
+        self.assertContains(response, 'value="roundup"')
+        self.assertNotContains(response, 'Harbour news')
+
+    def test_query_string_does_not_reach_cached_home_page(self):
+        """Test a query on the home page can't be cached for everyone"""
+        cache.clear()
+        self.client.get(reverse('home'), {'q': 'poisoned'})
+        response = self.client.get(reverse('home'))
+        self.assertEqual(response['X-Cache'], 'HIT')
+        self.assertNotContains(response, 'poisoned')
+
+    def test_rebuild_search_index(self):
+        """Test the index can be rebuilt from approved content"""
+        SearchDocument.objects.all().delete()
+        self.assertEqual(self.search('harbour'), [])
+        call_command('rebuild_search_index', stdout=StringIO())
+        self.assertEqual(SearchResults('harbour').count(), 3)
+
+
+class TestContentSummary(APITestCase):
+    """Test stored summaries and deferred loading of content in listings"""
+
+    def setUp(self):
+        cache.clear()
+        self.reader = CustomUser.objects.create_user(
+            username='summary_reader', password='password123', role='reader'
+        )
+        self.journalist = CustomUser.objects.create_user(
+            username='summary_journalist', password='password123',
+            role='journalist'
+        )
+        self.editor = CustomUser.objects.create_user(
+            username='summary_editor', password='password123', role='editor'
+        )
+        self.reader.subscriptions_journalists.add(self.journalist)
+        self.article = Article.objects.create(
+            title='Summary Article',
+            content='<p>Long ' + 'word ' * 100 + '</p>',
+            author=self.journalist, approved=True
+        )
+
+    def test_summary_follows_content(self):
+        """Test the summary is plain text, truncated and kept up to date"""
+        self.assertTrue(self.article.summary.startswith('Long word'))
+        self.assertNotIn('<p>', self.article.summary)
+        self.assertEqual(len(self.article.summary), 200)
+
+        self.article.content = 'Short'
+        self.article.save(update_fields=['content'])
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.summary, 'Short')
+
+        # Saving an instance with deferred content keeps the summary
+        article = Article.objects.defer('content').get(pk=self.article.pk)
+        article.title = 'Renamed'
+        article.save()
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.summary, 'Short')
+
+    def test_listings_do_not_load_content(self):
+        """Test list pages select the summary but not the content"""
+        pages = (
+            (self.reader, 'dashboard'),
+            (self.journalist, 'journalist_dashboard'),
+            (self.editor, 'editor_dashboard'),
+            (self.editor, 'editor_content_management'),
+        )
+        # The editor dashboard only lists pending content
+        Article.objects.create(
+            title='Pending Summary Article', content='<p>Pending</p>',
+            author=self.journalist
+        )
+        for user, name in pages:
+            self.client.force_login(user)
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(reverse(name))
+            self.assertEqual(response.status_code, 200)
+            content_queries = [
+                query['sql'] for query in queries.captured_queries
+                if 'news_article' in query['sql']
+                and '"summary"' in query['sql']
+            ]
+            self.assertTrue(content_queries, name)
+            for sql in content_queries:
+                self.assertNotIn('"content"', sql, name)
+
+    def test_summary_view_of_api(self):
+        """Test view=summary and fields= select fields and skip the content"""
+        self.client.force_authenticate(user=self.reader)
+        url = reverse('subscribed_articles')
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, {'view': 'summary'})
+        item = response.data['results'][0]
+        self.assertNotIn('content', item)
+        self.assertEqual(item['summary'], self.article.summary)
+        self.assertEqual(item['author'], 'summary_journalist')
+        self.assertFalse(any(
+            '"news_article"."content"' in query['sql']
+            for query in queries.captured_queries
+        ))
+
+        response = self.client.get(url, {'fields': 'id,title'})
+        self.assertEqual(
+            response.data['results'][0],
+            {'id': self.article.pk, 'title': 'Summary Article'}
+        )
+
+        response = self.client.get(url)
+        self.assertIn('content', response.data['results'][0])
+
+        response = self.client.get(url, {'fields': 'id,password'})
+        self.assertEqual(response.status_code, 400)
+
+
+class TestContentValues(TestCase):
+    """Test the fast read path of the content APIs"""
+
+    def setUp(self):
+        self.journalist = CustomUser.objects.create_user(
+            username='values_journalist', password='password123',
+            role='journalist'
+        )
+        self.publisher = Publisher.objects.create(name='Values Publisher')
+        Article.objects.create(
+            title='Published', content='<p>Body</p>',
+            author=self.journalist, publisher=self.publisher, approved=True
+        )
+        Article.objects.create(
+            title='Independent', content='Body', author=self.journalist
+        )
+        Newsletter.objects.create(
+            title='Letter', content='Body', author=self.journalist
+        )
+
+    def test_same_output_as_model_serializers(self):
+        """Test rows serialize exactly like the model serializers"""
+        for model, serializer_class in (
+            (Article, ArticleSerializer), (Newsletter, NewsletterSerializer)
+        ):
+            queryset = model.objects.order_by('pk')
+            self.assertEqual(
+                serialize_content_values(queryset),
+                serializer_class(queryset, many=True).data
+            )
+        queryset = Article.objects.order_by('pk')
+        self.assertEqual(
+            serialize_content_values(queryset, ['title', 'publisher']),
+            [{'title': 'Published', 'publisher': 'Values Publisher'},
+             {'title': 'Independent'}]
+        )
+
+    def test_one_query_for_any_number_of_rows(self):
+        """Test rows are serialized with one query and no model instances"""
+        Article.objects.bulk_create(
+            Article(
+                title=f'Bulk {i}', content='Body', author=self.journalist,
+                publisher=self.publisher, approved=True
+            )
+            for i in range(20)
+        )
+        with patch.object(
+            Article, 'from_db', side_effect=AssertionError('Model built')
+        ), self.assertNumQueries(1):
+            data = serialize_content_values(Article.objects.order_by('pk'))
+        self.assertEqual(len(data), 22)
+        self.assertEqual(set(data[0]), set(ArticleSerializer.Meta.fields))
+
+    def test_benchmark_command(self):
+        """Test the benchmark compares both serializers on seeded rows"""
+        out = StringIO()
+        call_command(
+            'benchmark_serializers', '--rows', '5', '--repeat', '1',
+            stdout=out
+        )
+        self.assertRegex(
+            out.getvalue(),
+            r'Serialized 5 articles: model serializer [\d.]+ms, '
+            r'values [\d.]+ms'
+        )
+
+
+class TestConditionalGet(APITestCase):
+    """Test ETag and Last-Modified revalidation of pages and feeds"""
+
+    def setUp(self):
+        cache.clear()
+        self.reader = CustomUser.objects.create_user(
+            username='etag_reader', password='password123', role='reader'
+        )
+        self.journalist = CustomUser.objects.create_user(
+            username='etag_journalist', password='password123',
+            role='journalist'
+        )
+        self.article = Article.objects.create(
+            title='ETag Article', content='Body',
+            author=self.journalist, approved=True
+        )
+
+    def revalidate(self, url, response, **params):
+        return self.client.get(
+            url, params, HTTP_IF_NONE_MATCH=response['ETag']
+        )
+
+    def test_updated_at_follows_saves(self):
+        """Test updated_at moves on every save, including partial ones"""
+        saved = self.article.updated_at
+        self.article.title = 'Renamed'
+        self.article.save(update_fields=['title'])
+        self.article.refresh_from_db()
+        self.assertGreater(self.article.updated_at, saved)
+
+    def test_article_detail(self):
+        """Test article pages revalidate until the article is edited"""
+        url = reverse('article_detail', args=[self.article.pk])
+        # One lookup for both validators, then the article and its author
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Last-Modified', response)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(self.revalidate(url, response).status_code, 304)
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                self.client.get(
+                    url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+                ).status_code,
+                304
+            )
+
+        # Signing in changes the page, as the header shows the user
+        self.client.force_login(self.reader)
+        self.assertEqual(self.revalidate(url, response).status_code, 200)
+        response = self.client.get(url)
+
+        self.article.content = 'Edited'
+        self.article.save()
+        self.assertEqual(self.revalidate(url, response).status_code, 200)
+
+    def test_home_page(self):
+        """Test the home page revalidates until content or follows change"""
+        url = reverse('home')
+        response = self.client.get(url)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.revalidate(url, response).status_code, 304)
+        with self.captureOnCommitCallbacks(execute=True):
+            Article.objects.create(
+                title='Another', content='Body',
+                author=self.journalist, approved=True
+            )
+        self.assertEqual(self.revalidate(url, response).status_code, 200)
+
+        self.client.force_login(self.reader)
+        response = self.client.get(url)
+        self.assertEqual(self.revalidate(url, response).status_code, 304)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.reader.subscriptions_journalists.add(self.journalist)
+        self.assertEqual(self.revalidate(url, response).status_code, 200)
+
+    def test_home_page_follows_csrf_token(self):
+        """Test signing in again invalidates pages holding the old token"""
+        url = reverse('home')
+        self.client.force_login(self.reader)
+        response = self.client.get(url)
+        self.assertEqual(self.revalidate(url, response).status_code, 304)
+
+        self.client.logout()
+        self.client.post(reverse('login'), {
+            'username': 'etag_reader', 'password': 'password123'
+        })
+        response = self.revalidate(url, response)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.revalidate(url, response).status_code, 304)
+
+    def test_subscribed_api(self):
+        """Test feed pages revalidate until the reader's feed changes"""
+        url = reverse('subscribed_articles')
+        self.client.force_authenticate(user=self.reader)
+        self.reader.subscriptions_journalists.add(self.journalist)
+        response = self.client.get(url)
+        self.assertEqual(len(response.data['results']), 1)
+        # Revalidating reads versions from the cache, not the feed
+        with self.assertNumQueries(0):
+            self.assertEqual(self.revalidate(url, response).status_code, 304)
+        self.assertEqual(
+            self.revalidate(url, response, view='summary').status_code, 200
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.article.title = 'Edited'
+            self.article.save()
+        self.assertEqual(self.revalidate(url, response).status_code, 200)
+
+        response = self.client.get(url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.reader.subscriptions_journalists.remove(self.journalist)
+        self.assertEqual(self.revalidate(url, response).status_code, 200)
+
+    def test_subscribed_api_follows_fan_out(self):
+        """Test distributing new content changes the feed's ETag"""
+        url = reverse('subscribed_articles')
+        self.client.force_authenticate(user=self.reader)
+        self.reader.subscriptions_journalists.add(self.journalist)
+        response = self.client.get(url)
+
+        # The worker adds approved content to feeds after the approval
+        article = Article.objects.create(
+            title='Fanned Out', content='Body', author=self.journalist
+        )
+        Article.objects.filter(pk=article.pk).update(approved=True)
+        article.approved = True
+        with self.captureOnCommitCallbacks(execute=True):
+            fan_out_many([article])
+        response = self.revalidate(url, response)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            remove_content(self.article)
+        self.assertEqual(self.revalidate(url, response).status_code, 200)
+
+
+class TestNotificationEmails(TestCase):
+    """Test notification emails are rendered once and personalised"""
+
+    def setUp(self):
+        self.journalist = CustomUser.objects.create_user(
+            username='mail_journalist', password='password123',
+            role='journalist'
+        )
+        self.publisher = Publisher.objects.create(name='Mail Publisher')
+        for i in range(3):
+            reader = CustomUser.objects.create_user(
+                username=f'mail_reader_{i}', password='password123',
+                role='reader', email=f'mail{i}@test.com'
+            )
+            reader.subscriptions_journalists.add(self.journalist)
+            reader.subscriptions_publishers.add(self.publisher)
+        self.article = Article.objects.create(
+            title='Mail {Article}', content='<b>Bold</b> & {braces}',
+            author=self.journalist, publisher=self.publisher
+        )
+
+    def test_rendered_once_per_job(self):
+        """Test one render per template and per-recipient details"""
+        rendered = []
+
+        def record(sender, template, **kwargs):
+            rendered.append(template.name)
+
+        template_rendered.connect(record)
+        try:
+            self.article.approved = True
+            self.article.save()
+            run_pending_jobs()
+        finally:
+            template_rendered.disconnect(record)
+
+        self.assertEqual(
+            sorted(rendered),
+            ['news/article_email.html', 'news/article_email.txt']
+        )
+        self.assertEqual(len(mail.outbox), 3)
+        message = next(m for m in mail.outbox if m.to == ['mail1@test.com'])
+        self.assertEqual(message.subject, 'New Article from mail_journalist!')
+        self.assertIn('Hi mail_reader_1,', message.body)
+        self.assertIn('Bold & {braces}', message.body)
+        self.assertNotIn('<b>', message.body)
+        html = message.alternatives[0][0]
+        self.assertIn('Mail {Article}', html)
+        self.assertIn('&amp; {braces}', html)
+
+        unsubscribe_url = message.body.split('Unsubscribe: ')[1].split()[0]
+        self.assertIn(f'href="{unsubscribe_url}"', html)
+        self.assertTrue(unsubscribe_url.startswith(settings.NEWS_SITE_URL))
+
+    @override_settings(NEWS_SITE_URL='https://news.example.com')
+    def test_links_use_site_url(self):
+        """Test every link in both emails and both formats uses the site"""
+        reader = CustomUser.objects.get(username='mail_reader_0')
+        newsletter = Newsletter.objects.create(
+            title='Mail Letter', content='Body', author=self.journalist
+        )
+        for content_type, content, link in (
+            ('article', self.article, 'https://news.example.com'
+             + reverse('article_detail', args=[self.article.pk])),
+            ('newsletter', newsletter, 'https://news.example.com'),
+        ):
+            email = emails.ContentEmail(content_type, content)
+            for body in email.render(reader.pk, reader.username):
+                self.assertNotIn('127.0.0.1', body)
+                self.assertIn(link, body)
+
+            text, _ = email.render(reader.pk, reader.username)
+            unsubscribe_url = text.split('Unsubscribe: ')[1].split()[0]
+            path = unsubscribe_url[len('https://news.example.com'):]
+            token = resolve(path).kwargs['token']
+            self.assertEqual(
+                emails.read_unsubscribe_token(token)[0], reader.pk
+            )
+
+    def test_unsubscribe_link(self):
+        """Test the emailed link unsubscribes the recipient after confirming"""
+        reader = CustomUser.objects.get(username='mail_reader_0')
+        url = reverse(
+            'unsubscribe', args=[emails.make_unsubscribe_token(
+                reader.pk, self.article
+            )]
+        )
+        response = self.client.get(url)
+        self.assertContains(response, 'Stop receiving emails from')
+        self.assertTrue(reader.subscriptions_publishers.exists())
+
+        response = self.client.post(url)
+        self.assertContains(response, 'You will no longer receive emails')
+        self.assertFalse(reader.subscriptions_publishers.exists())
+        self.assertFalse(reader.subscriptions_journalists.exists())
+        other = CustomUser.objects.get(username='mail_reader_1')
+        self.assertTrue(other.subscriptions_publishers.exists())
+
+        response = self.client.get(url[:-2] + 'x/')
+        self.assertEqual(response.status_code, 404)
+
+
+class StubXHandler(BaseHTTPRequestHandler):
+    """Answers posts with the next queued (status, headers) response"""
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        server = self.server
+        server.requests.append(json.loads(
+            self.rfile.read(int(self.headers['Content-Length']))
+        ))
+        server.clients.add(self.client_address)
+        status, headers = server.responses.pop(0)
+        body = json.dumps({'data': {'id': str(len(server.requests))}})
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body.encode())
+
+    def log_message(self, *args):
+        pass
+
+
+@patch.dict('os.environ', X_CREDENTIALS)
+class TestSocialPosting(TestCase):
+    """Test the X/Twitter posting queue against a local stub API"""
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), StubXHandler)
+        self.server.requests = []
+        self.server.clients = set()
+        self.server.responses = []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+        self.clock = [0.0]
+        self.sleeps = []
+        self.bucket = TokenBucket(
+            rate=1, capacity=2,
+            clock=lambda: self.clock[0], sleep=self.sleeps.append
+        )
+        self.poster = SocialPoster(
+            api_url=f'http://127.0.0.1:{self.server.server_port}/2/tweets',
+            bucket=self.bucket,
+            timeout=5
+        )
+        self.addCleanup(self.poster.close)
+
+        journalist = CustomUser.objects.create_user(
+            username='social_journalist', password='password123',
+            role='journalist'
+        )
+        self.article = Article.objects.create(
+            title='Social Article', content='Content', author=journalist
+        )
+
+    def queue(self, count):
+        return [
+            SocialPost.objects.create(
+                content_type='article', object_id=self.article.pk,
+                text=f'Post {i}'
+            )
+            for i in range(count)
+        ]
+
+    def test_approval_queues_post(self):
+        """Test approval queues a post instead of calling the API"""
+        self.article.approved = True
+        self.article.save()
+        run_pending_jobs()
+        post = SocialPost.objects.get()
+        self.assertIn('New article from social_journalist', post.text)
+        self.assertEqual(post.status, 'pending')
+        self.assertEqual(self.server.requests, [])
+
+    def test_posts_share_one_connection_and_are_rate_limited(self):
+        """Test posts reuse the session's connection within the bucket"""
+        self.queue(3)
+        self.server.responses = [(201, {})] * 3
+        self.assertEqual(self.poster.send_due(), 3)
+
+        self.assertEqual(
+            [request['text'] for request in self.server.requests],
+            ['Post 0', 'Post 1', 'Post 2']
+        )
+        self.assertEqual(len(self.server.clients), 1)
+        # The burst of two is free, the third waits for a token
+        self.assertEqual(self.sleeps, [1.0])
+        self.assertEqual(
+            list(SocialPost.objects.values_list('status', 'post_id')),
+            [('sent', '1'), ('sent', '2'), ('sent', '3')]
+        )
+
+    def test_server_errors_are_retried_with_backoff(self):
+        """Test 5xx responses back off exponentially until they fail"""
+        post, = self.queue(1)
+        self.server.responses = [(503, {})] * 2
+        with self.settings(NEWS_SOCIAL_MAX_ATTEMPTS=2,
+                           NEWS_SOCIAL_RETRY_DELAY=60):
+            self.poster.send_due()
+            post.refresh_from_db()
+            self.assertEqual((post.status, post.attempts), ('pending', 1))
+            self.assertGreater(
+                post.next_attempt_at, timezone.now() + timedelta(seconds=50)
+            )
+            # Not due yet
+            self.assertEqual(self.poster.send_due(), 0)
+
+            SocialPost.objects.update(next_attempt_at=timezone.now())
+            self.poster.send_due()
+        post.refresh_from_db()
+        self.assertEqual((post.status, post.attempts), ('failed', 2))
+        self.assertIn('HTTP 503', post.last_error)
+
+    def test_rate_limit_response_pauses_posting(self):
+        """Test a 429 reschedules the post and pauses the bucket"""
+        first, second = self.queue(2)
+        self.server.responses = [(429, {'Retry-After': '120'})]
+        self.assertEqual(self.poster.send_due(), 1)
+
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual((first.status, first.attempts), ('pending', 0))
+        self.assertGreater(
+            first.next_attempt_at, timezone.now() + timedelta(seconds=110)
+        )
+        self.assertEqual(second.status, 'pending')
+        self.assertEqual(len(self.server.requests), 1)
+
+        self.clock[0] += 121
+        self.server.responses = [(201, {})]
+        self.assertEqual(self.poster.send_due(), 1)
+        second.refresh_from_db()
+        self.assertEqual(second.status, 'sent')
+
+    def test_client_errors_fail_without_retry(self):
+        """Test 4xx responses other than 429 fail the post at once"""
+        post, = self.queue(1)
+        self.server.responses = [(403, {})]
+        self.poster.send_due()
+        post.refresh_from_db()
+        self.assertEqual((post.status, post.attempts), ('failed', 1))
+
+
+class TestApprovalOutbox(APITestCase):
+    """Test approval side effects only run once the approval commits"""
+
+    def setUp(self):
+        cache.clear()
+        self.editor = CustomUser.objects.create_user(
+            username='outbox_editor', password='password123', role='editor'
+        )
+        journalist = CustomUser.objects.create_user(
+            username='outbox_journalist', password='password123',
+            role='journalist'
+        )
+        self.article = Article.objects.create(
+            title='Outbox Article', content='Content', author=journalist
+        )
+        self.url = reverse('article_approval', args=[self.article.pk])
+        self.client.force_authenticate(user=self.editor)
+
+    def test_side_effects_wait_for_commit(self):
+        """Test the job is written with the approval and dispatched after"""
+        version = page_cache.get_version()
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.client.post(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(DistributionJob.objects.count(), 1)
+        self.assertIn(wake_workers, callbacks)
+        self.assertIn(page_cache.invalidate, callbacks)
+        self.assertEqual(page_cache.get_version(), version)
+        self.assertEqual(len(mail.outbox), 0)
+
+        for callback in callbacks:
+            callback()
+        self.assertNotEqual(page_cache.get_version(), version)
+
+    def test_rollback_discards_side_effects(self):
+        """Test a rolled back approval leaves no job and keeps the cache"""
+        version = page_cache.get_version()
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            try:
+                with transaction.atomic():
+                    self.article.approved = True
+                    self.article.save()
+                    raise RuntimeError('Rolled back')
+            except RuntimeError:
+                pass
+        self.assertEqual(callbacks, [])
+        self.assertFalse(DistributionJob.objects.exists())
+        self.assertEqual(page_cache.get_version(), version)
+
+    def test_approving_twice_queues_one_job(self):
+        """Test a repeated approval adds no second outbox row"""
+        self.client.post(self.url)
+        self.client.post(self.url)
+        self.assertEqual(DistributionJob.objects.count(), 1)
+        self.article.refresh_from_db()
+        self.assertTrue(self.article.approved)
+
+    def test_workers_are_woken(self):
+        """Test a waiting worker returns as soon as a job is committed"""
+        self.assertFalse(wait_for_jobs(0.05, interval=0.01))
+        threading.Timer(0.05, wake_workers).start()
+        started = time.monotonic()
+        self.assertTrue(wait_for_jobs(5, interval=0.01))
+        self.assertLess(time.monotonic() - started, 1)
+
+
+class TestBulkApproval(APITestCase):
+    """Test approving content in bulk and the digest email it sends"""
+
+    def setUp(self):
+        cache.clear()
+        self.url = reverse('bulk_approval')
+        self.editor = CustomUser.objects.create_user(
+            username='bulk_editor', password='password123', role='editor'
+        )
+        self.client.force_authenticate(user=self.editor)
+        self.first = CustomUser.objects.create_user(
+            username='bulk_first', password='password123',
+            role='journalist'
+        )
+        self.second = CustomUser.objects.create_user(
+            username='bulk_second', password='password123',
+            role='journalist'
+        )
+        self.publisher = Publisher.objects.create(name='Bulk Publisher')
+        self.articles = [
+            Article.objects.create(
+                title='Bulk Article One', content='One', author=self.first
+            ),
+            Article.objects.create(
+                title='Bulk Article Two', content='Two', author=self.second,
+                publisher=self.publisher
+            ),
+        ]
+        self.newsletter = Newsletter.objects.create(
+            title='Bulk Newsletter', content='Letter', author=self.first
+        )
+        self.readers = {}
+        for name, journalists, publishers in (
+            ('first_follower', [self.first], []),
+            ('publisher_subscriber', [], [self.publisher]),
+            ('follows_both', [self.first, self.second], []),
+            ('follows_nobody', [], []),
+        ):
+            reader = CustomUser.objects.create_user(
+                username=name, email=f'{name}@test.com',
+                password='password123', role='reader'
+            )
+            reader.subscriptions_journalists.set(journalists)
+            reader.subscriptions_publishers.set(publishers)
+            self.readers[name] = reader
+        mail.outbox = []
+
+    def approve(self, articles=(), newsletters=()):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(self.url, {
+                'articles': [article.pk for article in articles],
+                'newsletters': [letter.pk for letter in newsletters],
+            }, format='json')
+
+    def test_leftover_search_documents_are_replaced(self):
+        """Test content indexed before is re-indexed instead of failing"""
+        SearchDocument.objects.create(
+            content_type='article', content_id=self.articles[0].pk,
+            title='Stale title', body='Stale',
+            created_at=self.articles[0].created_at
+        )
+        response = self.approve(self.articles)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            sorted(SearchDocument.objects.values_list('title', flat=True)),
+            ['Bulk Article One', 'Bulk Article Two']
+        )
+
+    def test_subscribers_get_one_digest(self):
+        """Test each subscriber gets one email with their own items"""
+        response = self.approve(self.articles, [self.newsletter])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['approved'], {
+            'articles': [article.pk for article in self.articles],
+            'newsletters': [self.newsletter.pk],
+        })
+        self.assertEqual(
+            Article.objects.filter(approved=True).count(), 2
+        )
+        job = DistributionJob.objects.get()
+        self.assertEqual(job.content_type, 'digest')
+        self.assertEqual(SearchDocument.objects.count(), 3)
+
+        run_pending_jobs()
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.sent_recipients), ('done', 3))
+        messages = {message.to[0]: message for message in mail.outbox}
+        self.assertEqual(len(mail.outbox), 3)
+
+        both = messages['follows_both@test.com']
+        self.assertEqual(
+            both.subject, '3 new stories from your subscriptions'
+        )
+        for title in ('Bulk Article One', 'Bulk Article Two',
+                      'Bulk Newsletter'):
+            self.assertIn(title, both.body)
+
+        first = messages['first_follower@test.com'].body
+        self.assertIn('Bulk Newsletter', first)
+        self.assertNotIn('Bulk Article Two', first)
+
+        single = messages['publisher_subscriber@test.com']
+        self.assertEqual(single.subject, 'New Article from bulk_second!')
+        self.assertIn('Bulk Article Two', single.body)
+        self.assertNotIn('Bulk Article One', single.body)
+
+        self.assertTrue(FeedEntry.objects.filter(
+            reader=self.readers['follows_both'], content_type='newsletter'
+        ).exists())
+
+    def test_feeds_fill_when_the_worker_runs(self):
+        """Test approved content reaches feeds once the worker runs"""
+        reader = self.readers['follows_both']
+        self.approve(self.articles, [self.newsletter])
+        self.assertEqual(list(feed_queryset(reader, Article)), [])
+        self.assertEqual(list(feed_queryset(reader, Newsletter)), [])
+
+        run_pending_jobs()
+        self.assertEqual(
+            set(feed_queryset(reader, Article)), set(self.articles)
+        )
+        self.assertEqual(
+            list(feed_queryset(reader, Newsletter)), [self.newsletter]
+        )
+        self.assertEqual(
+            list(feed_queryset(self.readers['follows_nobody'], Article)), []
+        )
+
+    def test_digest_unsubscribe_link(self):
+        """Test the digest link unsubscribes from every listed sender"""
+        self.approve(self.articles)
+        run_pending_jobs()
+        message, = [
+            message for message in mail.outbox
+            if message.to == ['follows_both@test.com']
+        ]
+        url = message.body.split('Unsubscribe: ')[1].split()[0]
+        response = self.client.get(url)
+        self.assertContains(response, 'bulk_first and bulk_second?')
+        self.client.post(url)
+        self.assertFalse(
+            self.readers['follows_both'].subscriptions_journalists.exists()
+        )
+
+    def test_already_approved_content_is_skipped(self):
+        """Test only pending items are approved and distributed"""
+        self.articles[0].approved = True
+        self.articles[0].save()
+        DistributionJob.objects.all().delete()
+
+        response = self.approve(self.articles)
+        self.assertEqual(
+            response.data['approved']['articles'], [self.articles[1].pk]
+        )
+        # A single new item is distributed as usual
+        job = DistributionJob.objects.get()
+        self.assertEqual(
+            (job.content_type, job.object_id),
+            ('article', self.articles[1].pk)
+        )
+
+    def test_query_count_independent_of_batch_size(self):
+        """Test approving more items runs no more queries"""
+        more = [
+            Article.objects.create(
+                title=f'Extra {i}', content='Extra', author=self.second
+            )
+            for i in range(4)
+        ]
+        letters = [
+            Newsletter.objects.create(
+                title=f'Extra Letter {i}', content='Extra', author=self.second
+            )
+            for i in range(3)
+        ]
+        with CaptureQueriesContext(connection) as small:
+            self.approve(self.articles[:1], [self.newsletter])
+        with CaptureQueriesContext(connection) as large:
+            self.approve(self.articles[1:] + more, letters)
+        self.assertEqual(len(small), len(large))
+
+    def test_invalid_requests(self):
+        """Test permissions and request validation"""
+        self.assertEqual(
+            self.client.post(self.url, {}, format='json').status_code, 400
+        )
+        response = self.client.post(
+            self.url, {'articles': 'all'}, format='json'
+        )
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post(
+            self.url, {'articles': [True]}, format='json'
+        )
+        self.assertEqual(response.status_code, 400)
+
+        self.client.force_authenticate(user=self.readers['follows_nobody'])
+        response = self.approve(self.articles)
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(Article.objects.filter(approved=True).exists())
+
+
+class TestAPITokens(APITestCase):
+    """Test issuing, using and revoking API tokens"""
+
+    def setUp(self):
+        cache.clear()
+        self.reader = CustomUser.objects.create_user(
+            username='token_reader', password='password123', role='reader'
+        )
+        self.url = reverse('subscribed_articles')
+
+    def issue(self, password='password123'):
+        return self.client.post(reverse('api_token'), {
+            'username': 'token_reader', 'password': password
+        }, format='json')
+
+    def test_issue_and_use_token(self):
+        """Test a token authenticates later calls from the cache"""
+        self.assertEqual(self.issue('wrong').status_code, 400)
+        response = self.issue()
+        self.assertEqual(response.status_code, 200)
+        key = response.data['token']
+        self.assertEqual(self.issue().data['token'], key)
+
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {key}')
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+        self.assertIsNotNone(cache.get(make_token_key(key)))
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.get(self.url).status_code, 200)
+        for query in queries:
+            self.assertNotIn('authtoken_token', query['sql'])
+            self.assertNotIn('news_customuser', query['sql'])
+
+        self.client.credentials(HTTP_AUTHORIZATION='Token not-a-token')
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+    def test_revoke_token(self):
+        """Test a revoked token is refused straight away"""
+        key = self.issue().data['token']
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {key}')
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('api_token_revoke'))
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+    def test_deactivated_user_is_refused(self):
+        """Test saving the user drops them from the cache"""
+        key = self.issue().data['token']
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {key}')
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.reader.is_active = False
+            self.reader.save()
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+    def test_basic_authentication_still_works(self):
+        """Test existing Basic authenticated clients keep working"""
+        self.client.credentials(HTTP_AUTHORIZATION='Basic ' + base64.b64encode(
+            b'token_reader:password123'
+        ).decode())
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+
+    def test_benchmark_command(self):
+        """Test the benchmark reports both authentication methods"""
+        out = StringIO()
+        call_command('benchmark_api_auth', '--requests', '2', stdout=out)
+        output = out.getvalue()
+        self.assertIn('Basic:', output)
+        self.assertIn('Token:', output)
+
+
+class TestLogin(TestCase):
+    """Test logins hash the password once and upgrade old hashes"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = CustomUser.objects.create_user(
+            username='login_reader', password='password123', role='reader'
+        )
+
+    def log_in(self, password='password123'):
+        return self.client.post(reverse('login'), {
+            'username': 'login_reader', 'password': password
+        })
+
+    def test_password_hashed_once_per_login(self):
+        """Test a login attempt verifies the password a single time"""
+        verify = PBKDF2PasswordHasher.verify
+        with patch.object(
+            PBKDF2PasswordHasher, 'verify', autospec=True, side_effect=verify
+        ) as mocked:
+            response = self.log_in()
+            self.assertRedirects(
+                response, reverse('dashboard'), fetch_redirect_response=False
+            )
+            self.assertEqual(mocked.call_count, 1)
+
+            response = self.log_in('wrong-password')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(mocked.call_count, 2)
+
+    def test_old_hashes_are_upgraded_on_login(self):
+        """Test weaker or outdated hashes are replaced at login"""
+        with self.settings(NEWS_PBKDF2_ITERATIONS=1000):
+            self.user.set_password('password123')
+            self.user.save()
+        self.assertIn('$1000$', self.user.password)
+
+        self.log_in()
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith(
+            f'pbkdf2_sha256${PBKDF2PasswordHasher().iterations}$'
+        ))
+
+        self.user.password = make_password(
+            'password123', hasher='pbkdf2_sha1'
+        )
+        self.user.save()
+        self.client.logout()
+        self.log_in()
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith('pbkdf2_sha256$'))
+
+    def test_hasher_work_factor_is_configurable(self):
+        """Test the iteration count follows NEWS_PBKDF2_ITERATIONS"""
+        with self.settings(NEWS_PBKDF2_ITERATIONS=1234):
+            self.assertIn('$1234$', make_password('password123'))
+
+    def test_repeated_logins_hash_once_each(self):
+        """Test every login, even of an unknown user, costs one hash"""
+        logins = 5
+        encode = PBKDF2PasswordHasher.encode
+        with patch(
+            'django.contrib.auth.base_user.check_password',
+            wraps=base_user.check_password
+        ) as check, patch.object(
+            PBKDF2PasswordHasher, 'encode', autospec=True, side_effect=encode
+        ) as hashes:
+            for _ in range(logins):
+                self.client.logout()
+                self.assertEqual(self.log_in().status_code, 302)
+            self.assertEqual(check.call_count, logins)
+            self.assertEqual(hashes.call_count, logins)
+
+            # Unknown users are hashed against a dummy password instead
+            response = self.client.post(reverse('login'), {
+                'username': 'nobody', 'password': 'password123'
+            })
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(hashes.call_count, logins + 1)
+
+
+class TestSessionCache(TestCase):
+    """Test signed in pages load the session, user and profile from cache"""
+
+    def setUp(self):
+        cache.clear()
+        self.reader = CustomUser.objects.create_user(
+            username='session_reader', password='password123', role='reader'
+        )
+        self.journalist = CustomUser.objects.create_user(
+            username='session_journalist', password='password123',
+            role='journalist'
+        )
+        self.publisher = Publisher.objects.create(name='Session Publisher')
+        self.reader.subscriptions_journalists.add(self.journalist)
+        self.client.login(username='session_reader', password='password123')
+
+    def auth_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        # Session, user and subscription lookups; not the journalist list
+        lookups = (
+            'FROM "django_session"',
+            'WHERE "news_customuser"."id" =',
+            '"news_customuser_subscriptions_'
+        )
+        return response, [
+            query['sql'] for query in queries
+            if any(lookup in query['sql'] for lookup in lookups)
+        ]
+
+    def test_warm_pages_need_no_auth_queries(self):
+        """Test the dashboard and home page skip session and user queries"""
+        for url in (reverse('dashboard'), reverse('home')):
+            self.client.get(url)
+            response, queries = self.auth_queries(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(queries, [])
+
+    def test_cache_holds_no_password_hash(self):
+        """Test cached users leave out their password hash"""
+        self.client.get(reverse('dashboard'))
+        cached = cache.get(USER_KEY.format(self.reader.pk))
+        self.assertNotIn(self.reader.password.encode(), pickle.dumps(cached))
+
+        # Saving the cached copy keeps the password, which loads on demand
+        cached.first_name = 'Cached'
+        cached.save()
+        self.reader.refresh_from_db()
+        self.assertEqual(self.reader.first_name, 'Cached')
+        self.assertTrue(self.reader.check_password('password123'))
+        self.assertEqual(cached.password, self.reader.password)
+
+    def test_password_change_ends_other_sessions(self):
+        """Test sessions of a cached user end when the password changes"""
+        response = self.client.get(reverse('dashboard'))
+        self.assertEqual(response.status_code, 200)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.reader.set_password('new-password')
+            self.reader.save()
+        response = self.client.get(reverse('dashboard'))
+        self.assertEqual(response.status_code, 302)
+        self.assertIn(reverse('login'), response['Location'])
+
+    def test_subscribing_refreshes_profile(self):
+        """Test a subscription change is seen on the next request"""
+        self.client.get(reverse('home'))
+        self.assertEqual(
+            get_profile(self.reader)['journalist_ids'], {self.journalist.pk}
+        )
+        url = reverse('subscribe', args=['publisher', self.publisher.pk])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(url)
+        self.assertEqual(
+            get_profile(self.reader)['publisher_ids'], {self.publisher.pk}
+        )
+        response = self.client.get(reverse('home'))
+        self.assertContains(response, 'Unsubscribe', count=2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(url)
+        self.assertEqual(get_profile(self.reader)['publisher_ids'], set())
+
+    def test_role_change_refreshes_user_and_profile(self):
+        """Test a role change reaches cached users and snapshots"""
+        self.client.get(reverse('dashboard'))
+        with self.captureOnCommitCallbacks(execute=True):
+            reader = CustomUser.objects.get(pk=self.reader.pk)
+            reader.role = 'journalist'
+            reader.save()
+        response = self.client.get(reverse('dashboard'))
+        self.assertRedirects(
+            response, reverse('journalist_dashboard'),
+            fetch_redirect_response=False
+        )
+        profile = get_profile(reader)
+        self.assertEqual(profile['role'], 'journalist')
+        self.assertEqual(profile['journalist_ids'], set())
+
+    def test_signed_cookie_sessions(self):
+        """Test the signed cookie session mode needs no session table"""
+        with self.settings(
+            SESSION_ENGINE='django.contrib.sessions.backends.signed_cookies'
+        ):
+            self.client.login(
+                username='session_reader', password='password123'
+            )
+            self.client.get(reverse('dashboard'))
+            response, queries = self.auth_queries(reverse('dashboard'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(queries, [])
+
+
+class TestDatabaseConnections(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        connections.reset_stats()
+
+    def test_persistent_connections_with_health_checks(self):
+        """Test connections are kept between requests and checked first"""
+        self.assertGreater(connection.settings_dict['CONN_MAX_AGE'], 0)
+        self.assertTrue(connection.settings_dict['CONN_HEALTH_CHECKS'])
+
+    @override_settings(NEWS_STATS_COUNTERS=True)
+    def test_counters(self):
+        """Test opened connections and finished requests are counted"""
+        connection_created.send(
+            sender=connection.__class__, connection=connection
+        )
+        self.client.get(reverse('home'))
+        self.client.get(reverse('home'))
+        self.assertEqual(
+            connections.get_stats(),
+            {'opened': 1, 'requests': 2, 'cycles': 0, 'reused': 1}
+        )
+
+        out = StringIO()
+        call_command('db_stats', '--reset', stdout=out)
+        self.assertIn(
+            '1 connections opened for 2 requests and 0 worker cycles '
+            '(50% reused a connection)', out.getvalue()
+        )
+        self.assertEqual(connections.get_stats()['requests'], 0)
+
+    def test_counters_need_shared_cache(self):
+        """Test requests don't count into a cache local to their process"""
+        self.assertFalse(counters.is_enabled())
+        with patch('news.counters.cache.incr') as incr:
+            self.client.get(reverse('home'))
+        incr.assert_not_called()
+        self.assertEqual(connections.get_stats()['requests'], 0)
+
+        for command in ('db_stats', 'cache_stats'):
+            err = StringIO()
+            call_command(command, stdout=StringIO(), stderr=err)
+            self.assertIn('Counters are off', err.getvalue())
+
+        with self.settings(CACHES={'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': '/tmp/news-counters',
+        }}):
+            self.assertTrue(counters.is_enabled())
+
+    @override_settings(NEWS_STATS_COUNTERS=True)
+    def test_workers_recycle_connections(self):
+        """Test each worker loop closes obsolete or broken connections"""
+        for command in ('run_distribution', 'run_social_posts'):
+            with patch('news.connections.close_old_connections') as close:
+                call_command(command, '--once', stdout=StringIO())
+            close.assert_called_once_with()
+        self.assertEqual(connections.get_stats()['cycles'], 2)
+
+    def test_benchmark_command(self):
+        """Test the benchmark times both views in both modes"""
+        out = StringIO()
+        call_command('benchmark_connections', '--requests', '2', stdout=out)
+        output = out.getvalue()
+        for line in (
+            'home (per request)', 'home (persistent)',
+            'subscribed_articles (per request)',
+            'subscribed_articles (persistent)',
+        ):
+            self.assertIn(line, output)
+
+
+@override_settings(NEWS_DB_REPLICAS=['replica1'])
+class TestReadReplicas(TestCase):
+    """Test read-only pages read from replicas unless the client just wrote"""
+    databases = {'default', 'replica1'}
+
+    def setUp(self):
+        cache.clear()
+        self.journalist = CustomUser.objects.create_user(
+            username='replica_journalist', password='password123',
+            role='journalist'
+        )
+        self.article = Article.objects.create(
+            title='Primary Article', content='Content',
+            author=self.journalist, approved=True
+        )
+        self.url = reverse('article_detail', args=[self.article.pk])
+        # Stand in for replication, with a title telling the copies apart
+        replica_article = copy.copy(self.article)
+        replica_article.title = 'Replica Article'
+        for obj in (self.journalist, replica_article):
+            type(obj).objects.using('replica1').bulk_create([copy.copy(obj)])
+
+    def get(self, url):
+        """Return the response and the queries run on each database"""
+        with CaptureQueriesContext(db_connections['replica1']) as replica, \
+                CaptureQueriesContext(connection) as primary:
+            response = self.client.get(url)
+        return response, replica.captured_queries, primary.captured_queries
+
+    def content_queries(self, queries):
+        return [q for q in queries if '"news_article"' in q['sql']]
+
+    def test_router(self):
+        """Test only reads during a read-only page go to a replica"""
+        router = replicas.ReplicaRouter()
+        self.assertEqual(router.db_for_read(Article), 'default')
+        replicas._state.replica = 'replica1'
+        try:
+            self.assertEqual(router.db_for_read(Article), 'replica1')
+            self.assertEqual(router.db_for_write(Article), 'default')
+            with replicas.use_primary():
+                self.assertEqual(router.db_for_read(Article), 'default')
+            self.assertEqual(router.db_for_read(Article), 'replica1')
+        finally:
+            replicas._state.replica = None
+        self.assertFalse(router.allow_migrate('replica1', 'news'))
+        self.assertTrue(router.allow_migrate('default', 'news'))
+
+    def test_read_only_views_use_replica(self):
+        """Test listed views read from a replica and others don't"""
+        with patch(
+            'news.replicas.pick_replica', wraps=replicas.pick_replica
+        ) as pick:
+            response, replica, primary = self.get(self.url)
+        # One replica is picked for the whole page, not one per query
+        self.assertEqual(pick.call_count, 1)
+        self.assertContains(response, 'Replica Article')
+        self.assertTrue(self.content_queries(replica))
+        self.assertEqual(self.content_queries(primary), [])
+
+        response, replica, primary = self.get(reverse('search') + '?q=x')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(replica, [])
+
+        with self.settings(NEWS_REPLICA_VIEWS=['search']):
+            response, replica, primary = self.get(self.url)
+        self.assertContains(response, 'Primary Article')
+        self.assertEqual(replica, [])
+
+    def test_writing_pins_browser_to_primary(self):
+        """Test a browser reads from the primary for a while after a write"""
+        with CaptureQueriesContext(db_connections['replica1']) as replica:
+            response = self.client.post(reverse('login'), {
+                'username': 'replica_journalist', 'password': 'password123'
+            })
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(replica.captured_queries, [])
+        self.assertEqual(response.cookies['news_primary']['max-age'], 10)
+
+        response, replica, primary = self.get(self.url)
+        self.assertContains(response, 'Primary Article')
+        self.assertEqual(replica, [])
+        self.assertTrue(self.content_queries(primary))
+
+        del self.client.cookies['news_primary']
+        response, replica, primary = self.get(self.url)
+        self.assertContains(response, 'Replica Article')
+        self.assertTrue(self.content_queries(replica))
+
+    def test_writing_pins_api_client_to_primary(self):
+        """Test API clients are pinned by their credentials"""
+        factory = RequestFactory()
+        request = factory.post('/', HTTP_AUTHORIZATION='Token abc')
+        replicas.pin(request, HttpResponse())
+        self.assertTrue(replicas.is_pinned(
+            factory.get('/', HTTP_AUTHORIZATION='Token abc')
+        ))
+        self.assertFalse(replicas.is_pinned(
+            factory.get('/', HTTP_AUTHORIZATION='Token xyz')
+        ))
+        self.assertNotIn('abc', replicas.make_pin_key('Token abc'))
+
+    def test_no_pinning_without_replicas(self):
+        """Test nothing changes when no replicas are configured"""
+        with self.settings(NEWS_DB_REPLICAS=[]):
+            response = self.client.post(reverse('login'), {
+                'username': 'replica_journalist', 'password': 'password123'
+            })
+        self.assertNotIn('news_primary', response.cookies)
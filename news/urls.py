@@ -4,7 +4,9 @@ from .views import (
     logout_view, article_detail, dashboard, subscribe, create_article,
     editor_dashboard, journalist_dashboard, create_newsletter,
     NewsletterApprovalView, editor_content_management, SubscribedNewslettersView,
-    edit_article, delete_article, edit_newsletter, delete_newsletter
+    edit_article, delete_article, edit_newsletter, delete_newsletter,
+    ContentExportView, SearchView, search, unsubscribe, BulkApprovalView,
+    APITokenView, RevokeAPITokenView
 )
 
 urlpatterns = [
@@ -23,13 +25,22 @@ urlpatterns = [
     path('api/articles/subscribed/', SubscribedArticlesView.as_view(), name='subscribed_articles'),
     path('api/articles/approve/<int:article_id>/', ArticleApprovalView.as_view(), name='article_approval'),
     path('api/newsletters/approve/<int:newsletter_id>/', NewsletterApprovalView.as_view(), name='newsletter_approval'),
+    path('api/token/', APITokenView.as_view(), name='api_token'),
+    path('api/token/revoke/', RevokeAPITokenView.as_view(), name='api_token_revoke'),
+    path('api/approve/bulk/', BulkApprovalView.as_view(), name='bulk_approval'),
     path('api/newsletters/subscribed/', SubscribedNewslettersView.as_view(), name='subscribed_newsletters'),
+    path('api/export/', ContentExportView.as_view(), name='content_export'),
+    path('api/search/', SearchView.as_view(), name='api_search'),
+
+    # Search
+    path('search/', search, name='search'),
 
     # Article details
     path('article/<int:article_id>/', article_detail, name='article_detail'),
 
     # Subscription functionality
     path('subscribe/<str:subscription_type>/<int:pk>/', subscribe, name='subscribe'),
+    path('unsubscribe/<str:token>/', unsubscribe, name='unsubscribe'),
 
     # Journalist functions
     path('articles/create/', create_article, name='create_article'),
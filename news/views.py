@@ -1,44 +1,136 @@
 from django.shortcuts import render, redirect, get_object_or_404
-from django.contrib.auth import login, authenticate, logout
+from django.contrib.auth import login, logout
 from django.contrib.auth.forms import AuthenticationForm
+from django.conf import settings
+from django.core import signing
 from django.contrib.auth.decorators import login_required, user_passes_test
+from django.core.paginator import Paginator
+from rest_framework.authtoken.models import Token
+from rest_framework.authtoken.views import ObtainAuthToken
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from django.db import transaction
-
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.template.loader import render_to_string
+from django.utils.decorators import method_decorator
+from django.utils.safestring import mark_safe
+from django.views.decorators.http import condition
+
+from . import page_cache
+from .conditional import (
+    article_etag, article_last_modified, feed_etag, home_etag
+)
+from .distribution import approve_many
+from .emails import read_unsubscribe_token
+from .exporter import EXPORT_MODELS, gzip_stream, iter_ndjson
+from .feeds import feed_entries, feed_page_content, feed_queryset
 from .forms import CustomUserCreationForm, ArticleForm, NewsletterForm
 from .models import Article, CustomUser, Publisher, Newsletter
-from .serializers import ArticleSerializer, NewsletterSerializer
+from .pagination import FeedCursorPagination, SearchPagination
+from .profiles import get_profile
+from .search import SearchResults
+from .serializers import (
+    SUMMARY_FIELDS, ArticleSerializer, NewsletterSerializer,
+    SearchResultSerializer, serialize_content_values
+)
 
 
-def home(request):
-    """Renders the home page with a list of approved articles and newsletters.
+def build_home_context(user):
+    """Builds the home page context with a fixed number of queries.
     
-    Displays publicly available content to all users including approved articles,
-    newsletters, publishers, and journalists.
+    Articles and newsletters are fetched with their authors and publishers
+    joined in, and the reader's subscriptions come from their cached
+    profile snapshot, so each publisher and journalist can be flagged with
+    ``is_subscribed`` without a query per row.
     
-    :param request: HTTP request object
-    :returns: Rendered home page with content context
-    :rtype: HttpResponse
+    :param user: The requesting user (may be anonymous)
+    :returns: Context for the home page template
+    :rtype: dict
     """
     approved_articles = (
         Article.objects.filter(approved=True)
+        .select_related('author', 'publisher')
         .order_by('-created_at')
     )
     approved_newsletters = (
         Newsletter.objects.filter(approved=True)
+        .select_related('author', 'publisher')
         .order_by('-created_at')
     )
-    publishers = Publisher.objects.all()
-    journalists = CustomUser.objects.filter(role='journalist')
-    context = {
+    if not user.is_authenticated:
+        # Anonymous visitors only see the summary of each item
+        approved_articles = approved_articles.defer('content')
+        approved_newsletters = approved_newsletters.defer('content')
+    publishers = list(Publisher.objects.all())
+    journalists = list(CustomUser.objects.filter(role='journalist'))
+
+    subscribed_publisher_ids = frozenset()
+    subscribed_journalist_ids = frozenset()
+    if user.is_authenticated and user.role.lower() == 'reader':
+        profile = get_profile(user)
+        subscribed_publisher_ids = profile['publisher_ids']
+        subscribed_journalist_ids = profile['journalist_ids']
+    for publisher in publishers:
+        publisher.is_subscribed = publisher.pk in subscribed_publisher_ids
+    for journalist in journalists:
+        journalist.is_subscribed = journalist.pk in subscribed_journalist_ids
+
+    return {
         'articles': approved_articles,
         'newsletters': approved_newsletters,
         'publishers': publishers,
         'journalists': journalists,
     }
-    return render(request, 'news/home.html', context)
+
+
+@condition(etag_func=home_etag)
+def home(request):
+    """Renders the home page with a list of approved articles and newsletters.
+    
+    Displays publicly available content to all users including approved articles,
+    newsletters, publishers, and journalists. The anonymous page is served
+    whole from the cache; for signed in users only the shared article and
+    newsletter listing is cached, as the rest of the page is per user.
+    Clients revalidating an unchanged page get a 304 response.
+    
+    :param request: HTTP request object
+    :returns: Rendered home page with content context
+    :rtype: HttpResponse
+    """
+    if request.user.is_authenticated:
+        return render_home(request, 'authenticated')
+
+    content, hit = page_cache.get_or_render(
+        'page',
+        'anonymous',
+        lambda: render_home(request, 'anonymous').content.decode()
+    )
+    response = HttpResponse(content)
+    response['X-Cache'] = 'HIT' if hit else 'MISS'
+    return response
+
+
+def render_home(request, variant):
+    """Renders the home page, using the cached content listing if available.
+    
+    :param request: HTTP request object
+    :param variant: Audience variant, 'anonymous' or 'authenticated'
+    :returns: Rendered home page
+    :rtype: HttpResponse
+    """
+    context = build_home_context(request.user)
+    content_html, hit = page_cache.get_or_render(
+        'fragment',
+        variant,
+        lambda: render_to_string(
+            'news/home_content.html', context, request=request
+        )
+    )
+    context['content_html'] = mark_safe(content_html)
+    response = render(request, 'news/home.html', context)
+    response['X-Cache'] = 'HIT' if hit else 'MISS'
+    return response
 
 
 def register(request):
@@ -72,7 +164,8 @@ def login_view(request):
     """Handles user login and redirects to the appropriate dashboard.
     
     Authenticates user credentials and redirects to role-specific dashboard
-    upon successful login.
+    upon successful login. The form authenticates the user, so the password
+    is hashed once per login attempt.
     
     :param request: HTTP request object
     :returns: Login form or redirect to appropriate dashboard
@@ -81,17 +174,14 @@ def login_view(request):
     if request.method == 'POST':
         form = AuthenticationForm(request, data=request.POST)
         if form.is_valid():
-            username = form.cleaned_data.get('username')
-            password = form.cleaned_data.get('password')
-            user = authenticate(username=username, password=password)
-            if user is not None:
-                login(request, user)
-                if user.role.lower() == 'editor':
-                    return redirect('editor_dashboard')
-                elif user.role.lower() == 'journalist':
-                    return redirect('journalist_dashboard')
-                else:
-                    return redirect('dashboard')
+            user = form.get_user()
+            login(request, user)
+            if user.role.lower() == 'editor':
+                return redirect('editor_dashboard')
+            elif user.role.lower() == 'journalist':
+                return redirect('journalist_dashboard')
+            else:
+                return redirect('dashboard')
     else:
         form = AuthenticationForm()
     return render(request, 'news/login.html', {'form': form})
@@ -121,36 +211,10 @@ def dashboard(request):
     """
     user = request.user
     if user.role.lower() == 'reader':
-        subscribed_publishers = user.subscriptions_publishers.all()
-        subscribed_journalists = user.subscriptions_journalists.all()
-
-        publisher_articles = Article.objects.filter(
-            approved=True,
-            publisher__in=subscribed_publishers
-        ).order_by('-created_at')
-
-        journalist_articles = Article.objects.filter(
-            approved=True,
-            author__in=subscribed_journalists
-        ).order_by('-created_at')
-
-        subscribed_articles = (
-            publisher_articles | journalist_articles
-        ).distinct()
-
-        publisher_newsletters = Newsletter.objects.filter(
-            approved=True,
-            publisher__in=subscribed_publishers
-        ).order_by('-created_at')
-
-        journalist_newsletters = Newsletter.objects.filter(
-            approved=True,
-            author__in=subscribed_journalists
-        ).order_by('-created_at')
-
+        subscribed_articles = feed_queryset(user, Article).defer('content')
         subscribed_newsletters = (
-            publisher_newsletters | journalist_newsletters
-        ).distinct()
+            feed_queryset(user, Newsletter).defer('content')
+        )
 
         context = {
             'articles': subscribed_articles,
@@ -166,23 +230,47 @@ def dashboard(request):
             return redirect('home')
 
 
+@condition(etag_func=article_etag, last_modified_func=article_last_modified)
 def article_detail(request, article_id):
     """Renders the detail page for a single article.
     
+    Clients revalidating an unchanged article get a 304 response.
+    
     :param request: HTTP request object
     :param article_id: ID of the article to display
     :returns: Article detail page
     :rtype: HttpResponse
     """
-    article = get_object_or_404(Article, pk=article_id)
+    article = get_object_or_404(
+        Article.objects.select_related('author', 'publisher'), pk=article_id
+    )
     return render(request, 'news/article_detail.html', {'article': article})
 
 
+def search(request):
+    """Renders ranked search results for approved articles and newsletters.
+    
+    :param request: HTTP request object with the query in ``q``
+    :returns: Search results page
+    :rtype: HttpResponse
+    """
+    query = request.GET.get('q', '').strip()
+    paginator = Paginator(
+        SearchResults(query), getattr(settings, 'NEWS_API_PAGE_SIZE', 20)
+    )
+    page_obj = paginator.get_page(request.GET.get('page'))
+    return render(
+        request, 'news/search.html', {'query': query, 'page_obj': page_obj}
+    )
+
+
 @login_required
 def subscribe(request, subscription_type, pk):
     """Handles the subscription/unsubscription logic for readers.
     
-    Toggles subscription status for publishers or journalists.
+    Toggles subscription status for publishers or journalists. Whether the
+    reader already subscribes is read from their cached profile snapshot,
+    which the change then invalidates.
     
     :param request: HTTP request object
     :param subscription_type: Type of subscription ('publisher' or 'journalist')
@@ -192,27 +280,63 @@ def subscribe(request, subscription_type, pk):
     """
     if request.method == 'POST':
         if request.user.role.lower() == 'reader':
+            profile = get_profile(request.user)
             if subscription_type == 'publisher':
                 publisher = get_object_or_404(Publisher, pk=pk)
-                if (
-                    request.user.subscriptions_publishers.filter(pk=pk).exists()
-                ):
+                if publisher.pk in profile['publisher_ids']:
                     request.user.subscriptions_publishers.remove(publisher)
                 else:
                     request.user.subscriptions_publishers.add(publisher)
             elif subscription_type == 'journalist':
                 journalist = get_object_or_404(CustomUser, pk=pk)
-                if (
-                    request.user.subscriptions_journalists
-                    .filter(pk=pk)
-                    .exists()
-                ):
+                if journalist.pk in profile['journalist_ids']:
                     request.user.subscriptions_journalists.remove(journalist)
                 else:
                     request.user.subscriptions_journalists.add(journalist)
     return redirect('home')
 
 
+def unsubscribe(request, token):
+    """Unsubscribes an email recipient from the senders of a notification.
+    
+    Every notification email links here with a signed token naming the
+    recipient and the journalists and publishers of the content it
+    announced, so no login is needed. GET asks for confirmation and POST
+    removes the subscriptions of every account using the recipient's
+    address, since they all received the one email.
+    
+    :param request: HTTP request object
+    :param token: Signed token from the notification email
+    :returns: Confirmation page
+    :rtype: HttpResponse
+    """
+    try:
+        recipient_id, journalist_ids, publisher_ids = (
+            read_unsubscribe_token(token)
+        )
+    except signing.BadSignature:
+        raise Http404('Invalid unsubscribe link.')
+    recipient = get_object_or_404(CustomUser, pk=recipient_id)
+    journalists = list(CustomUser.objects.filter(pk__in=journalist_ids))
+    publishers = list(Publisher.objects.filter(pk__in=publisher_ids))
+
+    unsubscribed = False
+    if request.method == 'POST':
+        for reader in CustomUser.objects.filter(email=recipient.email):
+            if journalists:
+                reader.subscriptions_journalists.remove(*journalists)
+            if publishers:
+                reader.subscriptions_publishers.remove(*publishers)
+        unsubscribed = True
+
+    context = {
+        'senders': [journalist.username for journalist in journalists]
+        + [publisher.name for publisher in publishers],
+        'unsubscribed': unsubscribed,
+    }
+    return render(request, 'news/unsubscribe.html', context)
+
+
 @login_required
 @user_passes_test(lambda u: u.role == 'journalist')
 def create_article(request):
@@ -246,10 +370,12 @@ def journalist_dashboard(request):
     """
     articles = (
         Article.objects.filter(author=request.user)
+        .defer('content')
         .order_by('-created_at')
     )
     newsletters = (
         Newsletter.objects.filter(author=request.user)
+        .defer('content')
         .order_by('-created_at')
     )
     context = {
@@ -408,18 +534,28 @@ def delete_newsletter(request, pk):
 def editor_dashboard(request):
     """Renders the editor's dashboard with unapproved articles and newsletters.
     
+    Each list is paged, newest first, with ``articles_page`` and
+    ``newsletters_page``.
+    
     :param request: HTTP request object
     :returns: Editor dashboard with pending content for approval
     :rtype: HttpResponse
     """
-    unapproved_articles = (
-        Article.objects.filter(approved=False)
-        .order_by('-created_at')
-    )
-    unapproved_newsletters = (
-        Newsletter.objects.filter(approved=False)
-        .order_by('-created_at')
-    )
+    page_size = getattr(settings, 'NEWS_API_PAGE_SIZE', 20)
+    unapproved_articles = Paginator(
+        Article.objects.pending()
+        .select_related('author')
+        .defer('content')
+        .order_by('-created_at', '-id'),
+        page_size
+    ).get_page(request.GET.get('articles_page'))
+    unapproved_newsletters = Paginator(
+        Newsletter.objects.pending()
+        .select_related('author')
+        .defer('content')
+        .order_by('-created_at', '-id'),
+        page_size
+    ).get_page(request.GET.get('newsletters_page'))
     context = {
         'articles': unapproved_articles,
         'newsletters': unapproved_newsletters,
@@ -436,9 +572,14 @@ def editor_content_management(request):
     :returns: Editor content management page with approved content
     :rtype: HttpResponse
     """
-    articles = Article.objects.filter(approved=True).order_by('-created_at')
+    articles = (
+        Article.objects.filter(approved=True)
+        .defer('content')
+        .order_by('-created_at')
+    )
     newsletters = (
         Newsletter.objects.filter(approved=True)
+        .defer('content')
         .order_by('-created_at')
     )
     context = {
@@ -469,16 +610,49 @@ def create_newsletter(request):
     return render(request, 'news/create_newsletter.html', {'form': form})
 
 
+def get_requested_fields(request, serializer_class):
+    """Returns the fields a content API request asks for.
+    
+    ``?view=summary`` selects the fields needed for a listing, without the
+    content; ``?fields=`` takes a comma separated list of field names.
+    
+    :param request: HTTP request object
+    :param serializer_class: Serializer of the requested content
+    :returns: Field names, or None for all fields
+    :rtype: list or None
+    :raises ValueError: If an unknown field is requested
+    """
+    if request.query_params.get('view') == 'summary':
+        return list(SUMMARY_FIELDS)
+    if not request.query_params.get('fields'):
+        return None
+
+    fields = [
+        name.strip()
+        for name in request.query_params['fields'].split(',')
+        if name.strip()
+    ]
+    unknown = set(fields) - set(serializer_class.Meta.fields)
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(sorted(unknown))}")
+    return fields
+
+
 class SubscribedArticlesView(APIView):
     """API view to get a list of articles based on a reader's subscriptions.
     
-    Returns articles from publishers and journalists that the reader follows.
+    Returns articles from publishers and journalists that the reader follows,
+    newest first, one page at a time. Use the ``next`` and ``previous`` links
+    to page through results and ``page_size`` to change the page length.
+    Use ``view=summary`` or ``fields`` to return fewer fields. Clients
+    revalidating an unchanged page get a 304 response.
     """
+    @method_decorator(condition(etag_func=feed_etag(Article)))
     def get(self, request, *args, **kwargs):
         """Handle GET requests for subscribed articles.
         
         :param request: HTTP request object
-        :returns: JSON response with subscribed articles or error
+        :returns: JSON response with a page of subscribed articles or error
         :rtype: Response
         """
         if (
@@ -490,38 +664,39 @@ class SubscribedArticlesView(APIView):
                 status=status.HTTP_403_FORBIDDEN
             )
 
-        user = request.user
-        subscribed_publishers = user.subscriptions_publishers.all()
-        subscribed_journalists = user.subscriptions_journalists.all()
+        try:
+            fields = get_requested_fields(request, ArticleSerializer)
+        except ValueError as e:
+            return Response(
+                {"error": str(e)}, status=status.HTTP_400_BAD_REQUEST
+            )
 
-        publisher_articles = Article.objects.filter(
-            approved=True,
-            publisher__in=subscribed_publishers
+        paginator = FeedCursorPagination()
+        entries = paginator.paginate_queryset(
+            feed_entries(request.user, Article), request, view=self
         )
-
-        journalist_articles = Article.objects.filter(
-            approved=True,
-            author__in=subscribed_journalists
+        # Built from plain rows, with the same schema as ArticleSerializer
+        subscribed_articles = serialize_content_values(
+            feed_page_content(entries, Article), fields
         )
-
-        subscribed_articles = (
-            publisher_articles | journalist_articles
-        ).distinct()
-
-        serializer = ArticleSerializer(subscribed_articles, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return paginator.get_paginated_response(subscribed_articles)
 
 
 class SubscribedNewslettersView(APIView):
     """API view to get a list of newsletters based on a reader's subscriptions.
     
-    Returns newsletters from publishers and journalists that the reader follows.
+    Returns newsletters from publishers and journalists that the reader
+    follows, newest first, one page at a time. Use the ``next`` and
+    ``previous`` links to page through results and ``page_size`` to change
+    the page length. Use ``view=summary`` or ``fields`` to return fewer
+    fields. Clients revalidating an unchanged page get a 304 response.
     """
+    @method_decorator(condition(etag_func=feed_etag(Newsletter)))
     def get(self, request, *args, **kwargs):
         """Handle GET requests for subscribed newsletters.
         
         :param request: HTTP request object
-        :returns: JSON response with subscribed newsletters or error
+        :returns: JSON response with a page of subscribed newsletters or error
         :rtype: Response
         """
         if (
@@ -533,26 +708,80 @@ class SubscribedNewslettersView(APIView):
                 status=status.HTTP_403_FORBIDDEN
             )
 
-        user = request.user
-        subscribed_publishers = user.subscriptions_publishers.all()
-        subscribed_journalists = user.subscriptions_journalists.all()
+        try:
+            fields = get_requested_fields(request, NewsletterSerializer)
+        except ValueError as e:
+            return Response(
+                {"error": str(e)}, status=status.HTTP_400_BAD_REQUEST
+            )
 
-        publisher_newsletters = Newsletter.objects.filter(
-            approved=True,
-            publisher__in=subscribed_publishers
+        paginator = FeedCursorPagination()
+        entries = paginator.paginate_queryset(
+            feed_entries(request.user, Newsletter), request, view=self
         )
+        # Built from plain rows, with the same schema as NewsletterSerializer
+        subscribed_newsletters = serialize_content_values(
+            feed_page_content(entries, Newsletter), fields
+        )
+        return paginator.get_paginated_response(subscribed_newsletters)
+
 
-        journalist_newsletters = Newsletter.objects.filter(
-            approved=True,
-            author__in=subscribed_journalists
+class SearchView(APIView):
+    """API view for ranked full-text search of approved content.
+    
+    Returns articles and newsletters matching every word of ``q``, best
+    match first, one page at a time. Use ``page`` and ``page_size`` to page
+    through results.
+    """
+    def get(self, request, *args, **kwargs):
+        """Handle GET requests for search results.
+        
+        :param request: HTTP request object
+        :returns: JSON response with a page of search results
+        :rtype: Response
+        """
+        paginator = SearchPagination()
+        results = paginator.paginate_queryset(
+            SearchResults(request.query_params.get('q', '')),
+            request,
+            view=self
         )
+        serializer = SearchResultSerializer(results, many=True)
+        return paginator.get_paginated_response(serializer.data)
 
-        subscribed_newsletters = (
-            publisher_newsletters | journalist_newsletters
-        ).distinct()
 
-        serializer = NewsletterSerializer(subscribed_newsletters, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+class ContentExportView(APIView):
+    """API view streaming all approved content as NDJSON.
+    
+    Rows are written to the response as they are read, so memory use stays
+    flat however much content there is. Use ``type`` to export only articles
+    or newsletters and ``gzip=1`` for a gzipped download.
+    """
+    def get(self, request, *args, **kwargs):
+        """Handle GET requests for a content export.
+        
+        :param request: HTTP request object
+        :returns: Streamed NDJSON response or error
+        :rtype: StreamingHttpResponse
+        """
+        content_types = request.query_params.getlist('type') or None
+        if content_types and not set(content_types) <= set(EXPORT_MODELS):
+            return Response(
+                {"error": "Unknown content type."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        chunks = iter_ndjson(content_types)
+        filename = 'news-export.ndjson'
+        content_type = 'application/x-ndjson'
+        if request.query_params.get('gzip') in ('1', 'true'):
+            chunks = gzip_stream(chunks)
+            filename += '.gz'
+            content_type = 'application/gzip'
+
+        response = StreamingHttpResponse(chunks, content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
 
 
 class ArticleApprovalView(APIView):
@@ -572,11 +801,15 @@ class ArticleApprovalView(APIView):
             )
 
         try:
+            # The row lock only covers the update and the outbox insert;
+            # emails, X posts and cache invalidation run after the commit
             with transaction.atomic():
-                article = get_object_or_404(Article, pk=article_id)
+                article = get_object_or_404(
+                    Article.objects.select_for_update(), pk=article_id
+                )
                 if not article.approved:
                     article.approved = True
-                    article.save()
+                    article.save(update_fields=['approved'])
 
             return Response(
                 {"success": f"Article '{article.title}' has been approved."},
@@ -606,11 +839,15 @@ class NewsletterApprovalView(APIView):
             )
 
         try:
+            # The row lock only covers the update and the outbox insert;
+            # emails, X posts and cache invalidation run after the commit
             with transaction.atomic():
-                newsletter = get_object_or_404(Newsletter, pk=newsletter_id)
+                newsletter = get_object_or_404(
+                    Newsletter.objects.select_for_update(), pk=newsletter_id
+                )
                 if not newsletter.approved:
                     newsletter.approved = True
-                    newsletter.save()
+                    newsletter.save(update_fields=['approved'])
 
             return Response(
                 {
@@ -625,4 +862,80 @@ class NewsletterApprovalView(APIView):
             return Response(
                 {"error": str(e)},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
\ No newline at end of file
+            )
+
+
+class BulkApprovalView(APIView):
+    """API view for editors to approve many articles and newsletters."""
+    def post(self, request, *args, **kwargs):
+        """Handle POST requests to approve content in bulk.
+        
+        The body lists the IDs to approve, e.g.
+        ``{"articles": [1, 2], "newsletters": [3]}``. Subscribers are sent
+        one email covering all the newly approved items. Items that are
+        already approved, or being approved by another editor, are skipped.
+        
+        :param request: HTTP request object
+        :returns: JSON response listing the approved IDs, or an error
+        :rtype: Response
+        """
+        if request.user.role.lower() != 'editor':
+            return Response(
+                {"error": "You do not have permission to approve content."},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        ids = {}
+        for field in ('articles', 'newsletters'):
+            value = request.data.get(field, [])
+            if not isinstance(value, list) or not all(
+                type(pk) is int for pk in value
+            ):
+                return Response(
+                    {"error": f"'{field}' must be a list of IDs."},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            ids[field] = value
+        if not ids['articles'] and not ids['newsletters']:
+            return Response(
+                {"error": "No articles or newsletters given."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        items = approve_many(ids['articles'], ids['newsletters'])
+        return Response(
+            {
+                "approved": {
+                    field: [
+                        content.pk for content_type, content in items
+                        if content_type == field[:-1]
+                    ]
+                    for field in ('articles', 'newsletters')
+                }
+            },
+            status=status.HTTP_200_OK
+        )
+
+
+class APITokenView(ObtainAuthToken):
+    """API view issuing API tokens in exchange for a username and password.
+    
+    The password is checked once here; later calls send the token instead,
+    which is far cheaper to check than HTTP Basic authentication. A user
+    has one token, so asking again returns the same token until it is
+    revoked.
+    """
+    authentication_classes = ()
+
+
+class RevokeAPITokenView(APIView):
+    """API view revoking the signed in user's API token."""
+    def post(self, request, *args, **kwargs):
+        """Handle POST requests to revoke the user's API token.
+        
+        :param request: HTTP request object
+        :returns: Empty response
+        :rtype: Response
+        """
+        Token.objects.filter(user=request.user).delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/5.0/ref/settings/
 
 from pathlib import Path
 import os
+import sys
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -42,6 +43,7 @@ INSTALLED_APPS = [
     'django.contrib.staticfiles',
     'news.apps.NewsConfig',
     'rest_framework',
+    'rest_framework.authtoken',
 ]
 
 
@@ -53,6 +55,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'news.replicas.ReplicaMiddleware',
 ]
 
 
@@ -105,6 +108,50 @@ else:
         }
     }
 
+# Each thread keeps its database connection open between requests for up
+# to DB_CONN_MAX_AGE seconds (0 closes it after every request) and checks
+# it still works before reusing it (see news/connections.py)
+DATABASES['default'].update({
+    'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 60)),
+    'CONN_HEALTH_CHECKS': True,
+})
+
+# Read replicas (see news/replicas.py): DB_REPLICAS lists the replicas'
+# hosts, or their database files when using SQLite, separated by commas.
+# Read-only pages read from them; writes and everything else use the
+# primary, and a client that writes reads from the primary for the next
+# NEWS_DB_PIN_SECONDS
+_replica_field = 'NAME' if os.environ.get('USE_SQLITE_FOR_DOCKER') else 'HOST'
+for _number, _location in enumerate(
+    filter(None, os.environ.get('DB_REPLICAS', '').split(',')), 1
+):
+    DATABASES[f'replica{_number}'] = {
+        **DATABASES['default'],
+        _replica_field: _location.strip(),
+        'TEST': {'MIRROR': 'default'},
+    }
+NEWS_DB_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+NEWS_DB_PIN_SECONDS = int(os.environ.get('NEWS_DB_PIN_SECONDS', 10))
+# URL names of the views whose GET requests read from a replica,
+# separated by commas
+NEWS_REPLICA_VIEWS = [
+    view.strip() for view in os.environ.get(
+        'NEWS_REPLICA_VIEWS',
+        'home,article_detail,dashboard,subscribed_articles,'
+        'subscribed_newsletters'
+    ).split(',') if view.strip()
+]
+DATABASE_ROUTERS = ['news.replicas.ReplicaRouter']
+
+# The test suite gets a replica of its own: a separate SQLite database
+# that the replica tests fill themselves (see news/tests.py). It is left
+# out of NEWS_DB_REPLICAS, so every other test reads from the primary
+if sys.argv[1:2] == ['test'] and 'replica1' not in DATABASES:
+    DATABASES['replica1'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'replica1.sqlite3',
+    }
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
@@ -136,6 +183,24 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Password hashing (see news/hashers.py). NEWS_PASSWORD_HASHER picks the
+# hasher for new passwords; passwords stored with another listed hasher,
+# or with an older work factor, are rehashed when their user next logs in.
+# 'argon2' needs the argon2-cffi package.
+NEWS_PASSWORD_HASHERS = {
+    'pbkdf2_sha256': 'news.hashers.PBKDF2PasswordHasher',
+    'scrypt': 'django.contrib.auth.hashers.ScryptPasswordHasher',
+    'argon2': 'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'pbkdf2_sha1': 'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+}
+NEWS_PASSWORD_HASHER = os.environ.get('NEWS_PASSWORD_HASHER', 'pbkdf2_sha256')
+PASSWORD_HASHERS = [NEWS_PASSWORD_HASHERS[NEWS_PASSWORD_HASHER]] + [
+    path for name, path in NEWS_PASSWORD_HASHERS.items()
+    if name != NEWS_PASSWORD_HASHER
+]
+if os.environ.get('NEWS_PBKDF2_ITERATIONS'):
+    NEWS_PBKDF2_ITERATIONS = int(os.environ['NEWS_PBKDF2_ITERATIONS'])
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/5.0/topics/i18n/
@@ -165,6 +230,9 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # Custom user model
 AUTH_USER_MODEL = 'news.CustomUser'
 
+# Signed in users are loaded from the cache (see news/authentication.py)
+AUTHENTICATION_BACKENDS = ['news.authentication.CachedModelBackend']
+
 
 # Set the custom login URL
 LOGIN_URL = 'login'
@@ -175,9 +243,11 @@ LOGIN_REDIRECT_URL = 'dashboard'
 
 # Django REST Framework settings
 REST_FRAMEWORK = {
+    # Tokens first: Basic authentication hashes the password on every call
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework.authentication.BasicAuthentication',
+        'news.authentication.CachedTokenAuthentication',
         'rest_framework.authentication.SessionAuthentication',
+        'rest_framework.authentication.BasicAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
@@ -192,4 +262,107 @@ EMAIL_PORT = os.environ.get('EMAIL_PORT', 587)
 EMAIL_USE_TLS = True
 EMAIL_HOST_USER = os.environ.get('EMAIL_HOST_USER', '')
 EMAIL_HOST_PASSWORD = os.environ.get('EMAIL_HOST_PASSWORD', '')
-DEFAULT_FROM_EMAIL = os.environ.get('DEFAULT_FROM_EMAIL', 'noreply@example.com')
\ No newline at end of file
+DEFAULT_FROM_EMAIL = os.environ.get('DEFAULT_FROM_EMAIL', 'noreply@example.com')
+
+# Subscriber distribution settings (see news/distribution.py)
+NEWS_DISTRIBUTION_CHUNK_SIZE = int(
+    os.environ.get('NEWS_DISTRIBUTION_CHUNK_SIZE', 500)
+)
+NEWS_DISTRIBUTION_MAX_ATTEMPTS = int(
+    os.environ.get('NEWS_DISTRIBUTION_MAX_ATTEMPTS', 5)
+)
+NEWS_DISTRIBUTION_POLL_INTERVAL = float(
+    os.environ.get('NEWS_DISTRIBUTION_POLL_INTERVAL', 5)
+)
+NEWS_DISTRIBUTION_STALE_AFTER = int(
+    os.environ.get('NEWS_DISTRIBUTION_STALE_AFTER', 1800)
+)
+NEWS_DISTRIBUTION_RETRY_DELAY = float(
+    os.environ.get('NEWS_DISTRIBUTION_RETRY_DELAY', 60)
+)
+NEWS_DISTRIBUTION_MAX_RETRY_DELAY = float(
+    os.environ.get('NEWS_DISTRIBUTION_MAX_RETRY_DELAY', 3600)
+)
+
+# X/Twitter posting worker settings (see news/social.py)
+NEWS_X_API_URL = os.environ.get(
+    'NEWS_X_API_URL', 'https://api.x.com/2/tweets'
+)
+NEWS_SOCIAL_TIMEOUT = float(os.environ.get('NEWS_SOCIAL_TIMEOUT', 10))
+NEWS_SOCIAL_MAX_ATTEMPTS = int(os.environ.get('NEWS_SOCIAL_MAX_ATTEMPTS', 5))
+NEWS_SOCIAL_RETRY_DELAY = float(os.environ.get('NEWS_SOCIAL_RETRY_DELAY', 30))
+NEWS_SOCIAL_POSTS_PER_HOUR = float(
+    os.environ.get('NEWS_SOCIAL_POSTS_PER_HOUR', 100)
+)
+NEWS_SOCIAL_BURST = int(os.environ.get('NEWS_SOCIAL_BURST', 5))
+
+# Absolute site URL for links in notification emails (see news/emails.py)
+NEWS_SITE_URL = os.environ.get('NEWS_SITE_URL', 'http://127.0.0.1:8000')
+
+# Per-recipient email delivery settings (see news/delivery.py)
+NEWS_EMAIL_CONNECTIONS = int(os.environ.get('NEWS_EMAIL_CONNECTIONS', 1))
+NEWS_EMAIL_BATCH_SIZE = int(os.environ.get('NEWS_EMAIL_BATCH_SIZE', 100))
+NEWS_EMAIL_MAX_RETRIES = int(os.environ.get('NEWS_EMAIL_MAX_RETRIES', 2))
+NEWS_EMAIL_RETRY_DELAY = float(os.environ.get('NEWS_EMAIL_RETRY_DELAY', 0.5))
+
+# Precomputed reader feed settings (see news/feeds.py)
+NEWS_FEED_BATCH_SIZE = int(os.environ.get('NEWS_FEED_BATCH_SIZE', 1000))
+
+# Records inserted per query by import_news (see news/importer.py)
+NEWS_IMPORT_BATCH_SIZE = int(os.environ.get('NEWS_IMPORT_BATCH_SIZE', 2000))
+
+# Rows fetched per query by content exports (see news/exporter.py)
+NEWS_EXPORT_CHUNK_SIZE = int(os.environ.get('NEWS_EXPORT_CHUNK_SIZE', 2000))
+
+# Subscribed content API page sizes (see news/pagination.py)
+NEWS_API_PAGE_SIZE = int(os.environ.get('NEWS_API_PAGE_SIZE', 20))
+NEWS_API_MAX_PAGE_SIZE = int(os.environ.get('NEWS_API_MAX_PAGE_SIZE', 100))
+
+# Cache backend: Redis when REDIS_URL is set, a shared directory when
+# CACHE_DIR is set, otherwise per-process local memory
+if os.environ.get('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['REDIS_URL'],
+        }
+    }
+elif os.environ.get('CACHE_DIR'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.environ['CACHE_DIR'],
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# db_stats and cache_stats counters (see news/counters.py) are only kept
+# when the cache is shared between processes, unless NEWS_STATS_COUNTERS
+# says otherwise
+if os.environ.get('NEWS_STATS_COUNTERS'):
+    NEWS_STATS_COUNTERS = (
+        os.environ['NEWS_STATS_COUNTERS'].lower() == 'true'
+    )
+
+# Seconds rendered home page content is cached (see news/page_cache.py)
+NEWS_HOME_CACHE_TIMEOUT = int(os.environ.get('NEWS_HOME_CACHE_TIMEOUT', 300))
+
+# Seconds signed in users and API token lookups are cached
+# (see news/authentication.py)
+NEWS_USER_CACHE_TIMEOUT = int(os.environ.get('NEWS_USER_CACHE_TIMEOUT', 300))
+
+# Seconds readers' subscription snapshots are cached (see news/profiles.py)
+NEWS_PROFILE_CACHE_TIMEOUT = int(
+    os.environ.get('NEWS_PROFILE_CACHE_TIMEOUT', 300)
+)
+
+# Session storage: 'cached_db' reads sessions from the cache and writes
+# them through to the database, 'db' only uses the database, and
+# 'signed_cookies' keeps them in a signed (readable, not encrypted) cookie
+NEWS_SESSION_ENGINE = os.environ.get('NEWS_SESSION_ENGINE', 'cached_db')
+SESSION_ENGINE = f'django.contrib.sessions.backends.{NEWS_SESSION_ENGINE}'